@@ -1,9 +1,10 @@
 from pathlib import Path
-import tomllib
 
 def load_config(path: Path) -> dict:
     # Lee archivos TOML defensivamente devolviendo dict vacío si no existe.
     if not path.exists():
         return {}
+    # tomllib se importa al leer, no al importar el módulo.
+    import tomllib
     with path.open("rb") as fh:
         return tomllib.load(fh)
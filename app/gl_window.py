@@ -0,0 +1,92 @@
+import math
+import moderngl_window as mglw
+from typing import TYPE_CHECKING
+from ..utils.math import to_tuple
+from .window import PROJECT_ROOT, window_settings
+
+if TYPE_CHECKING:
+    from ..rendering.renderer import Renderer
+
+# Se importa bajo demanda desde app.window: aquí vive todo lo que arrastra
+# moderngl_window y la lectura de config.toml.
+_WINDOW_SETTINGS = window_settings()
+
+
+# Ventana principal que canaliza eventos hacia un Renderer configurado.
+class OpenWindow(mglw.WindowConfig):
+    """Basic window that delegates rendering to a Renderer instance."""
+
+    gl_version = to_tuple(_WINDOW_SETTINGS.get("gl_version"), (3, 3))
+    title = _WINDOW_SETTINGS.get("title", "Renderer 2D con ModernGL")
+    window_size = to_tuple(_WINDOW_SETTINGS.get("window_size"), (1280, 720))
+    aspect_ratio = _WINDOW_SETTINGS.get("aspect_ratio", 16 / 9)
+    resizable = bool(_WINDOW_SETTINGS.get("resizable", True))
+
+    # Entrada de cámara acumulada entre frames (se aplica en bloque en on_render).
+    _pending_azimuth = 0.0
+    _pending_polar = 0.0
+    _pending_zoom = 1.0
+
+    # Overlay del perfilador: resumen en el título, refrescado cada N frames.
+    show_profiler = False
+    profiler_refresh_frames = 30
+    trace_path = PROJECT_ROOT / "profile_trace.json"
+    _overlay_frames = 0
+
+    def set_renderer(self, renderer: "Renderer") -> None:
+        # Guarda la instancia que se encargará de dibujar cada frame.
+        self.renderer = renderer
+
+    def on_render(self, time, frame_time) -> None:
+        # Ciclo de dibujo: delega en el renderer asociado.
+        if hasattr(self, 'renderer'):
+            self.apply_camera_input()
+            self.renderer.render(time)
+            self.update_profiler_overlay()
+
+    def update_profiler_overlay(self) -> None:
+        # Muestra el resumen del perfilador en la barra de título de la ventana.
+        profiler = getattr(self.renderer, 'profiler', None)
+        if profiler is None or not self.show_profiler:
+            return
+        self._overlay_frames += 1
+        if self._overlay_frames >= self.profiler_refresh_frames:
+            self._overlay_frames = 0
+            self.wnd.title = f"{self.title} — {profiler.summary_text()}"
+
+    def on_key_event(self, key, action, modifiers):
+        # F3 alterna el overlay del perfilador; F12 exporta la traza Chrome.
+        profiler = getattr(getattr(self, 'renderer', None), 'profiler', None)
+        if profiler is None or action != self.wnd.keys.ACTION_PRESS:
+            return
+        if key == self.wnd.keys.F3:
+            self.show_profiler = not self.show_profiler
+            if not self.show_profiler:
+                self.wnd.title = self.title
+        elif key == self.wnd.keys.F12:
+            profiler.export_chrome_trace(self.trace_path)
+
+    def apply_camera_input(self) -> None:
+        # Vuelca arrastre y scroll acumulados en una sola actualización de cámara.
+        d_azimuth, d_polar, zoom = self._pending_azimuth, self._pending_polar, self._pending_zoom
+        if d_azimuth == 0.0 and d_polar == 0.0 and zoom == 1.0:
+            return
+        self._pending_azimuth, self._pending_polar, self._pending_zoom = 0.0, 0.0, 1.0
+        camera = self.renderer.camera
+        if hasattr(camera, 'orbit'):
+            camera.orbit(d_azimuth, d_polar, zoom)
+        else:
+            camera.camera_radius *= zoom
+            camera.camera_azimuthal += d_azimuth
+            camera.camera_polar += d_polar
+
+    def on_mouse_scroll_event(self, x_offset, y_offset):
+        # Ajusta el radio orbital para acercar o alejar la cámara.
+        if hasattr(self, 'renderer'):
+            self._pending_zoom *= (1 + y_offset)
+
+    def on_mouse_drag_event(self, x, y, dx, dy):
+        # Traducir arrastre a cambios en ángulos azimutal y polar.
+        if hasattr(self, 'renderer'):
+            self._pending_azimuth -= math.radians(dx * 0.5)
+            self._pending_polar -= math.radians(dy * 0.5)
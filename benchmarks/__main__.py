@@ -0,0 +1,118 @@
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from . import cases, startup
+from .harness import compare, environment, format_table, load_results, save_results
+
+# Raíz del paquete: las rutas de shaders son relativas a ella.
+PACKAGE_ROOT = Path(__file__).resolve().parents[1]
+
+QUICK_GRID_SIZES = (50, 128, 256, 512)
+QUICK_MODEL_COUNTS = (1, 10, 100)
+
+
+def create_context(backend):
+    # Contexto OpenGL sin ventana; None si no hay GL disponible.
+    import moderngl
+
+    kwargs = {"backend": backend} if backend else {}
+    try:
+        return moderngl.create_standalone_context(**kwargs)
+    except Exception as exc:  # noqa: BLE001 - cualquier fallo de GL omite los casos de GPU
+        print(f"Sin contexto OpenGL ({exc}); se omiten los casos de render.", file=sys.stderr)
+        return None
+
+
+def run(args) -> int:
+    # Ejecuta la suite y guarda el JSON de resultados.
+    sizes = QUICK_GRID_SIZES if args.quick else cases.GRID_SIZES
+    sizes = tuple(n for n in sizes if n <= args.max_grid)
+    counts = QUICK_MODEL_COUNTS if args.quick else cases.MODEL_COUNTS
+    groups = set(args.only or ("generate", "grid", "serialize", "startup", "renderer"))
+    args.output = args.output.resolve()
+
+    results = {}
+    if "generate" in groups:
+        results.update(cases.bench_mesh_generation(sizes))
+    if "grid" in groups:
+        results.update(cases.bench_grid_evaluation(sizes))
+    if "serialize" in groups:
+        results.update(cases.bench_serialization(sizes))
+    if "startup" in groups:
+        results.update(startup.bench_startup())
+    meta = environment()
+    if "renderer" in groups:
+        os.chdir(PACKAGE_ROOT)
+        ctx = create_context(args.backend)
+        if ctx is not None:
+            meta["gl_renderer"] = ctx.info.get("GL_RENDERER")
+            results.update(cases.bench_renderer(ctx, counts, frames=args.frames))
+
+    save_results({"meta": meta, "results": results}, args.output)
+    for name, result in sorted(results.items()):
+        print(f"{name:<48} {result['median'] * 1e3:>10.3f}ms")
+    print(f"Resultados guardados en {args.output}")
+    return 0
+
+
+def run_compare(args) -> int:
+    # Compara contra la línea base; código de salida 1 si hay regresiones.
+    rows = compare(load_results(args.baseline), load_results(args.current), threshold=args.threshold)
+    print(format_table(rows))
+    regressions = [row for row in rows if row["status"] == "regression"]
+    if regressions:
+        print(f"{len(regressions)} regresión(es) por encima de {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+def run_startup(args) -> int:
+    # Coste de importación frente a su presupuesto; código de salida 1 si alguno lo supera.
+    results = startup.bench_startup(repeat=args.repeat)
+    for name, result in sorted(results.items()):
+        line = f"{name:<48} {result['median'] * 1e3:>10.3f}ms"
+        if "budget_ms" in result:
+            line += f"  sin NumPy {result['overhead_ms']:.1f}ms / {result['budget_ms']:.0f}ms"
+        print(line)
+    if args.report:
+        startup.write_report(args.report)
+        print(f"Informe de importación guardado en {args.report}")
+    problems = startup.check_budgets(results)
+    for problem in problems:
+        print(problem)
+    return 1 if problems else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m pyxion.benchmarks", description="Benchmarks de PyXion")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = sub.add_parser("run", help="ejecuta la suite")
+    run_parser.add_argument("--output", type=Path, default=Path("benchmarks/results/latest.json"))
+    run_parser.add_argument("--quick", action="store_true", help="rejillas y escenas reducidas")
+    run_parser.add_argument("--max-grid", type=int, default=max(cases.GRID_SIZES))
+    run_parser.add_argument("--frames", type=int, default=100)
+    run_parser.add_argument("--backend", default=None, help="backend de moderngl (p. ej. egl)")
+    run_parser.add_argument("--only", nargs="*", choices=("generate", "grid", "serialize", "startup", "renderer"))
+    run_parser.set_defaults(func=run)
+
+    compare_parser = sub.add_parser("compare", help="compara con una línea base")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+    compare_parser.add_argument("--threshold", type=float, default=0.10)
+    compare_parser.set_defaults(func=run_compare)
+
+    startup_parser = sub.add_parser("startup", help="coste de importación frente al presupuesto")
+    startup_parser.add_argument("--repeat", type=int, default=5)
+    startup_parser.add_argument("--report", type=Path, default=None,
+                                help="escribe el informe estilo -X importtime (p. ej. benchmarks/importtime.txt)")
+    startup_parser.set_defaults(func=run_startup)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
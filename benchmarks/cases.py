@@ -0,0 +1,95 @@
+import numpy as np
+
+from ..core.models import Material
+from ..shapes.equation import AdaptiveEquation3dMesh, Equation2dMesh, Equation3dMesh
+from ..shapes.grid import evaluate_grid
+from .harness import measure, peak_memory
+
+# Resoluciones de rejilla (n x n) de 50² a 4096².
+GRID_SIZES = (50, 128, 256, 512, 1024, 2048, 4096)
+MODEL_COUNTS = (1, 10, 100, 500)
+
+
+def sombrero(x, y):
+    r = np.sqrt(x**2 + y**2)
+    return np.sin(r) / (r + 0.001)
+
+
+def bench_mesh_generation(sizes=GRID_SIZES, repeat: int = 3) -> dict:
+    # Coste de discretizar Equation3dMesh (n x n), su versión adaptativa y Equation2dMesh (n² segmentos).
+    results = {}
+    material = Material()
+    for n in sizes:
+        results[f"generate/equation3d/{n}x{n}"] = dict(
+            measure(lambda: Equation3dMesh(material, sombrero, n, n), repeat=repeat), params={"rows": n, "cols": n})
+        # Quadtree cuya resolución máxima cubre la rejilla n x n.
+        depth = (n - 1).bit_length()
+        adaptive = AdaptiveEquation3dMesh(material, sombrero, max_depth=depth)
+        results[f"generate/adaptive/{n}x{n}"] = dict(
+            measure(lambda: AdaptiveEquation3dMesh(material, sombrero, max_depth=depth), repeat=repeat),
+            params={"max_depth": depth, "vertices": len(adaptive.vertices), "samples": adaptive.z_meta["samples"]})
+        results[f"generate/equation2d/{n * n}"] = dict(
+            measure(lambda: Equation2dMesh(material, np.sin, n * n), repeat=repeat), params={"segments": n * n})
+    return results
+
+
+def bench_grid_evaluation(sizes=GRID_SIZES, repeat: int = 3, workers=(1, None)) -> dict:
+    # Evaluación por bandas: tiempo por número de hilos y pico de memoria frente a la salida.
+    results = {}
+    for n in sizes:
+        output_bytes = n * n * 3 * 4
+        memory = peak_memory(lambda: evaluate_grid(sombrero, n, n, workers=1), output_bytes)
+        for count in workers:
+            label = count or "auto"
+            results[f"grid/evaluate/{label}/{n}x{n}"] = dict(
+                measure(lambda: evaluate_grid(sombrero, n, n, workers=count), repeat=repeat),
+                params={"rows": n, "cols": n, "workers": count}, **memory)
+    return results
+
+
+def bench_serialization(sizes=GRID_SIZES, repeat: int = 5) -> dict:
+    # Coste de Mesh.vertex_buffer / index_buffer (aplanado + bytes).
+    results = {}
+    for n in sizes:
+        mesh = Equation3dMesh(Material(), sombrero, n, n)
+        results[f"serialize/vertex_buffer/{n}x{n}"] = dict(
+            measure(lambda: mesh.vertex_buffer, repeat=repeat), params={"bytes": mesh.vertices.nbytes})
+        results[f"serialize/index_buffer/{n}x{n}"] = dict(
+            measure(lambda: mesh.index_buffer, repeat=repeat), params={"bytes": mesh.indices.nbytes})
+        del mesh
+    return results
+
+
+def _scene(count: int, grid: int = 32) -> list:
+    # Escena de `count` superficies pequeñas (se genera fuera de la medición).
+    material = Material()
+    return [Equation3dMesh(material, sombrero, grid, grid) for _ in range(count)]
+
+
+def bench_renderer(ctx, counts=MODEL_COUNTS, frames: int = 100, size=(640, 360)) -> dict:
+    # Setup de Renderer para N modelos y tiempo de frame estable (render + finish).
+    from ..rendering.renderer import Renderer
+
+    results = {}
+    for count in counts:
+        models = _scene(count)
+        for batching in (False, True):
+            mode = "batched" if batching else "direct"
+
+            def setup():
+                renderer = Renderer(size, models=models, ctx=ctx, batching=batching)
+                renderer.release()
+            results[f"renderer/init/{mode}/{count}"] = dict(
+                measure(setup, repeat=3), params={"models": count})
+
+            renderer = Renderer(size, models=models, ctx=ctx, batching=batching)
+            renderer.enable_offscreen()
+            renderer.camera.position = (0.0, -0.01, 2.0)
+
+            def frame():
+                renderer.render()
+                ctx.finish()
+            results[f"renderer/frame/{mode}/{count}"] = dict(
+                measure(frame, repeat=frames, warmup=5), params={"models": count})
+            renderer.release()
+    return results
@@ -0,0 +1,99 @@
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+
+
+def measure(fn: Callable[[], object], repeat: int = 5, warmup: int = 1,
+            setup: Optional[Callable[[], object]] = None) -> dict:
+    # Ejecuta fn varias veces y resume los tiempos en segundos.
+    """
+    ``setup`` (si existe) se ejecuta antes de cada repetición y su valor se
+    pasa a ``fn``; su coste no se mide.
+    """
+    samples = []
+    for i in range(warmup + repeat):
+        arg = setup() if setup is not None else None
+        start = time.perf_counter()
+        fn(arg) if setup is not None else fn()
+        elapsed = time.perf_counter() - start
+        if i >= warmup:
+            samples.append(elapsed)
+    return {
+        "median": statistics.median(samples),
+        "min": min(samples),
+        "mean": statistics.fmean(samples),
+        "repeat": repeat,
+    }
+
+
+def peak_memory(fn: Callable[[], object], output_bytes: int) -> dict:
+    # Pico de memoria (tracemalloc) de fn, en bytes y como múltiplo de su salida.
+    """NumPy registra sus reservas en tracemalloc; los mmap compartidos no cuentan."""
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"peak_bytes": peak, "output_bytes": output_bytes,
+            "peak_ratio": peak / output_bytes if output_bytes else None}
+
+
+def environment() -> dict:
+    # Metadatos para saber en qué máquina se tomó cada medición.
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "timestamp": time.time(),
+    }
+
+
+def save_results(results: dict, path: Path) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2, sort_keys=True), encoding="utf-8")
+    return path
+
+
+def load_results(path: Path) -> dict:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.10, metric: str = "median") -> list[dict]:
+    # Compara dos ejecuciones caso a caso; marca regresión si empeora más que threshold.
+    """Filas con nombre, tiempos, ratio (actual/base) y estado de cada caso común."""
+    rows = []
+    base_results = baseline.get("results", {})
+    for name, result in sorted(current.get("results", {}).items()):
+        base = base_results.get(name)
+        if base is None or metric not in base or metric not in result:
+            continue
+        ratio = result[metric] / base[metric] if base[metric] > 0 else float("inf")
+        if ratio > 1.0 + threshold:
+            status = "regression"
+        elif ratio < 1.0 - threshold:
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append({"name": name, "baseline": base[metric], "current": result[metric],
+                     "ratio": ratio, "status": status})
+    return rows
+
+
+def format_table(rows: list[dict]) -> str:
+    # Tabla de texto para la salida de la comparación.
+    lines = [f"{'caso':<48} {'base':>12} {'actual':>12} {'ratio':>8}  estado"]
+    for row in rows:
+        lines.append(
+            f"{row['name']:<48} {row['baseline'] * 1e3:>10.3f}ms {row['current'] * 1e3:>10.3f}ms "
+            f"{row['ratio']:>8.3f}  {row['status']}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,139 @@
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Optional
+
+# Paquete raíz (``pyxion``): los módulos se indican relativos a él.
+ROOT_PACKAGE = __package__.rpartition(".")[0]
+PACKAGE_ROOT = Path(__file__).resolve().parents[1]
+
+# Coste de importación (ms, -X importtime acumulado, sin contar NumPy) de los
+# puntos de entrada que no necesitan GL: las herramientas headless que generan
+# meshes deben arrancar en decenas de milisegundos.
+STARTUP_BUDGETS = {
+    "core.geometry": 30.0,
+    "shapes.equation": 80.0,
+    "app.window": 40.0,
+}
+# Stacks que esos módulos no deben cargar: GL, ventanas y validación.
+HEAVY_MODULES = ("moderngl", "moderngl_window", "pydantic")
+# Base común que se descuenta del presupuesto.
+BASELINE_MODULE = "numpy"
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, float, float]]:
+    # Líneas de -X importtime -> (módulo, profundidad, propio ms, acumulado ms).
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        entries.append((name.strip(), depth, int(fields[0]) / 1e3, int(fields[1]) / 1e3))
+    return entries
+
+
+def _qualified(module: str) -> str:
+    return module if module == BASELINE_MODULE else f"{ROOT_PACKAGE}.{module}"
+
+
+# Si el checkout no se llama ``pyxion`` (p. ej. registrado por tests/conftest.py),
+# el hijo registra la raíz del paquete antes de importar el módulo medido.
+_BOOTSTRAP = (
+    "import importlib.util, sys\n"
+    f"if importlib.util.find_spec({ROOT_PACKAGE!r}) is None:\n"
+    f"    spec = importlib.util.spec_from_file_location({ROOT_PACKAGE!r}, {str(PACKAGE_ROOT / '__init__.py')!r},\n"
+    f"                                                  submodule_search_locations=[{str(PACKAGE_ROOT)!r}])\n"
+    "    sys.modules[spec.name] = importlib.util.module_from_spec(spec)\n"
+    "    spec.loader.exec_module(sys.modules[spec.name])\n"
+)
+
+
+def run_importtime(module: str) -> tuple[list[tuple[str, int, float, float]], list[str]]:
+    # Importa `module` en un intérprete nuevo con -X importtime.
+    """Devuelve las entradas del informe y qué módulos de HEAVY_MODULES quedaron cargados."""
+    name = _qualified(module)
+    code = (_BOOTSTRAP + f"import {name}\n"
+            f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n")
+    # El hijo resuelve el paquete igual que este proceso.
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(path for path in sys.path if path))
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                               capture_output=True, text=True, env=env, check=True)
+    heavy = [m for m in completed.stdout.strip().split(",") if m]
+    return parse_importtime(completed.stderr), heavy
+
+
+def import_cost(module: str, repeat: int = 5, warmup: int = 1) -> dict:
+    # Tiempo acumulado de importar `module` (segundos), en el formato de measure().
+    samples, heavy, entries = [], [], []
+    name = _qualified(module)
+    for i in range(warmup + repeat):
+        entries, heavy = run_importtime(module)
+        total = next(cumulative for entry, _, _, cumulative in entries if entry == name)
+        if i >= warmup:
+            samples.append(total / 1e3)
+    return {
+        "median": statistics.median(samples),
+        "min": min(samples),
+        "mean": statistics.fmean(samples),
+        "repeat": repeat,
+        "heavy_modules": heavy,
+        "entries": entries,
+    }
+
+
+def bench_startup(budgets: Optional[dict] = None, repeat: int = 5) -> dict:
+    # Coste de importación de cada punto de entrada, con su presupuesto y la base NumPy.
+    budgets = STARTUP_BUDGETS if budgets is None else budgets
+    baseline = import_cost(BASELINE_MODULE, repeat=repeat)
+    results = {f"startup/import/{BASELINE_MODULE}": _public(baseline)}
+    for module, budget_ms in budgets.items():
+        cost = import_cost(module, repeat=repeat)
+        loaded = {entry for entry, _, _, _ in cost["entries"]}
+        base = baseline["median"] if BASELINE_MODULE in loaded else 0.0
+        results[f"startup/import/{module}"] = dict(
+            _public(cost), budget_ms=budget_ms, overhead_ms=(cost["median"] - base) * 1e3)
+    return results
+
+
+def _public(cost: dict) -> dict:
+    return {key: value for key, value in cost.items() if key != "entries"}
+
+
+def check_budgets(results: dict) -> list[str]:
+    # Mensajes de los casos que superan su presupuesto o cargan un stack pesado.
+    problems = []
+    for name, result in sorted(results.items()):
+        if "budget_ms" not in result:
+            continue
+        if result["overhead_ms"] > result["budget_ms"]:
+            problems.append(f"{name}: {result['overhead_ms']:.1f}ms > {result['budget_ms']:.1f}ms")
+        if result["heavy_modules"]:
+            problems.append(f"{name}: carga {', '.join(result['heavy_modules'])}")
+    return problems
+
+
+def format_report(module: str, entries: list[tuple[str, int, float, float]], min_ms: float = 1.0) -> str:
+    # Informe estilo -X importtime: módulos con acumulado >= min_ms, en orden de carga.
+    lines = [f"# import {_qualified(module)}",
+             f"{'propio [ms]':>12} | {'acumulado [ms]':>14} | módulo"]
+    for name, depth, own, cumulative in entries:
+        if cumulative >= min_ms:
+            lines.append(f"{own:>12.2f} | {cumulative:>14.2f} | {'  ' * depth}{name}")
+    return "\n".join(lines)
+
+
+def write_report(path, modules=None) -> str:
+    # Escribe el informe de importación de cada módulo (para versionarlo junto a los benchmarks).
+    modules = list(STARTUP_BUDGETS) if modules is None else modules
+    sections = [format_report(module, run_importtime(module)[0]) for module in modules]
+    text = "\n\n".join(sections) + "\n"
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return text
@@ -0,0 +1,162 @@
+import numpy as np
+
+# Máximo de elementos por hoja.
+LEAF_SIZE = 4
+
+
+def classify_boxes(planes: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # Prueba vectorizada de K cajas contra los planos (normal hacia dentro).
+    """
+    Devuelve ``(outside, inside)``: fuera de algún plano, o totalmente dentro
+    de todos. Las cajas que no cumplen ninguna de las dos intersecan el borde.
+    """
+    normals = planes[:, :3]
+    offsets = planes[:, 3]
+    a = lo[:, None, :] * normals
+    b = hi[:, None, :] * normals
+    far = np.maximum(a, b).sum(axis=-1) + offsets
+    near = np.minimum(a, b).sum(axis=-1) + offsets
+    return (far < 0).any(axis=1), (near >= 0).all(axis=1)
+
+
+def _ranges(starts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    # Concatena los rangos [start, start + count) sin bucle de Python.
+    total = int(counts.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+    return offsets + np.arange(total)
+
+
+# Jerarquía de volúmenes envolventes (AABB) sobre los modelos de la escena.
+class BVH:
+    """
+    Árbol binario construido por mediana sobre el eje más largo de los
+    centroides. Cada nodo cubre un rango contiguo de ``order``, así un nodo
+    totalmente visible aporta todos sus elementos sin seguir bajando. La
+    consulta recorre el árbol por niveles con operaciones vectorizadas, de
+    modo que su coste depende de los nodos que tocan el frustum.
+    """
+    def __init__(self, boxes: np.ndarray, leaf_size: int = LEAF_SIZE):
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 2, 3)
+        self.boxes = boxes.copy()
+        self.leaf_size = max(int(leaf_size), 1)
+        self.order = np.arange(len(boxes))
+        lo, hi, left, right, start, count, parent = [], [], [], [], [], [], []
+
+        def new_node(first: int, n: int, up: int) -> int:
+            items = self.order[first:first + n]
+            lo.append(self.boxes[items, 0].min(axis=0) if n else np.zeros(3))
+            hi.append(self.boxes[items, 1].max(axis=0) if n else np.zeros(3))
+            left.append(-1)
+            right.append(-1)
+            start.append(first)
+            count.append(n)
+            parent.append(up)
+            return len(lo) - 1
+
+        stack = [new_node(0, len(boxes), -1)]
+        centers = self.boxes.mean(axis=1)
+        while stack:
+            node = stack.pop()
+            first, n = start[node], count[node]
+            if n <= self.leaf_size:
+                continue
+            items = self.order[first:first + n]
+            extent = np.ptp(centers[items], axis=0)
+            axis = int(np.argmax(extent))
+            half = n // 2
+            split = np.argpartition(centers[items, axis], half)
+            self.order[first:first + n] = items[split]
+            left[node] = new_node(first, half, node)
+            right[node] = new_node(first + half, n - half, node)
+            stack.extend((left[node], right[node]))
+
+        self.lo = np.array(lo).reshape(-1, 3)
+        self.hi = np.array(hi).reshape(-1, 3)
+        self.left = np.array(left, dtype=np.int64)
+        self.right = np.array(right, dtype=np.int64)
+        self.start = np.array(start, dtype=np.int64)
+        self.count = np.array(count, dtype=np.int64)
+        self.parent = np.array(parent, dtype=np.int64)
+        # Hoja que contiene cada elemento (para refit).
+        self.leaf_of = np.empty(len(boxes), dtype=np.int64)
+        for node in np.flatnonzero(self.left < 0):
+            self.leaf_of[self.order[self.start[node]:self.start[node] + self.count[node]]] = node
+        # Profundidad de cada nodo (los hijos se crean después que su padre).
+        self.depth = np.zeros(len(self.parent), dtype=np.int64)
+        for _ in range(len(self.parent)):
+            deeper = np.where(self.parent >= 0, self.depth[np.maximum(self.parent, 0)] + 1, 0)
+            if np.array_equal(deeper, self.depth):
+                break
+            self.depth = deeper
+        self.nodes_visited = 0
+
+    def __len__(self) -> int:
+        return len(self.boxes)
+
+    def query(self, planes: np.ndarray) -> np.ndarray:
+        # Índices (ordenados) de los elementos cuya caja toca el frustum.
+        planes = np.asarray(planes, dtype=np.float64)
+        self.nodes_visited = 0
+        if len(self.boxes) == 0:
+            return np.empty(0, dtype=np.int64)
+        found = []
+        frontier = np.zeros(1, dtype=np.int64)
+        while frontier.size:
+            self.nodes_visited += frontier.size
+            outside, inside = classify_boxes(planes, self.lo[frontier], self.hi[frontier])
+            whole = frontier[inside]
+            if whole.size:
+                found.append(self.order[_ranges(self.start[whole], self.count[whole])])
+            partial = frontier[~outside & ~inside]
+            leaves = partial[self.left[partial] < 0]
+            if leaves.size:
+                items = self.order[_ranges(self.start[leaves], self.count[leaves])]
+                item_outside, _ = classify_boxes(planes, self.boxes[items, 0], self.boxes[items, 1])
+                found.append(items[~item_outside])
+            inner = partial[self.left[partial] >= 0]
+            frontier = np.concatenate((self.left[inner], self.right[inner]))
+        if not found:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.concatenate(found))
+
+    def refit(self, item: int, box: np.ndarray) -> None:
+        # Actualiza la caja de un elemento y reajusta sus ancestros (O(profundidad)).
+        self.boxes[item] = np.asarray(box, dtype=np.float64).reshape(2, 3)
+        node = int(self.leaf_of[item])
+        items = self.order[self.start[node]:self.start[node] + self.count[node]]
+        self.lo[node] = self.boxes[items, 0].min(axis=0)
+        self.hi[node] = self.boxes[items, 1].max(axis=0)
+        node = int(self.parent[node])
+        while node >= 0:
+            a, b = self.left[node], self.right[node]
+            self.lo[node] = np.minimum(self.lo[a], self.lo[b])
+            self.hi[node] = np.maximum(self.hi[a], self.hi[b])
+            node = int(self.parent[node])
+
+    def refit_many(self, items: np.ndarray, boxes: np.ndarray) -> None:
+        # Actualiza varias cajas y reajusta sus ancestros de abajo arriba, vectorizado.
+        """Equivale a ``refit`` por elemento, pero cada nivel del árbol se recorre una vez."""
+        items = np.asarray(items, dtype=np.int64).ravel()
+        if items.size == 0:
+            return
+        self.boxes[items] = np.asarray(boxes, dtype=np.float64).reshape(-1, 2, 3)
+        leaves = np.unique(self.leaf_of[items])
+        members = self.order[_ranges(self.start[leaves], self.count[leaves])]
+        offsets = np.concatenate(([0], np.cumsum(self.count[leaves])[:-1]))
+        self.lo[leaves] = np.minimum.reduceat(self.boxes[members, 0], offsets, axis=0)
+        self.hi[leaves] = np.maximum.reduceat(self.boxes[members, 1], offsets, axis=0)
+        touched = np.zeros(len(self.parent), dtype=bool)
+        nodes = self.parent[leaves]
+        nodes = np.unique(nodes[nodes >= 0])
+        while nodes.size:
+            touched[nodes] = True
+            nodes = self.parent[nodes]
+            nodes = np.unique(nodes[nodes >= 0])
+        touched_nodes = np.flatnonzero(touched)
+        for depth in range(int(self.depth[touched_nodes].max(initial=-1)), -1, -1):
+            level = touched_nodes[self.depth[touched_nodes] == depth]
+            a, b = self.left[level], self.right[level]
+            self.lo[level] = np.minimum(self.lo[a], self.lo[b])
+            self.hi[level] = np.maximum(self.hi[a], self.hi[b])
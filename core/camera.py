@@ -1,6 +1,82 @@
 import numpy as np
 from ..utils.math import normalize
 
+# Cambio de base Z-up -> OpenGL; constante, se comparte entre todas las cámaras.
+_OPENGL_SWAP = np.array([
+    [1, 0, 0, 0],  # X -> X
+    [0, 0, 1, 0],  # Z -> Y (vertical)
+    [0, 1, 0, 0],  # Y -> Z (profundidad)
+    [0, 0, 0, 1],
+], dtype=np.float32)
+_OPENGL_SWAP.setflags(write=False)
+_WORLD_UP = np.array([0.0, 0.0, 1.0])
+
+
+def orbit_positions(radius, polar, azimuth, target=(0.0, 0.0, 0.0)) -> np.ndarray:
+    # Convierte N estados esféricos (alrededor de target) a posiciones cartesianas.
+    """Posiciones (N, 3) en float64 para radios y ángulos que se difunden entre sí."""
+    radius, polar, azimuth = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(radius, dtype=np.float64)),
+        np.atleast_1d(np.asarray(polar, dtype=np.float64)),
+        np.atleast_1d(np.asarray(azimuth, dtype=np.float64)),
+    )
+    sin_polar = np.sin(polar)
+    offsets = np.stack((
+        radius * sin_polar * np.cos(azimuth),
+        radius * sin_polar * np.sin(azimuth),
+        radius * np.cos(polar),
+    ), axis=-1)
+    return offsets + np.asarray(target, dtype=np.float64)
+
+
+def look_at_matrices(positions, targets) -> np.ndarray:
+    # Versión vectorizada de Camera.view_matrix para recorridos completos.
+    """
+    Matrices de vista (N, 4, 4) en una sola llamada de NumPy.
+    Sigue las mismas convenciones de ejes que Camera (Y adelante, Z arriba).
+    """
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+    targets = np.broadcast_to(np.asarray(targets, dtype=np.float64), positions.shape)
+
+    forward = targets - positions
+    norm = np.linalg.norm(forward, axis=1, keepdims=True)
+    forward = np.divide(forward, norm, out=np.zeros_like(forward), where=norm > 0)
+
+    z_dot_y = forward[:, 2:3]
+    up = _WORLD_UP - z_dot_y * forward
+    up_norm = np.linalg.norm(up, axis=1, keepdims=True)
+    # En los polos el "arriba" se elige igual que Camera.camera_z.
+    pole_up = np.where(z_dot_y > 0, [0.0, -1.0, 0.0], [0.0, 1.0, 0.0])
+    up = np.where(up_norm > 1e-12, up / np.where(up_norm > 0, up_norm, 1.0), pole_up)
+
+    right = np.cross(forward, up)
+    right /= np.linalg.norm(right, axis=1, keepdims=True)
+
+    views = np.zeros((positions.shape[0], 4, 4), dtype=np.float64)
+    views[:, 0, :3] = right
+    views[:, 1, :3] = forward
+    views[:, 2, :3] = up
+    views[:, :3, 3] = -np.einsum('nij,nj->ni', views[:, :3, :3], positions)
+    views[:, 3, 3] = 1.0
+    return views.astype(np.float32)
+
+
+def frustum_planes(matrix) -> np.ndarray:
+    # Extrae los 6 planos del frustum de una matriz view-projection (Gribb-Hartmann).
+    """
+    Planos (6, 4) normalizados ``(a, b, c, d)`` en coordenadas del mundo, con la
+    normal hacia dentro: un punto p es visible si ``a*x + b*y + c*z + d >= 0``
+    para todos. Orden: izquierda, derecha, abajo, arriba, cerca, lejos.
+    """
+    m = np.asarray(matrix, dtype=np.float64)
+    planes = np.stack((
+        m[3] + m[0], m[3] - m[0],
+        m[3] + m[1], m[3] - m[1],
+        m[3] + m[2], m[3] - m[2],
+    ))
+    norms = np.linalg.norm(planes[:, :3], axis=1, keepdims=True)
+    return planes / np.where(norms > 0, norms, 1.0)
+
 
 # Cámara orbital con sistema Z-up y matrices compatibles con OpenGL.
 class Camera:
@@ -15,16 +91,70 @@ class Camera:
                  aspect_ratio: float = 16 / 9,
                  projection_matrix: np.ndarray | None = None):
         # Inicializa posición, objetivo y matrices base para la cámara.
-        self.position = np.array(position, dtype=np.float32)
-        self.target = np.array(target, dtype=np.float32)
+        # El contador de versión se incrementa en cada setter para que los
+        # consumidores (matriz cacheada, UBO del renderer) sepan si cambió algo.
+        self._version = 0
+        self._cached_version = -1
+        self._cached_matrix = None
+        self._cached_bytes = None
+        self._planes_version = -1
+        self._cached_planes = None
+        self.target = target
+        self.position = position
         self.theta = theta
         self.aspect_ratio = aspect_ratio
         if projection_matrix is None:
             self.projection_matrix = np.eye(4, dtype=np.float32)
         else:
-            self.projection_matrix = np.array(projection_matrix, dtype=np.float32)
+            self.projection_matrix = projection_matrix
+
+    # --- Estado versionado ---
+    @property
+    def version(self) -> int:
+        # Número que cambia cada vez que la cámara se modifica.
+        return self._version
+
+    def invalidate(self) -> None:
+        # Marca la cámara como modificada (p. ej. tras editar position in-place).
+        """Fuerza el recálculo de las matrices cacheadas."""
+        self._version += 1
+
+    @property
+    def position(self) -> np.ndarray:
+        return self._position
+
+    @position.setter
+    def position(self, value):
+        self._position = np.array(value, dtype=np.float32)
+        self._version += 1
+
+    @property
+    def target(self) -> np.ndarray:
+        return self._target
+
+    @target.setter
+    def target(self, value):
+        self._target = np.array(value, dtype=np.float32)
+        self._version += 1
+
+    @property
+    def aspect_ratio(self) -> float:
+        return self._aspect_ratio
+
+    @aspect_ratio.setter
+    def aspect_ratio(self, value: float):
+        self._aspect_ratio = float(value)
+        self._version += 1
+
+    @property
+    def projection_matrix(self) -> np.ndarray:
+        return self._projection_matrix
+
+    @projection_matrix.setter
+    def projection_matrix(self, value):
+        self._projection_matrix = np.array(value, dtype=np.float32)
+        self._version += 1
 
-    
     @property
     def opengl_swap(self) -> np.ndarray:
         # Matriz de cambio de base entre Z-up propio y convención OpenGL.
@@ -33,11 +163,7 @@ class Camera:
         Convierte de sistema Z-up (x, y, z)
         a sistema OpenGL (x, z, y) y viceversa.
         """
-        row1 = np.array([1, 0, 0, 0], dtype=np.float32)  # X -> X
-        row2 = np.array([0, 0, 1, 0], dtype=np.float32)  # Z -> Y (vertical)
-        row3 = np.array([0, 1, 0, 0], dtype=np.float32)  # Y -> Z (profundidad)
-        row4 = np.array([0, 0, 0, 1], dtype=np.float32)
-        return np.vstack([row1, row2, row3, row4])
+        return _OPENGL_SWAP
 
     # --- Ejes ortogonales camara ---
     @property
@@ -122,18 +248,53 @@ class Camera:
     def view_matrix(self) -> np.ndarray:
         # Construye la matriz look-at basada en los ejes canónicos.
         """Matriz de vista (look-at) calculada a partir de posición y orientación."""
-        f1 = np.append(self.camera_x, -self.camera_x @ self.position)
-        f2 = np.append(self.camera_y, -self.camera_y @ self.position)
-        f3 = np.append(self.camera_z, -self.camera_z @ self.position)
-        f4 = np.array([0.0, 0.0, 0.0, 1.0], dtype=np.float32)
-        return np.vstack([f1, f2, f3, f4], dtype=np.float32)
-    
+        # Cada eje se evalúa una sola vez en lugar de recorrer las propiedades por fila.
+        cam_y = self.camera_y
+        cam_z = self.camera_z
+        cam_x = normalize(np.cross(cam_y, cam_z))
+        view = np.eye(4, dtype=np.float32)
+        view[0, :3] = cam_x
+        view[1, :3] = cam_y
+        view[2, :3] = cam_z
+        view[:3, 3] = -(view[:3, :3] @ self.position)
+        return view
+
     @property
     def camera_matrix(self) -> np.ndarray:
         # Composición final lista para subir como uniform.
-        """Matriz view-projection en formato opengl bytes lista para subir al shader (transpuesta)."""
-        return (self.opengl_swap @ self.projection_matrix @ self.aspect_ratio_matrix @ self.view_matrix).astype('f4')
+        """Matriz view-projection (float32, solo lectura) cacheada por versión."""
+        if self._cached_version != self._version:
+            matrix = (self.opengl_swap @ self.projection_matrix @ self.aspect_ratio_matrix @ self.view_matrix).astype('f4')
+            matrix.setflags(write=False)
+            self._cached_matrix = matrix
+            self._cached_bytes = None
+            self._cached_version = self._version
+        return self._cached_matrix
 
+    @property
+    def camera_matrix_bytes(self) -> bytes:
+        # Bytes column-major (transpuestos) listos para un uniform o UBO.
+        """Matriz view-projection serializada para OpenGL, cacheada por versión."""
+        matrix = self.camera_matrix
+        if self._cached_bytes is None:
+            self._cached_bytes = matrix.T.tobytes()
+        return self._cached_bytes
+
+    @property
+    def frustum_planes(self) -> np.ndarray:
+        # Planos del frustum de la matriz actual, cacheados por versión.
+        if self._planes_version != self._version:
+            self._cached_planes = frustum_planes(self.camera_matrix)
+            self._planes_version = self._version
+        return self._cached_planes
+
+    def path_matrices(self, positions, targets=None) -> np.ndarray:
+        # Evalúa un recorrido de cámara completo con la proyección actual.
+        """Matrices view-projection (N, 4, 4) para N posiciones (y objetivos)."""
+        if targets is None:
+            targets = self.target
+        prefix = self.opengl_swap @ self.projection_matrix @ self.aspect_ratio_matrix
+        return (prefix @ look_at_matrices(positions, targets)).astype('f4')
 
     # --- Transformaciones ---
     def move(self, delta):
@@ -147,3 +308,120 @@ class Camera:
         # Reapunta la cámara a un nuevo objetivo sin mover la posición.
         """Reorienta la cámara hacia un nuevo objetivo."""
         self.target = np.array(target, dtype=np.float32)
+
+
+# Cámara orbital cuyo estado fuente es (radio, polar, azimut, objetivo).
+class OrbitCamera(Camera):
+    """
+    Variante orbital: la posición se deriva de coordenadas esféricas alrededor
+    de ``target`` en lugar de recuperarlas con arccos en cada lectura.
+    """
+    # Margen para no alcanzar los polos, donde el vector "arriba" es ambiguo.
+    POLAR_EPSILON = 1e-4
+    MIN_RADIUS = 1e-4
+
+    def __init__(self,
+                 position,
+                 target,
+                 theta: float = 0.0,
+                 aspect_ratio: float = 16 / 9,
+                 projection_matrix: np.ndarray | None = None):
+        # Estado esférico en float64 para no perder precisión cerca de los polos.
+        self._radius = 1.0
+        self._polar = np.pi / 2
+        self._azimuth = 0.0
+        self._position_version = -1
+        self._position_cache = None
+        super().__init__(position, target, theta, aspect_ratio, projection_matrix)
+
+    @classmethod
+    def from_spherical(cls,
+                       radius: float,
+                       polar: float,
+                       azimuth: float,
+                       target=(0.0, 0.0, 0.0),
+                       aspect_ratio: float = 16 / 9,
+                       projection_matrix: np.ndarray | None = None) -> "OrbitCamera":
+        # Construye la cámara directamente desde el estado esférico.
+        camera = cls(orbit_positions(radius, polar, azimuth, target)[0], target,
+                     aspect_ratio=aspect_ratio, projection_matrix=projection_matrix)
+        camera.set_orbit(radius, polar, azimuth)
+        return camera
+
+    # --- Estado esférico ---
+    @property
+    def position(self) -> np.ndarray:
+        # Deriva la posición del estado esférico; cacheada por versión.
+        if self._position_version != self._version:
+            position = orbit_positions(self._radius, self._polar, self._azimuth, self._target)[0]
+            self._position_cache = position.astype(np.float32)
+            self._position_cache.setflags(write=False)
+            self._position_version = self._version
+        return self._position_cache
+
+    @position.setter
+    def position(self, value):
+        # Conversión cartesiana -> esférica, solo al asignar la posición.
+        offset = np.asarray(value, dtype=np.float64) - self._target
+        radius = float(np.linalg.norm(offset))
+        if radius == 0.0:
+            polar, azimuth = self._polar, self._azimuth
+        else:
+            polar = float(np.arccos(np.clip(offset[2] / radius, -1.0, 1.0)))
+            azimuth = float(np.arctan2(offset[1], offset[0]))
+        self.set_orbit(radius, polar, azimuth)
+
+    @property
+    def camera_radius(self) -> float:
+        return self._radius
+
+    @camera_radius.setter
+    def camera_radius(self, r: float):
+        self.set_orbit(r, self._polar, self._azimuth)
+
+    @property
+    def camera_polar(self) -> float:
+        return self._polar
+
+    @camera_polar.setter
+    def camera_polar(self, theta: float):
+        self.set_orbit(self._radius, theta, self._azimuth)
+
+    @property
+    def camera_azimuthal(self) -> float:
+        return self._azimuth
+
+    @camera_azimuthal.setter
+    def camera_azimuthal(self, phi: float):
+        self.set_orbit(self._radius, self._polar, phi)
+
+    def set_orbit(self, radius: float, polar: float, azimuth: float) -> None:
+        # Fija el estado completo con un único incremento de versión.
+        """Asigna radio, ángulo polar y azimut (acotados a rangos válidos)."""
+        self._radius = max(float(radius), self.MIN_RADIUS)
+        self._polar = float(np.clip(polar, self.POLAR_EPSILON, np.pi - self.POLAR_EPSILON))
+        self._azimuth = float((azimuth + np.pi) % (2 * np.pi) - np.pi)
+        self._version += 1
+
+    def orbit(self, d_azimuth: float = 0.0, d_polar: float = 0.0, zoom: float = 1.0) -> None:
+        # Aplica arrastre y zoom acumulados de una sola vez.
+        """Rota ``d_azimuth``/``d_polar`` radianes y escala el radio por ``zoom``."""
+        self.set_orbit(self._radius * zoom, self._polar + d_polar, self._azimuth + d_azimuth)
+
+    def orbit_path_matrices(self, radius, polar, azimuth) -> np.ndarray:
+        # Recorrido orbital vectorizado alrededor del objetivo actual.
+        """Matrices view-projection (N, 4, 4) para arreglos de estados esféricos."""
+        return self.path_matrices(orbit_positions(radius, polar, azimuth, self._target))
+
+    # --- Transformaciones ---
+    def move(self, delta):
+        # Trasladar el objetivo arrastra la órbita completa.
+        """Desplaza la cámara y su objetivo (en coordenadas del mundo)."""
+        self.target = self._target + np.asarray(delta, dtype=np.float32)
+
+    def look_at(self, target):
+        # Mantiene la posición y recalcula la órbita alrededor del nuevo objetivo.
+        """Reorienta la cámara hacia un nuevo objetivo."""
+        position = np.array(self.position, dtype=np.float64)
+        self._target = np.array(target, dtype=np.float32)
+        self.position = position
@@ -1,14 +1,58 @@
 import numpy as np
 from .models import Material, RenderProperties
 
+
+def compute_bounds(vertices: np.ndarray) -> np.ndarray:
+    # Caja envolvente alineada a ejes: fila 0 = mínimo, fila 1 = máximo.
+    """AABB (2, 3) en float32; los vértices 2D se completan con z=0."""
+    vertices = np.asarray(vertices)
+    width = vertices.shape[-1] if vertices.ndim == 2 else 3
+    points = vertices.reshape(-1, width)[:, :3]
+    bounds = np.zeros((2, 3), dtype=np.float32)
+    if points.shape[0]:
+        bounds[0, :points.shape[1]] = points.min(axis=0)
+        bounds[1, :points.shape[1]] = points.max(axis=0)
+    return bounds
+
+
 # --- Polyline: base geométrica ---
 # Envuelve una lista de vértices y los materiales asociados.
 class Polyline:
-    def __init__(self, vertices: np.ndarray, material: Material, render_properties: RenderProperties):
-        # Copia los vértices como float32 y almacena config visual y de shaders.
-        self.vertices = np.array(vertices, dtype=np.float32)
+    # False si el shader desplaza los vértices fuera de la caja calculada en CPU.
+    cullable: bool = True
+    # Nodo del SceneGraph que coloca el mesh en el mundo (None: en el origen).
+    node: int | None = None
+
+    def __init__(self, vertices: np.ndarray, material: Material, render_properties: RenderProperties,
+                 aabb: np.ndarray | None = None, *, copy: bool = True):
+        # Vértices en float32 y config visual y de shaders.
+        # aabb: caja ya conocida (p. ej. guardada en MeshCache) para no recorrer los vértices.
+        # copy=False solo para arrays propios (generadores internos, cargas de MeshCache):
+        # si el llamador los muta después, aabb y bounding_sphere quedan desfasados.
+        self.vertices = np.array(vertices, dtype=np.float32) if copy else np.asarray(vertices, dtype=np.float32)
         self.material = material or Material()
         self.render_properties = render_properties
+        if aabb is None:
+            self.update_bounds()
+        else:
+            self.set_bounds(aabb)
+
+    def set_bounds(self, aabb: np.ndarray) -> None:
+        # Fija la caja (2, 3) y deriva la esfera envolvente.
+        self.aabb = np.array(aabb, dtype=np.float32).reshape(2, 3)
+        center = self.aabb.mean(axis=0)
+        radius = float(np.linalg.norm(self.aabb[1] - self.aabb[0])) * 0.5
+        self.bounding_sphere = (center, radius)
+
+    def update_bounds(self) -> None:
+        # Recalcula la caja y la esfera envolventes (llamar tras editar vértices).
+        self.set_bounds(compute_bounds(self.vertices))
+
+    def grow_bounds(self, points: np.ndarray) -> None:
+        # Amplía la caja para incluir puntos nuevos sin recorrer todos los vértices.
+        """Cota conservadora tras una actualización parcial de vértices."""
+        extra = compute_bounds(points)
+        self.set_bounds(np.stack((np.minimum(self.aabb[0], extra[0]), np.maximum(self.aabb[1], extra[1]))))
 
     @property
     def flat_vertices(self) -> np.ndarray:
@@ -26,23 +70,45 @@ class Polyline:
 # --- Mesh: agrega topología ---
 # Especializa Polyline con índices para dibujar triángulos o tiras.
 class Mesh(Polyline):
-    def __init__(self, vertices: np.ndarray, indices: np.ndarray, material: Material, render_properties: RenderProperties):
-        super().__init__(vertices, material, render_properties)
-        self.indices = np.array(indices, dtype=np.int32)
+    # Formato y nombre del atributo de vértice que consume el shader.
+    vertex_layout: tuple[str, ...] = ('3f', 'in_pos')
+    # Clave de índices compartidos (p. ej. forma de rejilla); None si son propios.
+    index_key: tuple | None = None
+    # Índice de reinicio de primitiva presente en los índices, si lo hay.
+    restart_index: int | None = None
+
+    def __init__(self, vertices: np.ndarray, indices: np.ndarray, material: Material, render_properties: RenderProperties,
+                 aabb: np.ndarray | None = None, *, copy: bool = True):
+        super().__init__(vertices, material, render_properties, aabb=aabb, copy=copy)
+        # uint16/uint32 se conservan (IBO compacto); cualquier otro tipo pasa a int32.
+        indices = np.array(indices) if copy else np.asarray(indices)
+        if indices.dtype not in (np.uint16, np.uint32):
+            indices = indices.astype(np.int32, copy=False)
+        self.indices = indices
 
     @property
     def flat_indices(self) -> np.ndarray:
         # Indices lineales listos para el IBO.
         return self.indices.flatten().astype('i4')
 
+    @property
+    def vertex_data(self) -> np.ndarray:
+        # Filas por vértice tal y como se suben al VBO (según vertex_layout).
+        return self.vertices
+
     @property
     def vertex_buffer(self) -> bytes:
         # Paquete de vértices para buffer de posición.
         """Bytes de vértices listos para buffer."""
         return self.flat_vertices.tobytes()
 
+    @property
+    def index_element_size(self) -> int:
+        # Bytes por índice en el IBO (2 o 4).
+        return self.indices.dtype.itemsize
+
     @property
     def index_buffer(self) -> bytes:
         # Paquete de índices para buffer de elementos.
         """Bytes de índices listos para buffer."""
-        return self.flat_indices.tobytes()
+        return np.ascontiguousarray(self.indices).tobytes()
@@ -0,0 +1,209 @@
+import hashlib
+import inspect
+import json
+import logging
+import os
+import shutil
+import tempfile
+import textwrap
+import time
+import types
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+META_FILE = "meta.json"
+
+
+def equation_fingerprint(equation) -> str:
+    # Texto estable que identifica una ecuación: su fuente y los valores capturados.
+    """
+    Usa el código fuente (o el bytecode si no está disponible) junto con los
+    valores por defecto y de cierre (ver ``_stable_value``). Las variables
+    globales que lea la función no se incluyen: en ese caso pase una clave
+    explícita.
+    """
+    source = getattr(equation, "source", None)
+    if isinstance(source, str):
+        return f"expression:{source}"
+    if not callable(equation):
+        raise ValueError(f"No se puede identificar la ecuación: {equation!r}")
+    code = getattr(equation, "__code__", None)
+    if code is None:
+        # ufuncs de NumPy y otros objetos invocables sin código Python.
+        return f"callable:{type(equation).__module__}.{getattr(equation, '__name__', repr(equation))}"
+    try:
+        body = textwrap.dedent(inspect.getsource(equation))
+    except (OSError, TypeError):
+        body = code.co_code.hex() + repr(code.co_consts)
+    captured = [_stable_value(cell.cell_contents) for cell in (equation.__closure__ or ())]
+    return json.dumps({
+        "name": code.co_name,
+        "source": body,
+        "defaults": _stable_value(equation.__defaults__),
+        "kwdefaults": _stable_value(equation.__kwdefaults__),
+        "closure": captured,
+    }, sort_keys=True)
+
+
+def _stable_value(value) -> str:
+    # Representación de un valor capturado que no depende del proceso ni de la impresión de NumPy.
+    """
+    Los arrays se identifican por dtype, forma y sha256 de su contenido (el
+    ``repr`` de NumPy resume los grandes y redondea). Los valores sin una
+    representación estable (p. ej. objetos cuyo ``repr`` incluye su dirección)
+    lanzan ``ValueError``: en ese caso pase una clave explícita.
+    """
+    if value is None or isinstance(value, (bool, int, float, complex, str, bytes)):
+        return repr(value)
+    if isinstance(value, np.ndarray):
+        data = np.ascontiguousarray(value)
+        if data.dtype.hasobject:
+            raise ValueError("No se puede identificar un array de objetos; pase cache_key")
+        return f"ndarray:{data.dtype.str}:{data.shape}:{hashlib.sha256(data.tobytes()).hexdigest()}"
+    if isinstance(value, np.generic):
+        return f"{value.dtype.str}:{value.item()!r}"
+    if isinstance(value, (tuple, list)):
+        return f"{type(value).__name__}[{','.join(_stable_value(item) for item in value)}]"
+    if isinstance(value, (set, frozenset)):
+        return f"{type(value).__name__}[{','.join(sorted(_stable_value(item) for item in value))}]"
+    if isinstance(value, dict):
+        items = sorted(f"{_stable_value(k)}:{_stable_value(v)}" for k, v in value.items())
+        return f"dict[{','.join(items)}]"
+    if isinstance(value, types.ModuleType):
+        return f"module:{value.__name__}"
+    if callable(value):
+        return equation_fingerprint(value)
+    raise ValueError(f"El valor capturado {type(value).__name__} no tiene una representación "
+                     f"estable para la caché de meshes; pase cache_key")
+
+
+def cache_key(kind: str, equation=None, params: Optional[dict] = None,
+              key: Optional[str] = None, version: int = 0) -> str:
+    # Hash sha256 de (tipo de mesh, ecuación o clave de usuario, parámetros, versión).
+    digest = hashlib.sha256()
+    identity = key if key is not None else equation_fingerprint(equation)
+    payload = {"kind": kind, "identity": identity, "params": params or {}, "version": version}
+    digest.update(json.dumps(payload, sort_keys=True, default=repr).encode("utf-8"))
+    return digest.hexdigest()
+
+
+# Caché en disco de arrays de meshes generados, cargados con memoria mapeada.
+class MeshCache:
+    """
+    Cada entrada es un directorio con un ``.npy`` por array y ``meta.json``.
+    Las cargas usan ``np.load(mmap_mode='c')``: el arreglo se pagina desde el
+    archivo y puede pasarse tal cual a ``ctx.buffer`` sin copia intermedia
+    (las escrituras quedan en memoria privada, no en disco). Al superar
+    ``max_bytes`` se eliminan las entradas usadas hace más tiempo.
+    """
+    def __init__(self, cache_dir: Path, max_bytes: int = 1 << 30):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_bytes)
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def _entry(self, key: str) -> Path:
+        return self.cache_dir / key
+
+    def load(self, key: str) -> Optional[tuple[dict[str, np.ndarray], dict]]:
+        # Arrays (memmap) y metadatos de la entrada, o None si no existe o está dañada.
+        entry = self._entry(key)
+        meta_path = entry / META_FILE
+        if not meta_path.exists():
+            self.misses += 1
+            return None
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            arrays = {name: np.load(entry / f"{name}.npy", mmap_mode="c") for name in meta["arrays"]}
+        except (OSError, ValueError, KeyError):
+            logger.warning("Entrada de caché de meshes ilegible, se descarta: %s", entry)
+            shutil.rmtree(entry, ignore_errors=True)
+            self.misses += 1
+            return None
+        os.utime(meta_path)
+        self.hits += 1
+        return arrays, meta.get("data", {})
+
+    def store(self, key: str, arrays: dict[str, np.ndarray], data: Optional[dict] = None) -> None:
+        # Escribe la entrada en un directorio temporal y la publica con un rename atómico.
+        entry = self._entry(key)
+        # Directorio único por llamada: hilos o procesos que guardan la misma clave no se pisan.
+        staging = Path(tempfile.mkdtemp(prefix=f".{key}.", suffix=".tmp", dir=self.cache_dir))
+        try:
+            for name, array in arrays.items():
+                np.save(staging / f"{name}.npy", np.ascontiguousarray(array), allow_pickle=False)
+            meta = {"arrays": sorted(arrays), "data": data or {}, "created": time.time()}
+            (staging / META_FILE).write_text(json.dumps(meta), encoding="utf-8")
+            if entry.exists():
+                shutil.rmtree(entry, ignore_errors=True)
+            os.replace(staging, entry)
+        except OSError:
+            logger.warning("No se pudo guardar la entrada de caché %s", key, exc_info=True)
+            shutil.rmtree(staging, ignore_errors=True)
+            return
+        self.stores += 1
+        self.evict()
+
+    def get_or_create(self, key: str, build: Callable[[], tuple[dict[str, np.ndarray], dict]]):
+        # Carga la entrada o la genera con build() y la guarda; devuelve (arrays, data).
+        cached = self.load(key)
+        if cached is not None:
+            return cached
+        arrays, data = build()
+        self.store(key, arrays, data)
+        return arrays, data
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        # (último uso, bytes, ruta) de cada entrada publicada.
+        entries = []
+        for entry in self.cache_dir.iterdir():
+            meta_path = entry / META_FILE
+            if entry.name.startswith(".") or not meta_path.exists():
+                continue
+            size = sum(path.stat().st_size for path in entry.iterdir())
+            entries.append((meta_path.stat().st_mtime, size, entry))
+        return entries
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self) -> int:
+        # Elimina las entradas menos usadas hasta que el total quepa en max_bytes.
+        entries = sorted(self._entries(), key=lambda item: item[0])
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, entry in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            removed += 1
+        self.evictions += removed
+        return removed
+
+    def clear(self) -> None:
+        # Vacía la caché por completo.
+        for _, _, entry in self._entries():
+            shutil.rmtree(entry, ignore_errors=True)
+
+    @property
+    def stats(self) -> dict:
+        # Aciertos, fallos y ocupación actual en disco.
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+        }
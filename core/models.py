@@ -1,16 +1,37 @@
-from pydantic import BaseModel, Field
+from dataclasses import dataclass, field
 from typing import Optional, Tuple
 
+# Modelos del camino caliente: dataclasses con __slots__, sin validación ni
+# dependencias. La validación de datos externos vive en core/schemas.py.
+
+Color = Tuple[float, float, float, float]
+
+# Modos de primitiva OpenGL (valores del estándar, los mismos que moderngl.*);
+# las formas los usan sin importar el stack GL.
+GL_POINTS = 0x0000
+GL_LINES = 0x0001
+GL_LINE_STRIP = 0x0003
+GL_TRIANGLES = 0x0004
+GL_TRIANGLE_STRIP = 0x0005
+
+
 # --- Material (atributos visuales) ---
 # Describe colores básicos y grosor de líneas para una primitiva.
-class Material(BaseModel):
-    fill_color: Tuple[float, float, float, float] = (1.0, 1.0, 1.0, 1.0)
-    stroke_color: Tuple[float, float, float, float] = (0.0, 0.0, 0.0, 1.0)
+@dataclass(slots=True)
+class Material:
+    fill_color: Color = (1.0, 1.0, 1.0, 1.0)
+    stroke_color: Color = (0.0, 0.0, 0.0, 1.0)
     stroke_width: Optional[float] = 1.0
 
+
 # Parametriza shaders, modo GL y uniformes asociados a un mesh.
-class RenderProperties(BaseModel):
+@dataclass(slots=True)
+class RenderProperties:
     vertex_shader_path: str
     fragment_shader_path: str
     gl_mode: Optional[int] = None
-    uniforms: list[dict] = Field(default_factory=list)
+    uniforms: list[dict] = field(default_factory=list)
+    # Código GLSL generado; si existe, sustituye al archivo de vertex_shader_path.
+    vertex_shader_source: Optional[str] = None
+    # Vertex shader alternativo que lee los uniforms por instancia (modo batch).
+    batch_vertex_shader_path: Optional[str] = None
@@ -0,0 +1,216 @@
+import numpy as np
+from typing import Optional
+
+
+def transform_boxes(boxes: np.ndarray, matrices: np.ndarray) -> np.ndarray:
+    # Cajas (N, 2, 3) transformadas por matrices afines (N, 4, 4): caja que envuelve el resultado.
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 2, 3)
+    matrices = np.asarray(matrices, dtype=np.float64).reshape(-1, 4, 4)
+    center = boxes.mean(axis=1)
+    half = (boxes[:, 1] - boxes[:, 0]) * 0.5
+    linear = matrices[:, :3, :3]
+    world_center = np.einsum('nij,nj->ni', linear, center) + matrices[:, :3, 3]
+    world_half = np.einsum('nij,nj->ni', np.abs(linear), half)
+    return np.stack((world_center - world_half, world_center + world_half), axis=1)
+
+
+# Grafo de escena: nodos con transformación local y jerarquía padre-hijo.
+class SceneGraph:
+    """
+    Los nodos son enteros y sus datos viven en arrays (matriz local y de
+    mundo, padre, profundidad). ``set_local`` solo marca el nodo como sucio;
+    ``update`` recalcula los subárboles sucios nivel a nivel, con un producto
+    de matrices vectorizado por nivel: mover un panel con 1000 hijos es un
+    único matmul de 1000 matrices. Cada matriz recalculada guarda la versión
+    en la que cambió, de modo que cada consumidor (p. ej. un Renderer) sube
+    solo lo que cambió desde su última versión con ``changed_since``.
+    """
+    def __init__(self, capacity: int = 64):
+        capacity = max(int(capacity), 1)
+        self._local = np.zeros((capacity, 4, 4), dtype=np.float32)
+        self._world = np.zeros((capacity, 4, 4), dtype=np.float32)
+        self._parent = np.full(capacity, -1, dtype=np.int64)
+        self._depth = np.zeros(capacity, dtype=np.int64)
+        self._dirty = np.zeros(capacity, dtype=bool)
+        # Versión en la que cambió por última vez la matriz de mundo de cada nodo.
+        self._changed = np.zeros(capacity, dtype=np.int64)
+        self._count = 0
+        self._version = 0
+        # Nodos agrupados por profundidad (se recalcula al cambiar la jerarquía).
+        self._levels: Optional[list[np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def version(self) -> int:
+        # Número que cambia cada vez que update() recalcula alguna matriz de mundo.
+        return self._version
+
+    def _check(self, node: int) -> int:
+        node = int(node)
+        if not 0 <= node < self._count:
+            raise ValueError(f"Nodo de escena inexistente: {node}")
+        return node
+
+    def _grow(self, needed: int) -> None:
+        # Duplica la capacidad de los arrays por nodo.
+        capacity = len(self._parent)
+        if needed <= capacity:
+            return
+        capacity = max(needed, capacity * 2)
+        for name, fill in (("_local", 0.0), ("_world", 0.0), ("_parent", -1), ("_depth", 0),
+                           ("_dirty", False), ("_changed", 0)):
+            old = getattr(self, name)
+            new = np.full((capacity, *old.shape[1:]), fill, dtype=old.dtype)
+            new[:self._count] = old[:self._count]
+            setattr(self, name, new)
+
+    def add(self, local=None, parent: Optional[int] = None) -> int:
+        # Crea un nodo (identidad si no se da matriz local) y devuelve su índice.
+        if parent is not None:
+            parent = self._check(parent)
+        node = self._count
+        self._grow(node + 1)
+        self._count += 1
+        self._local[node] = np.eye(4, dtype=np.float32) if local is None else _matrix(local)
+        self._parent[node] = -1 if parent is None else parent
+        self._depth[node] = 0 if parent is None else self._depth[parent] + 1
+        self._dirty[node] = True
+        self._levels = None
+        return node
+
+    def add_many(self, locals_, parent: Optional[int] = None) -> np.ndarray:
+        # Crea un nodo por matriz local (N, 4, 4) con el mismo padre; devuelve sus índices.
+        locals_ = np.asarray(locals_, dtype=np.float32).reshape(-1, 4, 4)
+        if parent is not None:
+            parent = self._check(parent)
+        first = self._count
+        self._grow(first + len(locals_))
+        nodes = np.arange(first, first + len(locals_))
+        self._count += len(locals_)
+        self._local[nodes] = locals_
+        self._parent[nodes] = -1 if parent is None else parent
+        self._depth[nodes] = 0 if parent is None else self._depth[parent] + 1
+        self._dirty[nodes] = True
+        self._levels = None
+        return nodes
+
+    def parent(self, node: int) -> Optional[int]:
+        parent = int(self._parent[self._check(node)])
+        return None if parent < 0 else parent
+
+    def children(self, node: int) -> np.ndarray:
+        return np.flatnonzero(self._parent[:self._count] == self._check(node))
+
+    def set_parent(self, node: int, parent: Optional[int]) -> None:
+        # Cuelga el nodo (con su subárbol) de otro padre, o lo vuelve raíz con None.
+        node = self._check(node)
+        if parent is not None:
+            ancestor = self._check(parent)
+            while ancestor >= 0:
+                if ancestor == node:
+                    raise ValueError(f"El nodo {node} no puede colgar de su propio subárbol")
+                ancestor = int(self._parent[ancestor])
+        self._parent[node] = -1 if parent is None else parent
+        self._dirty[node] = True
+        self._update_depths()
+
+    def _update_depths(self) -> None:
+        # Recalcula la profundidad de todos los nodos desde las raíces.
+        parent = self._parent[:self._count]
+        depth = np.zeros(self._count, dtype=np.int64)
+        frontier = np.flatnonzero(parent < 0)
+        level = 0
+        while frontier.size:
+            depth[frontier] = level
+            frontier = np.flatnonzero(np.isin(parent, frontier))
+            level += 1
+        self._depth[:self._count] = depth
+        self._levels = None
+
+    def local(self, node: int) -> np.ndarray:
+        return self._local[self._check(node)].copy()
+
+    def set_local(self, node: int, matrix) -> None:
+        # Reemplaza la matriz local; los mundos se recalculan en el próximo update().
+        node = self._check(node)
+        self._local[node] = _matrix(matrix)
+        self._dirty[node] = True
+
+    def set_locals(self, nodes, matrices) -> None:
+        # Versión vectorizada de set_local para muchos nodos a la vez.
+        nodes = np.asarray(nodes, dtype=np.int64).ravel()
+        if nodes.size and (nodes.min() < 0 or nodes.max() >= self._count):
+            raise ValueError("Nodos de escena inexistentes en set_locals")
+        self._local[nodes] = np.asarray(matrices, dtype=np.float32).reshape(-1, 4, 4)
+        self._dirty[nodes] = True
+
+    def translate(self, node: int, delta) -> None:
+        # Desplaza el nodo (en el espacio de su padre).
+        node = self._check(node)
+        self._local[node, :3, 3] += np.asarray(delta, dtype=np.float32).reshape(3)
+        self._dirty[node] = True
+
+    def world(self, node: int) -> np.ndarray:
+        # Matriz de mundo actualizada del nodo.
+        node = self._check(node)
+        self.update()
+        return self._world[node].copy()
+
+    @property
+    def world_matrices(self) -> np.ndarray:
+        # Matrices de mundo (N, 4, 4) actualizadas, de solo lectura.
+        self.update()
+        view = self._world[:self._count]
+        view.flags.writeable = False
+        return view
+
+    def _build_levels(self) -> list[np.ndarray]:
+        depth = self._depth[:self._count]
+        order = np.argsort(depth, kind="stable")
+        counts = np.bincount(depth) if self._count else np.zeros(0, dtype=np.int64)
+        return np.split(order, np.cumsum(counts)[:-1]) if counts.size else []
+
+    def update(self) -> np.ndarray:
+        # Recalcula las matrices de mundo de los subárboles sucios; devuelve los nodos que cambiaron.
+        count = self._count
+        dirty = self._dirty[:count]
+        if not dirty.any():
+            return np.empty(0, dtype=np.int64)
+        if self._levels is None:
+            self._levels = self._build_levels()
+        parent = self._parent[:count]
+        for level in self._levels:
+            parents = parent[level]
+            has_parent = parents >= 0
+            # Un nodo se recalcula si está sucio o si se recalculó su padre.
+            inherited = np.zeros(level.size, dtype=bool)
+            inherited[has_parent] = dirty[parents[has_parent]]
+            selected = dirty[level] | inherited
+            if not selected.any():
+                continue
+            nodes = level[selected]
+            dirty[nodes] = True
+            roots = nodes[parent[nodes] < 0]
+            children = nodes[parent[nodes] >= 0]
+            self._world[roots] = self._local[roots]
+            if children.size:
+                self._world[children] = self._world[parent[children]] @ self._local[children]
+        changed = np.flatnonzero(dirty)
+        self._version += 1
+        self._changed[changed] = self._version
+        dirty[:] = False
+        return changed
+
+    def changed_since(self, version: int) -> np.ndarray:
+        # Nodos cuya matriz de mundo cambió después de la versión dada.
+        self.update()
+        return np.flatnonzero(self._changed[:self._count] > version)
+
+
+def _matrix(value) -> np.ndarray:
+    matrix = np.asarray(value, dtype=np.float32)
+    if matrix.shape != (4, 4):
+        raise ValueError(f"Se esperaba una matriz 4x4, no {matrix.shape}")
+    return matrix
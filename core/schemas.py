@@ -0,0 +1,48 @@
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Any, Optional, Tuple
+from .models import Material, RenderProperties
+
+# Validación en la frontera de la API (configuración, archivos, entrada del
+# usuario). El resto del código trabaja con los dataclasses de core/models.py,
+# así que pydantic solo se importa cuando alguien importa este módulo.
+
+
+# Esquema validado de Material.
+class MaterialSchema(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    fill_color: Tuple[float, float, float, float] = (1.0, 1.0, 1.0, 1.0)
+    stroke_color: Tuple[float, float, float, float] = (0.0, 0.0, 0.0, 1.0)
+    stroke_width: Optional[float] = Field(default=1.0, ge=0.0)
+
+    def to_model(self) -> Material:
+        return Material(self.fill_color, self.stroke_color, self.stroke_width)
+
+
+# Esquema validado de RenderProperties.
+class RenderPropertiesSchema(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    vertex_shader_path: str
+    fragment_shader_path: str
+    gl_mode: Optional[int] = None
+    uniforms: list[dict] = Field(default_factory=list)
+    vertex_shader_source: Optional[str] = None
+    batch_vertex_shader_path: Optional[str] = None
+
+    def to_model(self) -> RenderProperties:
+        return RenderProperties(**{name: getattr(self, name) for name in type(self).model_fields})
+
+
+def validate_material(data: Any) -> Material:
+    # Valida un dict (o Material) externo y devuelve el dataclass ligero.
+    if isinstance(data, Material):
+        data = {name: getattr(data, name) for name in Material.__slots__}
+    return MaterialSchema.model_validate(data).to_model()
+
+
+def validate_render_properties(data: Any) -> RenderProperties:
+    # Valida un dict (o RenderProperties) externo y devuelve el dataclass ligero.
+    if isinstance(data, RenderProperties):
+        data = {name: getattr(data, name) for name in RenderProperties.__slots__}
+    return RenderPropertiesSchema.model_validate(data).to_model()
@@ -1,12 +1,21 @@
 import moderngl_window as mglw
 import numpy as np
-import moderngl_window as mglw
-import numpy as np
+from pathlib import Path
 from app.window import OpenWindow
+from rendering.async_mesh import MeshBuilder
 from rendering.renderer import Renderer
+from rendering.shader import enable_shader_disk_cache, write_startup_report
+from core.camera import OrbitCamera
+from core.mesh_cache import MeshCache
 from core.models import Material
 from shapes.equation import Equation3dMesh
 from utils.math import perspective_proj_matrix
+from utils.tokens import load_theme
+
+# Caché persistente de programas compilados (driver) e informe de arranque.
+SHADER_CACHE_DIR = Path(__file__).parent / ".cache" / "shaders"
+# Vértices generados de las ecuaciones, reutilizados entre ejecuciones.
+MESH_CACHE_DIR = Path(__file__).parent / ".cache" / "meshes"
 
 def main():
     # Configuración inicial de la ventana
@@ -41,6 +50,10 @@ class Application(OpenWindow):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         
+        # Tokens de diseño precompilados (build/theme.py); solo se regeneran si
+        # cambió design.toml.
+        theme = load_theme()
+
         # Scene Setup
         material = Material(fill_color=(1.0, 0.5, 0.2, 1.0))
         
@@ -48,22 +61,36 @@ class Application(OpenWindow):
             r = np.sqrt(x**2 + y**2)
             return np.sin(r) / (r + 0.001)
 
-        mesh = Equation3dMesh(material, sombrero, 50, 50)
+        # Vista previa de baja resolución para el primer frame; la malla completa
+        # se genera en segundo plano y el Renderer la sustituye al terminar.
+        mesh_cache = MeshCache(MESH_CACHE_DIR)
+        preview = Equation3dMesh(material, sombrero, 8, 8)
+        self.mesh_builder = MeshBuilder()
+        full = self.mesh_builder.submit("sombrero", Equation3dMesh, material, sombrero, 50, 50, cache=mesh_cache)
         
         # Camera Setup
         aspect = self.window_size[0] / self.window_size[1]
         proj = perspective_proj_matrix(np.radians(45.0), 0.1, 100.0)
         
+        camera = OrbitCamera(
+            position=[3.0, 3.0, 3.0],
+            target=[0.0, 0.0, 0.0],
+            aspect_ratio=aspect,
+            projection_matrix=proj,
+        )
+
         # Renderer Setup
         self.renderer = Renderer(
             wnd_size=self.window_size,
-            models=[mesh],
+            models=[preview],
             ctx=self.ctx,
-            camera=None # Renderer creates default camera
+            camera=camera,
+            # ctx.clear escribe el valor tal cual en un framebuffer sin sRGB.
+            background_color=theme.ROLES_SRGB["bg_base"],
         )
-        self.renderer.camera.projection_matrix = proj
-        self.renderer.camera.position = np.array([3.0, 3.0, 3.0], dtype=np.float32)
-        self.renderer.camera.look_at([0.0, 0.0, 0.0])
+        self.renderer.replace_mesh(0, full)
+        write_startup_report(self.renderer.program_cache, SHADER_CACHE_DIR / "startup_report.json")
 
 if __name__ == '__main__':
+    enable_shader_disk_cache(SHADER_CACHE_DIR)
     mglw.run_window_config(Application)
@@ -0,0 +1,110 @@
+import logging
+import numpy as np
+import moderngl
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Hashable, Optional
+from ..core.geometry import Mesh
+from .indices import IndexBufferCache
+
+logger = logging.getLogger(__name__)
+
+# Bytes que el Renderer sube por frame desde construcciones en segundo plano.
+DEFAULT_UPLOAD_BUDGET = 8 << 20
+
+
+# Servicio que genera meshes en un pool de hilos y devuelve futures.
+class MeshBuilder:
+    """
+    Los generadores (p. ej. ``Equation3dMesh``) pasan casi todo el tiempo en
+    numpy, que suelta el GIL, así que un pool de hilos basta y evita copiar
+    los arrays entre procesos. Cada petición lleva una clave: una petición
+    nueva con la misma clave cancela la anterior si aún no empezó, de modo
+    que arrastrar un parámetro no acumula trabajo obsoleto.
+    """
+    def __init__(self, workers: Optional[int] = None):
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mesh-builder")
+        self._latest: dict[Hashable, Future] = {}
+        self.submitted = 0
+        self.cancelled = 0
+
+    def submit(self, key: Hashable, factory: Callable[..., Mesh], *args, **kwargs) -> Future:
+        # Encola factory(*args, **kwargs) y sustituye la petición previa de la clave.
+        previous = self._latest.get(key)
+        if previous is not None and previous.cancel():
+            self.cancelled += 1
+        future = self.pool.submit(factory, *args, **kwargs)
+        self._latest[key] = future
+        self.submitted += 1
+        return future
+
+    def latest(self, key: Hashable) -> Optional[Future]:
+        # Última petición de la clave (la única cuyo resultado interesa).
+        return self._latest.get(key)
+
+    def is_current(self, key: Hashable, future: Future) -> bool:
+        return self._latest.get(key) is future
+
+    def shutdown(self, wait: bool = False) -> None:
+        # Cancela lo pendiente y cierra el pool.
+        self.pool.shutdown(wait=wait, cancel_futures=True)
+        self._latest = {}
+
+
+# Subida por partes de los buffers de un mesh ya generado.
+class StagedMeshUpload:
+    """
+    Reserva VBO e IBO del tamaño final y los rellena en trozos de como mucho
+    ``budget`` bytes por llamada a ``step``; el Renderer sigue dibujando la
+    geometría anterior hasta que ``done`` es True. Los índices con
+    ``index_key`` que ya están en la caché no se vuelven a subir.
+    """
+    def __init__(self, ctx: moderngl.Context, mesh: Mesh, index_cache: IndexBufferCache):
+        self.mesh = mesh
+        self.index_cache = index_cache
+        vertices = np.ascontiguousarray(mesh.vertex_data)
+        indices = np.ascontiguousarray(mesh.indices)
+        # Los arrays se guardan para que la vista de bytes siga siendo válida.
+        self._arrays = (vertices, indices)
+        self.vbo = ctx.buffer(reserve=max(vertices.nbytes, 1))
+        self.ibo_key = mesh.index_key
+        self.chunks: list[tuple[moderngl.Buffer, memoryview]] = [(self.vbo, memoryview(vertices).cast('B'))]
+        if self.ibo_key is not None and index_cache.refcount(self.ibo_key):
+            self.ibo = index_cache.acquire(self.ibo_key, indices)
+        else:
+            self.ibo_key = None
+            self.ibo = ctx.buffer(reserve=max(indices.nbytes, 1))
+            self.chunks.append((self.ibo, memoryview(indices).cast('B')))
+        self.total_bytes = sum(len(data) for _, data in self.chunks)
+        self.uploaded_bytes = 0
+        self._chunk = 0
+        self._offset = 0
+
+    @property
+    def done(self) -> bool:
+        return self._chunk >= len(self.chunks)
+
+    def step(self, budget: int) -> int:
+        # Sube hasta budget bytes (al menos uno) y devuelve los bytes escritos.
+        budget = max(int(budget), 1)
+        written = 0
+        while written < budget and not self.done:
+            buffer, data = self.chunks[self._chunk]
+            stop = min(self._offset + budget - written, len(data))
+            if stop > self._offset:
+                buffer.write(data[self._offset:stop], offset=self._offset)
+            written += stop - self._offset
+            self._offset = stop
+            if self._offset >= len(data):
+                self._chunk += 1
+                self._offset = 0
+        self.uploaded_bytes += written
+        return written
+
+    def release(self) -> None:
+        # Descarta una subida a medias (p. ej. porque la sustituyó otra).
+        self.vbo.release()
+        if self.ibo_key is not None:
+            self.index_cache.release(self.ibo_key)
+        else:
+            self.ibo.release()
+        self.chunks = []
@@ -0,0 +1,127 @@
+import numpy as np
+import moderngl
+from typing import Optional
+from ..core.geometry import Mesh
+from .scene import world_slot
+from .shader import ProgramCache, ShaderWrapper
+
+# Unidad de textura reservada para los parámetros por instancia de los batches.
+INSTANCE_DATA_UNIT = 1
+# Ancho máximo de la textura de instancias (se envuelve en filas).
+INSTANCE_TEXTURE_WIDTH = 4096
+# Índice de reinicio de primitiva para índices de 32 bits (activo por defecto en ModernGL).
+PRIMITIVE_RESTART_INDEX = 0xFFFFFFFF
+
+# Modos de tira que requieren reinicio de primitiva entre meshes.
+_STRIP_MODES = (moderngl.TRIANGLE_STRIP, moderngl.LINE_STRIP, moderngl.TRIANGLE_FAN)
+
+
+def batch_key(mesh: Mesh) -> Optional[tuple]:
+    # Clave que agrupa meshes compatibles; None si el mesh no admite batching.
+    props = mesh.render_properties
+    if not props.batch_vertex_shader_path:
+        return None
+    names = tuple(uniform['name'] for uniform in props.uniforms)
+    return (props.batch_vertex_shader_path, props.fragment_shader_path, props.gl_mode, names)
+
+
+# Arena de vértices/índices compartida por todos los meshes de un mismo shader.
+class MeshBatch:
+    """
+    Empaqueta varios meshes con el mismo par de shaders y modo GL en un único
+    VBO/IBO y los dibuja con una sola llamada. Los índices se desplazan al
+    empaquetar (ModernGL no expone base-vertex). Cada instancia ocupa un texel
+    de una textura R32F indexada por ``in_instance`` con el hueco de su matriz
+    de mundo (``mesh.node``); los vértices ya llegan normalizados, así que los
+    uniforms del mesh no se copian a la GPU.
+    """
+    def __init__(self, ctx: moderngl.Context, meshes: list[Mesh], cache: Optional[ProgramCache] = None):
+        if not meshes:
+            raise ValueError("MeshBatch necesita al menos un mesh")
+        self.ctx = ctx
+        self.meshes = list(meshes)
+        props = self.meshes[0].render_properties
+        self.gl_mode = props.gl_mode
+        self.shader = ShaderWrapper(ctx, props.batch_vertex_shader_path, props.fragment_shader_path, cache=cache)
+
+        self.vertex_offsets: list[int] = []
+        self.index_ranges: list[tuple[int, int]] = []
+        vertices, instance_ids, indices = self._pack()
+        self.vbo = ctx.buffer(vertices.tobytes())
+        self.instance_vbo = ctx.buffer(instance_ids.tobytes())
+        self.ibo = ctx.buffer(indices.tobytes())
+        self.vao = ctx.vertex_array(
+            self.shader.program,
+            [(self.vbo, '3f', 'in_pos'), (self.instance_vbo, '1u', 'in_instance')],
+            self.ibo,
+            index_element_size=4,
+            skip_errors=True,
+        )
+        self.instance_texture = self._build_instance_texture()
+        if 'instance_data' in self.shader.program:
+            self.shader.program['instance_data'].value = INSTANCE_DATA_UNIT
+
+    def _pack(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # Concatena vértices e índices desplazando cada mesh por su base-vertex.
+        vertex_chunks, id_chunks, index_chunks = [], [], []
+        base_vertex = 0
+        index_cursor = 0
+        restart = self.gl_mode in _STRIP_MODES
+        for instance, mesh in enumerate(self.meshes):
+            vertices = mesh.vertices.reshape(-1, 3)
+            count = vertices.shape[0]
+            source = mesh.indices.ravel()
+            indices = source.astype(np.uint32) + np.uint32(base_vertex)
+            if mesh.restart_index is not None:
+                # Los reinicios propios del mesh (p. ej. tiras de rejilla) se conservan.
+                indices[source == mesh.restart_index] = PRIMITIVE_RESTART_INDEX
+            if restart and instance > 0:
+                index_chunks.append(np.array([PRIMITIVE_RESTART_INDEX], dtype=np.uint32))
+                index_cursor += 1
+            vertex_chunks.append(vertices)
+            id_chunks.append(np.full(count, instance, dtype=np.uint32))
+            index_chunks.append(indices)
+            self.vertex_offsets.append(base_vertex)
+            self.index_ranges.append((index_cursor, indices.size))
+            base_vertex += count
+            index_cursor += indices.size
+        return (
+            np.concatenate(vertex_chunks).astype(np.float32, copy=False),
+            np.concatenate(id_chunks),
+            np.concatenate(index_chunks),
+        )
+
+    def _build_instance_texture(self) -> moderngl.Texture:
+        # Un texel por mesh con su hueco de mundo, envuelto en filas de ancho fijo.
+        slots = np.array([world_slot(mesh.node) for mesh in self.meshes], dtype=np.float32)
+        width = min(slots.size, INSTANCE_TEXTURE_WIDTH)
+        height = -(-slots.size // width)
+        padded = np.zeros(width * height, dtype=np.float32)
+        padded[:slots.size] = slots
+        texture = self.ctx.texture((width, height), 1, padded.tobytes(), dtype='f4')
+        texture.filter = (moderngl.NEAREST, moderngl.NEAREST)
+        return texture
+
+    def set_instance_slot(self, instance: int, slot: int) -> None:
+        # Cambia el hueco de la matriz de mundo de una instancia (un único texel).
+        width = self.instance_texture.width
+        viewport = (instance % width, instance // width, 1, 1)
+        self.instance_texture.write(np.float32(slot).tobytes(), viewport=viewport)
+
+    def update_vertices(self, instance: int, first_vertex: int, vertices: np.ndarray) -> None:
+        # Sobrescribe en la arena un rango de vértices de un mesh (mismo tamaño).
+        offset = (self.vertex_offsets[instance] + first_vertex) * 3 * 4
+        self.vbo.write(np.ascontiguousarray(vertices, dtype=np.float32).tobytes(), offset=offset)
+
+    def render(self) -> None:
+        # Un único draw call para todos los meshes del batch.
+        self.instance_texture.use(location=INSTANCE_DATA_UNIT)
+        self.vao.render(mode=self.gl_mode)
+
+    def release(self) -> None:
+        # Libera la arena, el VAO, la textura de instancias y el programa.
+        self.vao.release()
+        for buffer in (self.vbo, self.instance_vbo, self.ibo):
+            buffer.release()
+        self.instance_texture.release()
+        self.shader.release()
@@ -0,0 +1,115 @@
+import functools
+import moderngl
+import numpy as np
+import weakref
+from pathlib import Path
+from ..utils.tokens import DESIGN_PATH, load_theme, parse_lut
+
+# Sampler que declaran los shaders coloreados por valor y su unidad de textura fija.
+COLORMAP_SAMPLER = "colormap"
+COLORMAP_UNIT = 4
+# Formato de textura por tamaño: 8 bits bastan para 256 entradas; la de 4096
+# se sube en half float para que su resolución extra no se pierda al cuantizar.
+LUT_DTYPES = {256: "f1", 4096: "f2"}
+LUT_SIZES = tuple(LUT_DTYPES)
+DEFAULT_LUT_SIZE = 256
+
+# Disponible aunque design.toml falte o no defina LUTs.
+_BUILTIN_LUTS = {"gray": parse_lut({"0.0": "#000000", "1.0": "#FFFFFF"})}
+
+
+@functools.lru_cache(maxsize=None)
+def load_luts(path: Path = DESIGN_PATH) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+    # LUT precompiladas en build/theme.py (más las integradas), como arrays.
+    tables = dict(_BUILTIN_LUTS)
+    tables.update(load_theme(path).LUTS)
+    return {name: (np.array(positions, dtype=np.float32), np.array(colors, dtype=np.float32))
+            for name, (positions, colors) in tables.items()}
+
+
+def default_colormap(path: Path = DESIGN_PATH) -> str:
+    # Mapa de [imaging.overlays] colormap_default, o "gray".
+    name = load_theme(path).OVERLAYS.get("colormap_default", "gray")
+    return name if name in load_luts(path) else "gray"
+
+
+def bake_lut(positions: np.ndarray, colors: np.ndarray, size: int = DEFAULT_LUT_SIZE) -> np.ndarray:
+    # Interpola los puntos de control en `size` entradas RGBA (size, 4) en [0, 1].
+    samples = np.linspace(0.0, 1.0, int(size), dtype=np.float32)
+    return np.stack([np.interp(samples, positions, colors[:, c]) for c in range(4)], axis=1).astype(np.float32)
+
+
+# Caché de texturas de LUT por contexto, con conteo de referencias.
+class ColormapCache:
+    """
+    Cada par (nombre, tamaño) se hornea y sube una vez a una textura de
+    ``size`` x 1 (ModernGL no tiene texturas 1D) con filtrado lineal; los
+    shaders la muestrean con el valor normalizado en [0, 1]. Cambiar de mapa
+    es enlazar otra textura a ``COLORMAP_UNIT``: no se toca la geometría.
+    """
+    _instances: "weakref.WeakKeyDictionary[moderngl.Context, ColormapCache]" = weakref.WeakKeyDictionary()
+
+    def __init__(self, ctx: moderngl.Context, path: Path = DESIGN_PATH):
+        self.ctx = ctx
+        self.path = Path(path)
+        self._textures: dict[tuple[str, int], moderngl.Texture] = {}
+        self._refcounts: dict[tuple[str, int], int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def for_context(cls, ctx: moderngl.Context) -> "ColormapCache":
+        # Devuelve (o crea) la caché asociada al contexto.
+        cache = cls._instances.get(ctx)
+        if cache is None:
+            cache = cls(ctx)
+            cls._instances[ctx] = cache
+        return cache
+
+    @property
+    def names(self) -> list[str]:
+        return sorted(load_luts(self.path))
+
+    def acquire(self, name: str, size: int = DEFAULT_LUT_SIZE) -> moderngl.Texture:
+        # Textura de la LUT (creada si hace falta) e incrementa su referencia.
+        key = (name, int(size))
+        texture = self._textures.get(key)
+        if texture is None:
+            luts = load_luts(self.path)
+            if name not in luts:
+                raise ValueError(f"Colormap desconocido: {name!r} (disponibles: {', '.join(sorted(luts))})")
+            if key[1] not in LUT_SIZES:
+                raise ValueError(f"Tamaño de LUT no soportado: {size} (use {', '.join(map(str, LUT_SIZES))})")
+            table = bake_lut(*luts[name], size=key[1])
+            dtype = LUT_DTYPES[key[1]]
+            if dtype == "f1":
+                data = np.clip(table * 255.0 + 0.5, 0, 255).astype('u1')
+            else:
+                data = table.astype(np.float16)
+            texture = self.ctx.texture((key[1], 1), 4, data, dtype=dtype)
+            texture.repeat_x = texture.repeat_y = False
+            self._textures[key] = texture
+            self._refcounts[key] = 0
+            self.misses += 1
+        else:
+            self.hits += 1
+        self._refcounts[key] += 1
+        return texture
+
+    def release(self, name: str, size: int = DEFAULT_LUT_SIZE) -> None:
+        # Decrementa la referencia y libera la textura cuando nadie la usa.
+        key = (name, int(size))
+        count = self._refcounts.get(key, 0) - 1
+        if count > 0:
+            self._refcounts[key] = count
+            return
+        self._refcounts.pop(key, None)
+        texture = self._textures.pop(key, None)
+        if texture is not None:
+            texture.release()
+
+    def refcount(self, name: str, size: int = DEFAULT_LUT_SIZE) -> int:
+        return self._refcounts.get((name, int(size)), 0)
+
+    def __len__(self) -> int:
+        return len(self._textures)
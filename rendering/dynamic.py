@@ -0,0 +1,103 @@
+import numpy as np
+import moderngl
+from typing import Optional
+
+
+def _union(a: Optional[tuple[int, int]], b: tuple[int, int]) -> tuple[int, int]:
+    # Une dos rangos [inicio, fin) de filas.
+    if a is None:
+        return b
+    return (min(a[0], b[0]), max(a[1], b[1]))
+
+
+def _grow(capacity: int, required: int) -> int:
+    # Capacidad geométrica para que los crecimientos sucesivos sean O(1) amortizado.
+    capacity = max(capacity, 1)
+    while capacity < required:
+        capacity *= 2
+    return capacity
+
+
+# Anillo de VBOs para meshes cuya geometría cambia cada frame.
+class DynamicMeshBuffers:
+    """
+    Mantiene ``ring_size`` VBOs (doble o triple buffer) con su VAO cada uno y
+    un IBO compartido. Cada actualización escribe en el siguiente slot del
+    anillo, que la GPU ya no está leyendo, así la CPU no se bloquea. Cada slot
+    recuerda el rango de filas que le falta respecto a la copia en CPU y lo
+    pone al día antes de reutilizarse, por lo que las escrituras parciales
+    son correctas en todo el anillo.
+    """
+    def __init__(self,
+                 ctx: moderngl.Context,
+                 program: moderngl.Program,
+                 vertex_layout: tuple[str, ...],
+                 vertex_data: np.ndarray,
+                 ibo: moderngl.Buffer,
+                 index_count: int,
+                 index_element_size: int = 4,
+                 ring_size: int = 3):
+        self.ctx = ctx
+        self.ibo = ibo
+        self.index_count = index_count
+        self.row_bytes = vertex_data[:1].nbytes or vertex_data.itemsize
+        self.rows = len(vertex_data)
+        self.slots: list[tuple[moderngl.Buffer, moderngl.VertexArray]] = []
+        for _ in range(max(int(ring_size), 1)):
+            vbo = ctx.buffer(reserve=max(vertex_data.nbytes, self.row_bytes), dynamic=True)
+            vao = ctx.vertex_array(program, [(vbo, *vertex_layout)], ibo, index_element_size=index_element_size)
+            vao.vertices = index_count
+            self.slots.append((vbo, vao))
+        self._stale: list[Optional[tuple[int, int]]] = [(0, self.rows)] * len(self.slots)
+        self.current = 0
+        self._refresh(0, vertex_data)
+
+    @property
+    def vbo(self) -> moderngl.Buffer:
+        return self.slots[self.current][0]
+
+    @property
+    def vao(self) -> moderngl.VertexArray:
+        return self.slots[self.current][1]
+
+    def _refresh(self, slot: int, vertex_data: np.ndarray) -> None:
+        # Pone al día un slot: crece (orphan) si no cabe y escribe su rango pendiente.
+        vbo = self.slots[slot][0]
+        if vertex_data.nbytes > vbo.size:
+            vbo.orphan(_grow(vbo.size, vertex_data.nbytes))
+            self._stale[slot] = (0, self.rows)
+        pending = self._stale[slot]
+        if pending is not None:
+            start, stop = pending[0], min(pending[1], self.rows)
+            if stop > start:
+                rows = np.ascontiguousarray(vertex_data[start:stop])
+                vbo.write(rows.tobytes(), offset=start * self.row_bytes)
+        self._stale[slot] = None
+
+    def update(self, vertex_data: np.ndarray, start: int = 0, stop: Optional[int] = None) -> moderngl.VertexArray:
+        # Marca [start, stop) como modificado, avanza el anillo y devuelve el VAO listo.
+        """Sube las filas modificadas al siguiente slot del anillo."""
+        self.rows = len(vertex_data)
+        stop = self.rows if stop is None else stop
+        self._stale = [_union(pending, (start, stop)) for pending in self._stale]
+        self.current = (self.current + 1) % len(self.slots)
+        self._refresh(self.current, vertex_data)
+        return self.vao
+
+    def update_indices(self, index_data: bytes, index_count: int) -> None:
+        # Reemplaza la topología; el IBO se huérfana para no esperar a la GPU.
+        if len(index_data) > self.ibo.size:
+            self.ibo.orphan(_grow(self.ibo.size, len(index_data)))
+        else:
+            self.ibo.orphan()
+        self.ibo.write(index_data)
+        self.index_count = index_count
+        for _, vao in self.slots:
+            vao.vertices = index_count
+
+    def release(self) -> None:
+        for vbo, vao in self.slots:
+            vao.release()
+            vbo.release()
+        self.ibo.release()
+        self.slots = []
@@ -0,0 +1,68 @@
+import moderngl
+import weakref
+
+
+# Caché de IBOs por contexto para meshes que comparten topología.
+class IndexBufferCache:
+    """
+    Sube una sola vez los índices de cada clave (p. ej. forma de rejilla y
+    topología) y comparte el IBO entre todos los meshes que la usan, con
+    conteo de referencias como ProgramCache.
+    """
+    _instances: "weakref.WeakKeyDictionary[moderngl.Context, IndexBufferCache]" = weakref.WeakKeyDictionary()
+
+    def __init__(self, ctx: moderngl.Context):
+        self.ctx = ctx
+        self._buffers: dict[tuple, moderngl.Buffer] = {}
+        self._refcounts: dict[tuple, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def for_context(cls, ctx: moderngl.Context) -> "IndexBufferCache":
+        # Devuelve (o crea) la caché asociada al contexto.
+        cache = cls._instances.get(ctx)
+        if cache is None:
+            cache = cls(ctx)
+            cls._instances[ctx] = cache
+        return cache
+
+    def acquire(self, key: tuple, data: bytes) -> moderngl.Buffer:
+        # Obtiene el IBO de la clave (o lo crea con data) e incrementa su referencia.
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = self.ctx.buffer(data)
+            self._buffers[key] = buffer
+            self._refcounts[key] = 0
+            self.misses += 1
+        else:
+            self.hits += 1
+        self._refcounts[key] += 1
+        return buffer
+
+    def release(self, key: tuple) -> None:
+        # Decrementa la referencia y libera el IBO cuando nadie lo usa.
+        count = self._refcounts.get(key, 0) - 1
+        if count > 0:
+            self._refcounts[key] = count
+            return
+        self._refcounts.pop(key, None)
+        buffer = self._buffers.pop(key, None)
+        if buffer is not None:
+            buffer.release()
+
+    def refcount(self, key: tuple) -> int:
+        return self._refcounts.get(key, 0)
+
+    def __len__(self) -> int:
+        return len(self._buffers)
+
+    @property
+    def stats(self) -> dict:
+        # Resumen de IBOs vivos, aciertos y memoria de índices en GPU.
+        return {
+            "buffers": len(self._buffers),
+            "hits": self.hits,
+            "misses": self.misses,
+            "bytes": sum(buffer.size for buffer in self._buffers.values()),
+        }
@@ -0,0 +1,147 @@
+import numpy as np
+import moderngl
+from typing import Optional, Sequence
+from .renderer import CAMERA_BLOCK_BINDING, CAMERA_BLOCK_NAME
+from .shader import ProgramCache, ShaderWrapper
+
+# Disposición por instancia: centro(2) tamaño(2) radio(1) color(4) z(1).
+INSTANCE_FLOATS = 10
+INSTANCE_FORMAT = '2f 2f 1f 4f 1f/i'
+INSTANCE_ATTRIBUTES = ('in_center', 'in_size', 'in_radius', 'in_color', 'in_z')
+_CENTER, _SIZE, _RADIUS, _COLOR, _Z = slice(0, 2), slice(2, 4), 4, slice(5, 9), 9
+
+# Quad unitario compartido por todas las instancias (TRIANGLE_STRIP).
+_UNIT_QUAD = np.array([[-0.5, -0.5], [0.5, -0.5], [-0.5, 0.5], [0.5, 0.5]], dtype='f4')
+
+
+# Capa de rectángulos redondeados dibujados con una sola llamada instanciada.
+class RoundedRectangleInstances:
+    """
+    Mantiene un único quad unitario y un buffer de atributos por instancia
+    (centro, tamaño, radio, color, orden z). Solo se reescribe en GPU el rango
+    de instancias modificadas desde el último frame.
+    """
+    def __init__(self, ctx: moderngl.Context, capacity: int = 1024, cache: Optional[ProgramCache] = None):
+        self.ctx = ctx
+        self.count = 0
+        self.data = np.zeros((max(int(capacity), 1), INSTANCE_FLOATS), dtype='f4')
+        self._dirty: Optional[tuple[int, int]] = None
+
+        self.shader = ShaderWrapper(
+            ctx,
+            "shaders/roundedrectangle_instanced/vertex.glsl",
+            "shaders/roundedrectangle_instanced/fragment.glsl",
+            cache=cache,
+        )
+        self.shader.bind_uniform_block(CAMERA_BLOCK_NAME, CAMERA_BLOCK_BINDING)
+        self.quad_vbo = ctx.buffer(_UNIT_QUAD.tobytes())
+        self.instance_vbo = ctx.buffer(reserve=self.data.nbytes, dynamic=True)
+        self.vao = ctx.vertex_array(
+            self.shader.program,
+            [
+                (self.quad_vbo, '2f', 'in_corner'),
+                (self.instance_vbo, INSTANCE_FORMAT, *INSTANCE_ATTRIBUTES),
+            ],
+        )
+
+    @property
+    def capacity(self) -> int:
+        return self.data.shape[0]
+
+    def _reserve(self, count: int) -> None:
+        # Duplica la capacidad; el buffer se huérfana y se reescribe completo.
+        if count <= self.capacity:
+            return
+        capacity = self.capacity
+        while capacity < count:
+            capacity *= 2
+        data = np.zeros((capacity, INSTANCE_FLOATS), dtype='f4')
+        data[:self.count] = self.data[:self.count]
+        self.data = data
+        self.instance_vbo.orphan(self.data.nbytes)
+        self._mark_dirty(0, self.count)
+
+    def _mark_dirty(self, start: int, stop: int) -> None:
+        # Une el rango modificado con el pendiente (un solo write por frame).
+        if start >= stop:
+            return
+        if self._dirty is None:
+            self._dirty = (start, stop)
+        else:
+            self._dirty = (min(self._dirty[0], start), max(self._dirty[1], stop))
+
+    def add(self, center, size, radius: float, color, z: float = 0.0) -> int:
+        # Registra un rectángulo y devuelve su índice de instancia.
+        return int(self.add_many([center], [size], [radius], [color], [z])[0])
+
+    def add_many(self,
+                 centers: Sequence,
+                 sizes: Sequence,
+                 radii: Sequence[float],
+                 colors: Sequence,
+                 z: Optional[Sequence[float]] = None) -> np.ndarray:
+        # Alta vectorizada de N rectángulos; devuelve sus índices.
+        centers = np.asarray(centers, dtype='f4').reshape(-1, 2)
+        n = centers.shape[0]
+        start = self.count
+        self._reserve(start + n)
+        rows = self.data[start:start + n]
+        rows[:, _CENTER] = centers
+        rows[:, _SIZE] = np.asarray(sizes, dtype='f4').reshape(-1, 2)
+        rows[:, _RADIUS] = np.asarray(radii, dtype='f4').reshape(-1)
+        rows[:, _COLOR] = np.asarray(colors, dtype='f4').reshape(-1, 4)
+        rows[:, _Z] = 0.0 if z is None else np.asarray(z, dtype='f4').reshape(-1)
+        self.count = start + n
+        self._mark_dirty(start, self.count)
+        return np.arange(start, self.count)
+
+    def update(self, index: int, center=None, size=None, radius=None, color=None, z=None) -> None:
+        # Modifica solo los campos indicados de una instancia existente.
+        if not 0 <= index < self.count:
+            raise IndexError(f"Instancia fuera de rango: {index}")
+        row = self.data[index]
+        if center is not None:
+            row[_CENTER] = center
+        if size is not None:
+            row[_SIZE] = size
+        if radius is not None:
+            row[_RADIUS] = radius
+        if color is not None:
+            row[_COLOR] = color
+        if z is not None:
+            row[_Z] = z
+        self._mark_dirty(index, index + 1)
+
+    def clear(self) -> None:
+        # Elimina todas las instancias (la memoria se conserva).
+        self.count = 0
+        self._dirty = None
+
+    def flush(self) -> None:
+        # Sube a la GPU únicamente el sub-rango modificado.
+        if self._dirty is None:
+            return
+        start, stop = self._dirty
+        stride = INSTANCE_FLOATS * 4
+        self.instance_vbo.write(self.data[start:stop].tobytes(), offset=start * stride)
+        self._dirty = None
+
+    def render(self, renderer=None) -> None:
+        # Una sola llamada instanciada para todos los rectángulos.
+        self.flush()
+        if self.count == 0:
+            return
+        # Mezcla sin escribir profundidad: un rectángulo translúcido no oculta
+        # a los que se dibujan después detrás de él.
+        fbo = self.ctx.fbo
+        fbo.depth_mask = False
+        self.ctx.enable(moderngl.BLEND)
+        self.vao.render(mode=moderngl.TRIANGLE_STRIP, vertices=4, instances=self.count)
+        self.ctx.disable(moderngl.BLEND)
+        fbo.depth_mask = True
+
+    def release(self) -> None:
+        self.vao.release()
+        self.quad_vbo.release()
+        self.instance_vbo.release()
+        self.shader.release()
@@ -0,0 +1,110 @@
+import numpy as np
+import moderngl
+from typing import Optional
+from ..core.bvh import classify_boxes
+from ..shapes.grid import grid_indices
+from ..shapes.lod import DEFAULT_PIXEL_ERROR, LodSurface
+from .colormap import COLORMAP_SAMPLER, COLORMAP_UNIT
+from .indices import IndexBufferCache
+from .renderer import CAMERA_BLOCK_BINDING, CAMERA_BLOCK_NAME
+from .shader import ProgramCache, ShaderWrapper
+
+
+# Capa que dibuja una LodSurface eligiendo el nivel de cada tile por frame.
+class LodSurfaceLayer:
+    """
+    Sube la pirámide completa una vez: un VBO de alturas por nivel (todos los
+    tiles contiguos) y los índices de la rejilla del nivel, compartidos por
+    IndexBufferCache. Cada frame descarta los tiles fuera del frustum, elige
+    para el resto el nivel más grueso cuyo error en pantalla no supera
+    ``pixel_error`` y los dibuja moviendo el offset del atributo de altura,
+    de modo que los vértices dibujados siguen a lo que ocupa la pantalla y
+    no al tamaño de la rejilla.
+    """
+    def __init__(self, ctx: moderngl.Context, surface: LodSurface,
+                 pixel_error: float = DEFAULT_PIXEL_ERROR, cache: Optional[ProgramCache] = None):
+        self.ctx = ctx
+        self.surface = surface
+        self.pixel_error = float(pixel_error)
+        self.shader = ShaderWrapper(
+            ctx,
+            "shaders/lod_surface/vertex.glsl",
+            "shaders/equation3dmesh/fragment.glsl",
+            cache=cache,
+        )
+        self.shader.bind_uniform_block(CAMERA_BLOCK_NAME, CAMERA_BLOCK_BINDING)
+        self.shader.bind_sampler(COLORMAP_SAMPLER, COLORMAP_UNIT)
+        program = self.shader.program
+        self._origin = program["tile_origin"]
+        self._cell_size = program["cell_size"]
+        self._points = program["tile_points"]
+        self._skirt = program["skirt_depth"]
+
+        self.index_cache = IndexBufferCache.for_context(ctx)
+        self.vbos: list[moderngl.Buffer] = []
+        self.vaos: list[moderngl.VertexArray] = []
+        self.ibo_keys: list[tuple] = []
+        for level in range(surface.levels):
+            points = surface.level_points(level)
+            indices = grid_indices(points, points, "triangles")
+            key = ("grid", points, points, "triangles")
+            ibo = self.index_cache.acquire(key, indices)
+            vbo = ctx.buffer(surface.level_heights(level))
+            vao = ctx.vertex_array(program, [(vbo, '1f', 'in_height')],
+                                   index_buffer=ibo, index_element_size=indices.dtype.itemsize)
+            self.vbos.append(vbo)
+            self.vaos.append(vao)
+            self.ibo_keys.append(key)
+
+        self.levels = np.zeros((surface.tiles, surface.tiles), dtype=np.int64)
+        self.visible = np.ones((surface.tiles, surface.tiles), dtype=bool)
+        self.skirts = surface.skirt_depths(self.levels)
+        self.stats = {"tiles": surface.tile_count, "drawn": 0, "culled": 0, "vertices": 0, "triangles": 0}
+
+    def update(self, camera, viewport_height: int, culling: bool = True) -> None:
+        # Visibilidad y nivel de cada tile para la cámara actual.
+        surface = self.surface
+        if culling:
+            boxes = surface.aabbs.reshape(-1, 2, 3)
+            outside, _ = classify_boxes(camera.frustum_planes, boxes[:, 0], boxes[:, 1])
+            self.visible = ~outside.reshape(surface.tiles, surface.tiles)
+        else:
+            self.visible = np.ones((surface.tiles, surface.tiles), dtype=bool)
+        # camera_matrix incluye la corrección de aspecto; la escala vertical es la de la proyección.
+        self.levels = surface.select_levels(camera.position, camera.projection_matrix,
+                                            viewport_height, self.pixel_error)
+        self.skirts = surface.skirt_depths(self.levels)
+
+    def render(self, renderer=None) -> None:
+        # Un draw por tile visible con el VBO de su nivel y el offset del tile.
+        if renderer is not None:
+            self.update(renderer.camera, renderer.wnd_size[1], renderer.culling)
+        surface = self.surface
+        vertices = triangles = 0
+        ys, xs = np.nonzero(self.visible)
+        for ty, tx in zip(ys.tolist(), xs.tolist()):
+            level = int(self.levels[ty, tx])
+            points = surface.level_points(level)
+            step = 1 << level
+            vao = self.vaos[level]
+            self._origin.value = surface.tile_origin(ty, tx)
+            self._cell_size.value = (surface.cell_size[0] * step, surface.cell_size[1] * step)
+            self._points.value = points
+            self._skirt.value = tuple(self.skirts[ty, tx].tolist())
+            offset = (ty * surface.tiles + tx) * points * points * 4
+            vao.bind(0, 'f', self.vbos[level], '1f', offset=offset)
+            vao.render(moderngl.TRIANGLES)
+            vertices += points * points
+            triangles += 2 * (points - 1) ** 2
+        self.stats.update(drawn=len(ys), culled=surface.tile_count - len(ys),
+                          vertices=vertices, triangles=triangles)
+
+    def release(self) -> None:
+        for vao in self.vaos:
+            vao.release()
+        for vbo in self.vbos:
+            vbo.release()
+        for key in self.ibo_keys:
+            self.index_cache.release(key)
+        self.shader.release()
+        self.vaos, self.vbos, self.ibo_keys = [], [], []
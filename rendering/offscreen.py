@@ -0,0 +1,98 @@
+import numpy as np
+import moderngl
+from typing import Optional, Tuple
+
+
+def _to_image(data: bytes, size: Tuple[int, int], components: int) -> np.ndarray:
+    # Bytes de OpenGL (origen abajo-izquierda) -> imagen (alto, ancho, canales) de arriba abajo.
+    width, height = size
+    return np.frombuffer(data, dtype=np.uint8).reshape(height, width, components)[::-1]
+
+
+# Framebuffer fuera de pantalla con color + profundidad y MSAA opcional.
+class OffscreenTarget:
+    """
+    Destino de render sin ventana. Con ``samples > 0`` se dibuja en
+    renderbuffers multimuestra y ``resolve()`` copia al framebuffer de lectura.
+    """
+    def __init__(self, ctx: moderngl.Context, size: Tuple[int, int], samples: int = 0, components: int = 4):
+        self.ctx = ctx
+        self.size = (int(size[0]), int(size[1]))
+        self.components = components
+        self.samples = min(int(samples), ctx.max_samples) if samples else 0
+
+        self.color = ctx.texture(self.size, components)
+        self.depth = ctx.depth_renderbuffer(self.size)
+        self.fbo = ctx.framebuffer(color_attachments=[self.color], depth_attachment=self.depth)
+
+        self.msaa_fbo: Optional[moderngl.Framebuffer] = None
+        if self.samples:
+            self._msaa_color = ctx.renderbuffer(self.size, components, samples=self.samples)
+            self._msaa_depth = ctx.depth_renderbuffer(self.size, samples=self.samples)
+            self.msaa_fbo = ctx.framebuffer(color_attachments=[self._msaa_color], depth_attachment=self._msaa_depth)
+
+    @property
+    def draw_fbo(self) -> moderngl.Framebuffer:
+        # Framebuffer donde se dibuja (el multimuestra si existe).
+        return self.msaa_fbo or self.fbo
+
+    def use(self) -> None:
+        self.draw_fbo.use()
+
+    def resolve(self) -> None:
+        # Resuelve MSAA hacia la textura de color legible.
+        if self.msaa_fbo is not None:
+            self.ctx.copy_framebuffer(self.fbo, self.msaa_fbo)
+
+    def read(self) -> np.ndarray:
+        # Lectura síncrona del color resuelto como arreglo uint8.
+        return np.ascontiguousarray(_to_image(self.fbo.read(components=self.components), self.size, self.components))
+
+    def release(self) -> None:
+        resources = [self.fbo, self.color, self.depth]
+        if self.msaa_fbo is not None:
+            resources += [self.msaa_fbo, self._msaa_color, self._msaa_depth]
+        for resource in resources:
+            resource.release()
+
+
+# Lectura asíncrona con buffers de píxeles (PBO) alternos.
+class AsyncReadback:
+    """
+    ``request`` encola la copia del frame actual a un PBO (sin esperar a la
+    GPU) y devuelve el frame pedido ``buffers - 1`` llamadas antes, que ya
+    suele estar listo. Así la codificación del frame N se solapa con el
+    render del frame N+1.
+    """
+    def __init__(self, ctx: moderngl.Context, size: Tuple[int, int], components: int = 4, buffers: int = 2):
+        self.size = (int(size[0]), int(size[1]))
+        self.components = components
+        nbytes = self.size[0] * self.size[1] * components
+        self.pbos = [ctx.buffer(reserve=nbytes, dynamic=True) for _ in range(max(int(buffers), 2))]
+        self._pending: list[int] = []
+        self._next = 0
+
+    def request(self, fbo: moderngl.Framebuffer) -> Optional[np.ndarray]:
+        # Encola el frame actual y devuelve el más antiguo si el anillo está lleno.
+        ready = None
+        if len(self._pending) == len(self.pbos):
+            ready = self._collect(self._pending.pop(0))
+        slot = self._next
+        fbo.read_into(self.pbos[slot], components=self.components)
+        self._pending.append(slot)
+        self._next = (slot + 1) % len(self.pbos)
+        return ready
+
+    def flush(self) -> list[np.ndarray]:
+        # Recoge todos los frames pendientes en orden.
+        frames = [self._collect(slot) for slot in self._pending]
+        self._pending = []
+        return frames
+
+    def _collect(self, slot: int) -> np.ndarray:
+        return _to_image(self.pbos[slot].read(), self.size, self.components).copy()
+
+    def release(self) -> None:
+        for pbo in self.pbos:
+            pbo.release()
+        self.pbos = []
@@ -0,0 +1,160 @@
+import json
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+import moderngl
+import numpy as np
+
+# Bordes (ms) del histograma de tiempos de frame.
+HISTOGRAM_EDGES_MS = (0.0, 4.0, 8.0, 12.0, 16.7, 25.0, 33.3, 50.0, 100.0, float("inf"))
+
+
+# Perfilador opcional de frames: spans de CPU y consultas de tiempo de GPU por draw.
+class FrameProfiler:
+    """
+    Las consultas ``GL_TIME_ELAPSED`` de cada frame se leen ``latency`` frames
+    más tarde, cuando la GPU ya terminó ese trabajo, para no detener el
+    pipeline. ModernGL no expone marcas de tiempo absolutas de GPU, así que
+    en la traza los draws de GPU se colocan uno tras otro a partir del inicio
+    del frame en CPU.
+    """
+    def __init__(self, ctx: Optional[moderngl.Context] = None, latency: int = 3,
+                 history: int = 240, max_events: int = 100_000):
+        self.ctx = ctx
+        self.latency = max(int(latency), 1)
+        self.frame = -1
+        self.frame_times: deque[float] = deque(maxlen=history)
+        self.gpu_times: deque[float] = deque(maxlen=history)
+        self.span_totals: dict[str, deque[float]] = {}
+        self.events: deque[dict] = deque(maxlen=max_events)
+        self._origin = time.perf_counter()
+        self._frame_start: Optional[float] = None
+        self._frame_spans: dict[str, float] = {}
+        # Consultas en vuelo: (frame, inicio del frame, [(nombre, query)]).
+        self._pending: deque[tuple[int, float, list[tuple[str, moderngl.Query]]]] = deque()
+        self._current: list[tuple[str, moderngl.Query]] = []
+        self._free: list[moderngl.Query] = []
+
+    def begin_frame(self) -> None:
+        # Abre un frame nuevo y recoge las consultas de GPU que ya están listas.
+        self.collect()
+        self.frame += 1
+        self._frame_start = time.perf_counter()
+        self._frame_spans = {}
+        self._current = []
+
+    def end_frame(self) -> None:
+        # Cierra el frame: registra su duración en CPU y encola sus consultas.
+        if self._frame_start is None:
+            return
+        end = time.perf_counter()
+        start_us = (self._frame_start - self._origin) * 1e6
+        self.frame_times.append(end - self._frame_start)
+        self.events.append({"name": "frame", "cat": "cpu", "ph": "X", "ts": start_us,
+                            "dur": (end - self._frame_start) * 1e6, "pid": 1, "tid": 1,
+                            "args": {"frame": self.frame}})
+        for name, seconds in self._frame_spans.items():
+            self.span_totals.setdefault(name, deque(maxlen=self.frame_times.maxlen)).append(seconds)
+        if self._current:
+            self._pending.append((self.frame, start_us, self._current))
+        self._current = []
+        self._frame_start = None
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        # Intervalo de CPU dentro del frame (cámara, subida de uniforms, draws...).
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self._frame_spans[name] = self._frame_spans.get(name, 0.0) + (end - start)
+            self.events.append({"name": name, "cat": "cpu", "ph": "X",
+                                "ts": (start - self._origin) * 1e6, "dur": (end - start) * 1e6,
+                                "pid": 1, "tid": 1})
+
+    @contextmanager
+    def gpu(self, name: str) -> Iterator[None]:
+        # Envuelve un draw en una consulta de tiempo; sin contexto no mide nada.
+        if self.ctx is None:
+            yield
+            return
+        query = self._free.pop() if self._free else self.ctx.query(time=True)
+        with query:
+            yield
+        self._current.append((name, query))
+
+    def collect(self, force: bool = False) -> None:
+        # Lee las consultas de frames con al menos `latency` frames de antigüedad.
+        while self._pending and (force or self.frame - self._pending[0][0] >= self.latency):
+            frame, start_us, queries = self._pending.popleft()
+            cursor = start_us
+            total = 0.0
+            for name, query in queries:
+                elapsed_us = query.elapsed / 1000.0
+                total += elapsed_us
+                self.events.append({"name": name, "cat": "gpu", "ph": "X", "ts": cursor,
+                                    "dur": elapsed_us, "pid": 1, "tid": 2, "args": {"frame": frame}})
+                cursor += elapsed_us
+                self._free.append(query)
+            self.gpu_times.append(total / 1e6)
+
+    def histogram(self) -> tuple[np.ndarray, np.ndarray]:
+        # Conteos de tiempos de frame recientes por intervalo de HISTOGRAM_EDGES_MS.
+        edges = np.array(HISTOGRAM_EDGES_MS)
+        counts, _ = np.histogram(np.array(self.frame_times) * 1e3, bins=edges)
+        return counts, edges
+
+    def summary(self) -> dict:
+        # Estadísticas de la ventana reciente, pensadas para un overlay en pantalla.
+        if not self.frame_times:
+            return {"frames": 0}
+        ms = np.array(self.frame_times) * 1e3
+        counts, _ = self.histogram()
+        summary = {
+            "frames": len(ms),
+            "fps": float(1e3 / ms.mean()) if ms.mean() > 0 else 0.0,
+            "cpu_ms": {"mean": float(ms.mean()), "p50": float(np.percentile(ms, 50)),
+                       "p95": float(np.percentile(ms, 95)), "p99": float(np.percentile(ms, 99)),
+                       "max": float(ms.max())},
+            "spans_ms": {name: float(np.mean(values)) * 1e3 for name, values in self.span_totals.items()},
+            "histogram": counts.tolist(),
+        }
+        if self.gpu_times:
+            summary["gpu_ms"] = float(np.mean(self.gpu_times)) * 1e3
+        return summary
+
+    def summary_text(self) -> str:
+        # Resumen de una línea (título de ventana / overlay).
+        summary = self.summary()
+        if not summary["frames"]:
+            return "sin frames"
+        text = f"{summary['fps']:.0f} fps | cpu {summary['cpu_ms']['p50']:.2f}ms p95 {summary['cpu_ms']['p95']:.2f}ms"
+        if "gpu_ms" in summary:
+            text += f" | gpu {summary['gpu_ms']:.2f}ms"
+        return text
+
+    def export_chrome_trace(self, path: Path) -> Path:
+        # Escribe los eventos en formato Chrome trace (chrome://tracing, Perfetto).
+        self.collect(force=True)
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        trace = {
+            "traceEvents": [
+                {"name": "thread_name", "ph": "M", "pid": 1, "tid": 1, "args": {"name": "CPU"}},
+                {"name": "thread_name", "ph": "M", "pid": 1, "tid": 2, "args": {"name": "GPU"}},
+                *self.events,
+            ],
+            "displayTimeUnit": "ms",
+        }
+        path.write_text(json.dumps(trace), encoding="utf-8")
+        return path
+
+    def release(self) -> None:
+        # Descarta las consultas (ModernGL las libera con el contexto).
+        self._pending.clear()
+        self._current = []
+        self._free = []
@@ -1,9 +1,37 @@
+import logging
 import numpy as np
 import moderngl
-from typing import Tuple, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, Tuple, Optional, Union
 from ..core.geometry import Mesh
+from ..core.bvh import BVH, classify_boxes
 from ..core.camera import Camera
-from .shader import ShaderWrapper
+from ..core.scene import SceneGraph, transform_boxes
+from .async_mesh import DEFAULT_UPLOAD_BUDGET, StagedMeshUpload
+from .batch import MeshBatch, batch_key
+from .colormap import COLORMAP_SAMPLER, COLORMAP_UNIT, DEFAULT_LUT_SIZE, ColormapCache, default_colormap
+from .dynamic import DynamicMeshBuffers
+from .indices import IndexBufferCache
+from .offscreen import AsyncReadback, OffscreenTarget
+from .profiler import FrameProfiler
+from .scene import WORLD_MATRIX_SAMPLER, WORLD_MATRIX_UNIT, WORLD_SLOT_UNIFORM, WorldMatrixTexture, world_slot
+from ..utils.image import write_png
+from .shader import ProgramCache, ShaderWrapper
+
+logger = logging.getLogger(__name__)
+
+# Punto de enlace del bloque uniform compartido con la matriz de cámara.
+CAMERA_BLOCK_NAME = "CameraBlock"
+CAMERA_BLOCK_BINDING = 0
+
+
+def _require_mesh(model) -> None:
+    # El Renderer dibuja solo Meshes (VBO + IBO); las polilíneas van en capas.
+    if not isinstance(model, Mesh):
+        raise ValueError(f"{type(model).__name__} no es un Mesh con índices: "
+                         "dibuje las polilíneas con una capa (p. ej. StrokeLayer)")
+
 
 # Coordina ModernGL para dibujar las mallas registradas.
 class Renderer:
@@ -19,11 +47,21 @@ class Renderer:
         background_color: tuple[float, float, float, float] = (0.0, 0.0, 0.0, 1.0),
         ctx: Optional[moderngl.Context] = None,
         camera: Optional[Camera] = None,
+        batching: bool = False,
+        dynamic_buffering: int = 3,
+        profiler: Optional[FrameProfiler] = None,
+        culling: bool = True,
+        upload_budget: int = DEFAULT_UPLOAD_BUDGET,
+        colormap: Optional[str] = None,
+        scene: Optional[SceneGraph] = None,
     ) -> None:
         # Prepara buffers, shaders y VAOs correspondientes a cada mesh recibido.
         self.background_color = tuple(background_color)
         self.models = list(models) if models else []
+        for model in self.models:
+            _require_mesh(model)
         self.wnd_size = wnd_size
+        self.time = 0.0
         self.ctx = ctx or moderngl.create_standalone_context()
         aspect_ratio = (wnd_size[0] / wnd_size[1]) if wnd_size[1] else 1.0
         if camera is None:
@@ -43,40 +81,669 @@ class Renderer:
         self.shaders: list[ShaderWrapper] = []
         self.vaos = []
 
-        for mesh in self.models:
-            vbo = self.ctx.buffer(mesh.vertex_buffer)
-            ibo = self.ctx.buffer(mesh.index_buffer)
-            shader = ShaderWrapper(
-                self.ctx,
-                mesh.render_properties.vertex_shader_path,
-                mesh.render_properties.fragment_shader_path,
-            )
+        # UBO compartido: la matriz se sube una vez por frame y solo si la cámara cambió.
+        self.camera_ubo = self.ctx.buffer(reserve=64)
+        self._camera_state: Optional[tuple[int, int]] = None
 
-            for uniform in mesh.render_properties.uniforms:
-                shader.program[uniform['name']].value = uniform['value']
+        self.program_cache = ProgramCache.for_context(self.ctx)
+        # IBOs compartidos por clave de índices (p. ej. rejillas de igual forma).
+        self.index_cache = IndexBufferCache.for_context(self.ctx)
+        self.ibo_keys: list[Optional[tuple]] = []
+        # LUT activa: los shaders coloreados por valor la leen de COLORMAP_UNIT.
+        self.colormap_cache = ColormapCache.for_context(self.ctx)
+        self.colormap: Optional[tuple[str, int]] = None
+        self.colormap_texture: Optional[moderngl.Texture] = None
+        self.set_colormap(colormap or default_colormap())
+        # Grafo de escena: los meshes con `node` se dibujan con la matriz de mundo
+        # de su nodo, leída de una textura que solo se reescribe donde cambió.
+        self.scene = scene if scene is not None else SceneGraph()
+        self.world_texture = WorldMatrixTexture(self.ctx, len(self.scene) + 1)
+        self.world_texture.sync(self.scene)
+        self.model_nodes = np.empty(0, dtype=np.int64)
+        self._index_nodes()
+        # Uniforms por draw: solo para meshes cuyo programa comparten otros meshes.
+        self.draw_uniforms: list[list[tuple[moderngl.Uniform, object]]] = []
+        self._program_users: dict[str, int] = {}
+        # Uniform 'time' de cada programa distinto que lo declara (uno por frame).
+        self.time_uniforms: list[moderngl.Uniform] = []
 
-            vao = self.ctx.vertex_array(
-                shader.program,
-                [(vbo, '3f', 'in_pos')],
-                ibo,
-            )
+        # Meshes actualizados con update_mesh: anillo de VBOs por índice de modelo.
+        self.dynamic: dict[int, DynamicMeshBuffers] = {}
+        self.dynamic_buffering = dynamic_buffering
+
+        # Destino fuera de pantalla (modo headless) y lectura asíncrona de frames.
+        self.target: Optional[OffscreenTarget] = None
+        self.readback: Optional[AsyncReadback] = None
+
+        # Perfilador opcional (spans de CPU y tiempos de GPU por draw).
+        self.profiler = profiler
+
+        # Meshes generados en segundo plano: future por modelo y subida en curso.
+        # Se suben como mucho upload_budget bytes por frame; mientras tanto se
+        # sigue dibujando la geometría anterior.
+        self.upload_budget = int(upload_budget)
+        self.frame_upload_bytes = 0
+        self.swapped_meshes = 0
+        self._swaps: dict[int, Future] = {}
+        self._uploads: dict[int, StagedMeshUpload] = {}
+
+        # Capas con recursos GPU propios (instancing, overlays) dibujadas tras los meshes.
+        self.layers: list = []
+
+        # Batches: meshes con el mismo shader se dibujan desde una arena compartida.
+        self.batches: list[MeshBatch] = []
+        self.batch_slots: dict[int, tuple[int, int]] = {}
+        # Caja de cada batch (None si algún miembro no admite culling).
+        self.batch_bounds: list[Optional[np.ndarray]] = []
+
+        # Culling por frustum: BVH sobre las cajas de los modelos con draw propio.
+        self.culling = culling
+        self.bvh: Optional[BVH] = None
+        self.visible_count = 0
+        self.culled_count = 0
+        self._bvh_revision = 0
+        self._draw_state: Optional[tuple] = None
+        self._draw_list: list[int] = []
+        self._batch_list: list[int] = []
+        groups: dict[tuple, list[int]] = {}
+        if batching:
+            for i, mesh in enumerate(self.models):
+                key = batch_key(mesh)
+                if key is not None:
+                    groups.setdefault(key, []).append(i)
+
+        for i, mesh in enumerate(self.models):
+            key = batch_key(mesh) if batching else None
+            if key is None:
+                vbo, ibo, shader, vao = self._create_mesh_resources(mesh)
+            else:
+                # Los recursos por mesh quedan en None; el batch los sustituye.
+                vbo = ibo = shader = vao = None
+                if i not in self.batch_slots:
+                    self._create_batch(groups[key])
 
             self.vbos.append(vbo)
             self.ibos.append(ibo)
+            self.ibo_keys.append(mesh.index_key if ibo is not None else None)
             self.shaders.append(shader)
             self.vaos.append(vao)
 
-    
-    def render(self) -> None:
+        self._bind_model_uniforms()
+        self._build_bvh()
+
+    def _create_mesh_resources(self, mesh: Mesh):
+        # Crea VBO, IBO, programa (desde la caché) y VAO para un mesh individual.
+        # Los arrays se pasan por el protocolo buffer: sin copia intermedia a bytes
+        # (los memmap de MeshCache se leen directamente desde la página del archivo).
+        vbo = self.ctx.buffer(np.ascontiguousarray(mesh.vertex_data))
+        indices = np.ascontiguousarray(mesh.indices)
+        if mesh.index_key is not None:
+            ibo = self.index_cache.acquire(mesh.index_key, indices)
+        else:
+            ibo = self.ctx.buffer(indices)
+        shader, vao = self._create_program(mesh, vbo, ibo)
+        return vbo, ibo, shader, vao
+
+    def _create_program(self, mesh: Mesh, vbo: moderngl.Buffer, ibo: moderngl.Buffer):
+        # Programa (desde la caché) y VAO sobre buffers ya subidos.
+        shader = ShaderWrapper(
+            self.ctx,
+            mesh.render_properties.vertex_shader_path,
+            mesh.render_properties.fragment_shader_path,
+            cache=self.program_cache,
+            vertex_source=mesh.render_properties.vertex_shader_source,
+        )
+        self._bind_shared(shader)
+        vao = self.ctx.vertex_array(
+            shader.program,
+            [(vbo, *mesh.vertex_layout)],
+            ibo,
+            index_element_size=mesh.index_element_size,
+        )
+        return shader, vao
+
+    @staticmethod
+    def _bind_shared(shader: ShaderWrapper) -> None:
+        # Enlaza el bloque de cámara y las texturas comunes a todos los draws.
+        shader.bind_uniform_block(CAMERA_BLOCK_NAME, CAMERA_BLOCK_BINDING)
+        shader.bind_sampler(COLORMAP_SAMPLER, COLORMAP_UNIT)
+        shader.bind_sampler(WORLD_MATRIX_SAMPLER, WORLD_MATRIX_UNIT)
+
+    def _create_batch(self, members: list[int]) -> MeshBatch:
+        # Empaqueta los modelos indicados en un batch y registra sus posiciones.
+        batch = MeshBatch(self.ctx, [self.models[j] for j in members], cache=self.program_cache)
+        self._bind_shared(batch.shader)
+        for instance, j in enumerate(members):
+            self.batch_slots[j] = (len(self.batches), instance)
+        self.batches.append(batch)
+        self.batch_bounds.append(self._union_bounds(members))
+        return batch
+
+    def _union_bounds(self, members: list[int]) -> Optional[np.ndarray]:
+        # Caja que envuelve a varios modelos; None si alguno no admite culling.
+        if not all(self.models[j].cullable for j in members):
+            return None
+        boxes = self._world_boxes(members)
+        return np.stack((boxes[:, 0].min(axis=0), boxes[:, 1].max(axis=0)))
+
+    def _world_boxes(self, indices) -> np.ndarray:
+        # Cajas (N, 2, 3) de los modelos indicados en coordenadas de mundo.
+        models = [self.models[i] for i in indices]
+        boxes = np.array([model.aabb for model in models], dtype=np.float64).reshape(-1, 2, 3)
+        placed = [k for k, model in enumerate(models) if model.node is not None]
+        if placed:
+            world = self.scene.world_matrices[[models[k].node for k in placed]]
+            boxes[placed] = transform_boxes(boxes[placed], world)
+        return boxes
+
+    def _index_nodes(self) -> None:
+        # Nodo de cada modelo (-1 sin nodo), para localizar los afectados por la escena.
+        nodes = np.array([-1 if model.node is None else model.node for model in self.models], dtype=np.int64)
+        if nodes.size and nodes.max() >= len(self.scene):
+            raise ValueError(f"Nodo de escena inexistente: {int(nodes.max())}")
+        self.model_nodes = nodes
+
+    def _build_bvh(self) -> None:
+        # Indexa los modelos con draw propio que admiten culling; el resto se dibuja siempre.
+        drawable = [i for i, vao in enumerate(self.vaos) if vao is not None]
+        items = [i for i in drawable if self.models[i].cullable]
+        self.bvh_items = np.array(items, dtype=np.int64)
+        self.bvh_slot = {model: item for item, model in enumerate(items)}
+        self.always_drawn = np.array([i for i in drawable if not self.models[i].cullable], dtype=np.int64)
+        self.bvh = BVH(self._world_boxes(items))
+        self._bvh_revision += 1
+
+    def visible_models(self) -> list[int]:
+        # Índices de modelos con draw propio dentro del frustum, en orden de registro.
+        """
+        Se recalcula solo si cambió la cámara o alguna caja; con la cámara
+        quieta el coste por frame es nulo. Actualiza ``visible_count`` y
+        ``culled_count`` (los miembros de un batch cuentan según su batch).
+        """
+        state = (id(self.camera), self.camera.version, self._bvh_revision, self.culling)
+        if state == self._draw_state:
+            return self._draw_list
+        if self.culling:
+            planes = self.camera.frustum_planes
+            hits = self.bvh_items[self.bvh.query(planes)]
+            self._draw_list = np.union1d(hits, self.always_drawn).astype(int).tolist()
+            self._batch_list = []
+            for b, bounds in enumerate(self.batch_bounds):
+                if bounds is None or not classify_boxes(planes, bounds[None, 0], bounds[None, 1])[0][0]:
+                    self._batch_list.append(b)
+        else:
+            self._draw_list = [i for i, vao in enumerate(self.vaos) if vao is not None]
+            self._batch_list = list(range(len(self.batches)))
+        visible_batches = set(self._batch_list)
+        batched = sum(1 for b, _ in self.batch_slots.values() if b in visible_batches)
+        self.visible_count = len(self._draw_list) + batched
+        self.culled_count = len(self.models) - self.visible_count
+        self._draw_state = state
+        return self._draw_list
+
+    def _bind_model_uniforms(self) -> None:
+        # Resuelve los uniforms de cada mesh; los programas únicos se escriben una vez.
+        users: dict[str, int] = {}
+        self.time_uniforms = []
+        for shader in self.shaders:
+            if shader is None:
+                continue
+            if shader.key not in users and 'time' in shader.program:
+                self.time_uniforms.append(shader.program['time'])
+            users[shader.key] = users.get(shader.key, 0) + 1
+        self._program_users = users
+
+        self.draw_uniforms = []
+        for mesh, shader in zip(self.models, self.shaders):
+            if shader is None:
+                self.draw_uniforms.append([])
+                continue
+            resolved = [
+                (shader.program[uniform['name']], uniform['value'])
+                for uniform in mesh.render_properties.uniforms
+                if uniform['name'] in shader.program
+            ]
+            if WORLD_SLOT_UNIFORM in shader.program:
+                resolved.append((shader.program[WORLD_SLOT_UNIFORM], world_slot(mesh.node)))
+            if users[shader.key] > 1:
+                self.draw_uniforms.append(resolved)
+            else:
+                for member, value in resolved:
+                    member.value = value
+                self.draw_uniforms.append([])
+
+
+    def model_index(self, model: Mesh) -> int:
+        # Posición del modelo registrado (por identidad, no por igualdad).
+        for i, candidate in enumerate(self.models):
+            if candidate is model:
+                return i
+        raise ValueError("El modelo no está registrado en este Renderer")
+
+    def update_mesh(self, model: Mesh, vertices, indices=None, first_vertex: Optional[int] = None) -> None:
+        # Actualiza la geometría de un mesh registrado sin recrear programas ni VAOs nuevos.
+        """
+        Con ``first_vertex=None`` reemplaza todos los vértices (el tamaño puede
+        cambiar); con un entero sobrescribe solo el rango que empieza ahí.
+        ``indices`` reemplaza la topología completa. Los buffers se reutilizan
+        y solo se reasignan (orphan) cuando el nuevo contenido no cabe.
+        """
+        i = self.model_index(model)
+        width = model.vertices.shape[1] if model.vertices.ndim == 2 else 3
+        vertices = np.asarray(vertices, dtype=np.float32).reshape(-1, width)
+        resized = False
+        if first_vertex is None:
+            resized = len(vertices) != len(model.vertices)
+            model.vertices = np.array(vertices, dtype=np.float32)
+            start, stop = 0, len(vertices)
+        else:
+            start, stop = int(first_vertex), int(first_vertex) + len(vertices)
+            if start < 0 or stop > len(model.vertices):
+                raise ValueError(f"Rango de vértices fuera del mesh: [{start}, {stop})")
+            model.vertices[start:stop] = vertices
+        if indices is not None:
+            indices = np.asarray(indices).ravel()
+            if indices.size and indices.max() > np.iinfo(model.indices.dtype).max:
+                raise ValueError(f"Los índices no caben en {model.indices.dtype} (tamaño fijo del IBO)")
+            model.indices = indices.astype(model.indices.dtype)
+            model.index_key = None
+        if first_vertex is None:
+            model.update_bounds()
+        else:
+            model.grow_bounds(vertices)
+        self._refit(i)
+
+        if i in self.batch_slots:
+            batch_index, instance = self.batch_slots[i]
+            if resized or indices is not None:
+                self._rebuild_batch(batch_index)
+            else:
+                self.batches[batch_index].update_vertices(instance, start, model.vertices[start:stop])
+            return
+
+        ring = self.dynamic.get(i)
+        if ring is None:
+            ring = self._make_dynamic(i)
+        if indices is not None:
+            ring.update_indices(model.index_buffer, model.indices.size)
+        self.vaos[i] = ring.update(model.vertex_data, start, stop)
+        self.vbos[i] = ring.vbo
+
+    def _refit(self, i: int) -> None:
+        # Propaga la caja nueva de un modelo al BVH o a la caja de su batch.
+        if i in self.batch_slots:
+            b = self.batch_slots[i][0]
+            self.batch_bounds[b] = self._union_bounds(
+                [j for j, (batch, _) in self.batch_slots.items() if batch == b])
+        elif i in self.bvh_slot:
+            self.bvh.refit(self.bvh_slot[i], self._world_boxes([i])[0])
+        self._bvh_revision += 1
+
+    def attach(self, model: Mesh, node: Optional[int]) -> None:
+        # Coloca un modelo registrado en un nodo de la escena (None: vuelve al origen).
+        """Solo cambia el hueco de matriz que lee el draw: la geometría no se toca."""
+        i = self.model_index(model)
+        if node is not None and not 0 <= int(node) < len(self.scene):
+            raise ValueError(f"Nodo de escena inexistente: {node}")
+        model.node = None if node is None else int(node)
+        self.model_nodes[i] = -1 if node is None else int(node)
+        slot = world_slot(model.node)
+        if i in self.batch_slots:
+            batch_index, instance = self.batch_slots[i]
+            self.batches[batch_index].set_instance_slot(instance, slot)
+        elif WORLD_SLOT_UNIFORM in self.shaders[i].program:
+            shader = self.shaders[i]
+            member = shader.program[WORLD_SLOT_UNIFORM]
+            if self._program_users.get(shader.key, 0) > 1:
+                self.draw_uniforms[i] = [(m, v) for m, v in self.draw_uniforms[i]
+                                         if m.name != WORLD_SLOT_UNIFORM] + [(member, slot)]
+            else:
+                member.value = slot
+        self.world_texture.sync(self.scene)
+        self._refit(i)
+
+    def _refit_nodes(self, changed: np.ndarray) -> None:
+        # Reajusta las cajas de mundo de los modelos cuyos nodos se movieron (en bloque).
+        affected = np.flatnonzero(np.isin(self.model_nodes, changed))
+        if affected.size == 0:
+            return
+        items, batches = [], set()
+        for i in affected.tolist():
+            if i in self.batch_slots:
+                batches.add(self.batch_slots[i][0])
+            elif i in self.bvh_slot:
+                items.append(i)
+        if items:
+            self.bvh.refit_many([self.bvh_slot[i] for i in items], self._world_boxes(items))
+        for b in batches:
+            self.batch_bounds[b] = self._union_bounds(
+                [j for j, (batch, _) in self.batch_slots.items() if batch == b])
+        self._bvh_revision += 1
+
+    def _make_dynamic(self, i: int) -> DynamicMeshBuffers:
+        # Convierte los buffers estáticos de un mesh en un anillo dinámico.
+        model = self.models[i]
+        if self.ibo_keys[i] is not None:
+            # El anillo reescribe sus índices: deja de compartir el IBO de la caché.
+            self.index_cache.release(self.ibo_keys[i])
+            self.ibo_keys[i] = None
+            self.ibos[i] = self.ctx.buffer(model.index_buffer)
+        ring = DynamicMeshBuffers(
+            self.ctx,
+            self.shaders[i].program,
+            model.vertex_layout,
+            model.vertex_data,
+            self.ibos[i],
+            model.indices.size,
+            index_element_size=model.index_element_size,
+            ring_size=self.dynamic_buffering,
+        )
+        self.vaos[i].release()
+        self.vbos[i].release()
+        self.dynamic[i] = ring
+        return ring
+
+    def _rebuild_batch(self, batch_index: int) -> None:
+        # Reempaqueta un batch cuando cambió el tamaño o la topología de un miembro.
+        members = sorted(j for j, (b, _) in self.batch_slots.items() if b == batch_index)
+        old = self.batches[batch_index]
+        batch = MeshBatch(self.ctx, [self.models[j] for j in members], cache=self.program_cache)
+        self._bind_shared(batch.shader)
+        self.batches[batch_index] = batch
+        old.release()
+
+    def replace_mesh(self, index: int, source: Union[Mesh, Future]) -> None:
+        # Programa la sustitución del modelo index por un mesh (o el future que lo genera).
+        """
+        La geometría actual se sigue dibujando hasta que los buffers nuevos
+        terminan de subirse; el cambio se aplica al inicio de un frame, en el
+        hilo de GL. Una petición nueva para el mismo índice descarta la
+        anterior (y su subida a medias). Los modelos en batch no admiten
+        sustitución.
+        """
+        if not 0 <= index < len(self.models):
+            raise ValueError(f"Índice de modelo fuera de rango: {index}")
+        if index in self.batch_slots:
+            raise ValueError("No se puede sustituir un modelo agrupado en un batch")
+        if not isinstance(source, Future):
+            _require_mesh(source)
+            future = Future()
+            future.set_result(source)
+            source = future
+        self._drop_swap(index)
+        self._swaps[index] = source
+
+    @property
+    def pending_swaps(self) -> int:
+        return len(self._swaps)
+
+    def _drop_swap(self, index: int) -> None:
+        # Olvida la sustitución pendiente del índice y libera su subida parcial.
+        future = self._swaps.pop(index, None)
+        if future is not None:
+            future.cancel()
+        upload = self._uploads.pop(index, None)
+        if upload is not None:
+            upload.release()
+
+    def process_swaps(self) -> int:
+        # Avanza las subidas pendientes dentro del presupuesto del frame.
+        """Devuelve los bytes subidos en esta llamada (también en ``frame_upload_bytes``)."""
+        budget = self.upload_budget
+        self.frame_upload_bytes = 0
+        for i in list(self._swaps):
+            upload = self._uploads.get(i)
+            if upload is None:
+                future = self._swaps[i]
+                if not future.done():
+                    continue
+                if future.cancelled():
+                    del self._swaps[i]
+                    continue
+                error = future.exception()
+                if error is not None:
+                    # Se conserva la geometría anterior.
+                    logger.error("Falló la generación del mesh %d", i, exc_info=error)
+                    del self._swaps[i]
+                    continue
+                upload = self._uploads[i] = StagedMeshUpload(self.ctx, future.result(), self.index_cache)
+            if budget <= 0:
+                break
+            used = upload.step(budget)
+            budget -= used
+            self.frame_upload_bytes += used
+            if upload.done:
+                del self._swaps[i], self._uploads[i]
+                self._swap_in(i, upload)
+        return self.frame_upload_bytes
+
+    def _swap_in(self, i: int, upload: StagedMeshUpload) -> None:
+        # Sustituye los recursos del modelo i por los ya subidos y libera los anteriores.
+        mesh = upload.mesh
+        if mesh.node is None:
+            # El sustituto hereda la posición en la escena del mesh anterior.
+            mesh.node = self.models[i].node
+        shader, vao = self._create_program(mesh, upload.vbo, upload.ibo)
+        ring = self.dynamic.pop(i, None)
+        if ring is not None:
+            ring.release()
+        else:
+            self.vaos[i].release()
+            self.vbos[i].release()
+            if self.ibo_keys[i] is not None:
+                self.index_cache.release(self.ibo_keys[i])
+            else:
+                self.ibos[i].release()
+        self.shaders[i].release()
+        self.models[i] = mesh
+        self.vbos[i], self.ibos[i], self.ibo_keys[i] = upload.vbo, upload.ibo, upload.ibo_key
+        self.shaders[i], self.vaos[i] = shader, vao
+        self.swapped_meshes += 1
+        self._index_nodes()
+        self._bind_model_uniforms()
+        self._build_bvh()
+
+    def add_layer(self, layer) -> None:
+        # Registra una capa; debe implementar render(renderer) y release().
+        self.layers.append(layer)
+
+    def set_colormap(self, name: str, size: int = DEFAULT_LUT_SIZE) -> None:
+        # Cambia la LUT activa: solo se enlaza otra textura, sin tocar geometría.
+        key = (name, int(size))
+        if key == self.colormap:
+            return
+        texture = self.colormap_cache.acquire(*key)
+        if self.colormap is not None:
+            self.colormap_cache.release(*self.colormap)
+        self.colormap, self.colormap_texture = key, texture
+
+    def upload_camera(self) -> None:
+        # Sube la matriz de cámara al UBO solo cuando cambió la cámara o su versión.
+        state = (id(self.camera), self.camera.version)
+        if state != self._camera_state:
+            self.camera_ubo.write(self.camera.camera_matrix_bytes)
+            self._camera_state = state
+        self.camera_ubo.bind_to_uniform_block(CAMERA_BLOCK_BINDING)
+        self.colormap_texture.use(location=COLORMAP_UNIT)
+
+    def upload_scene(self) -> None:
+        # Sube las matrices de mundo que cambiaron y reajusta las cajas de sus modelos.
+        """
+        Mover un nodo con muchos hijos recalcula sus mundos en un matmul
+        vectorizado, los sube en una sola escritura de textura y reajusta el
+        BVH en bloque; no se reescribe ningún vértice.
+        """
+        changed = self.world_texture.sync(self.scene)
+        if changed.size:
+            self._refit_nodes(changed)
+        self.world_texture.use()
+
+    def render(self, time: Optional[float] = None) -> None:
         # Configura el viewport, limpia y emite draw calls para cada VAO.
+        if time is not None:
+            self.time = float(time)
+        if self.profiler is not None:
+            self._render_profiled()
+            return
+        if self._swaps:
+            self.process_swaps()
+        self._begin_frame()
+        # Enviar matriz de cámara una sola vez para todos los shaders
+        self.upload_camera()
+        self.upload_scene()
+        for member in self.time_uniforms:
+            member.value = self.time
+
+        for i in self.visible_models():
+            model = self.models[i]
+            for member, value in self.draw_uniforms[i]:
+                member.value = value
+            self.vaos[i].render(mode=model.render_properties.gl_mode)
+
+        for b in self._batch_list:
+            self.batches[b].render()
+
+        for layer in self.layers:
+            layer.render(self)
+
+        if self.target is not None:
+            self.target.resolve()
+
+    def _begin_frame(self) -> None:
+        # Destino, viewport, test de profundidad y limpieza del frame.
         width, height = self.wnd_size
+        if self.target is not None:
+            self.target.use()
         self.ctx.viewport = (0, 0, width, height)
         self.ctx.enable(moderngl.DEPTH_TEST)
         self.ctx.clear(*self.background_color, depth=1.0)
-        # Enviar matriz de proyección al shader
 
-        for i, vao in enumerate(self.vaos):
-            model = self.models[i]
-            self.shaders[i].program['camera_matrix'].write(self.camera.camera_matrix.astype('f4').T.tobytes())
+    def _render_profiled(self) -> None:
+        # Mismo frame que render(), con spans de CPU y una consulta de GPU por draw.
+        profiler = self.profiler
+        profiler.begin_frame()
+        if self._swaps:
+            with profiler.span("uploads"):
+                self.process_swaps()
+        with profiler.span("clear"):
+            self._begin_frame()
+        with profiler.span("camera"):
+            self.upload_camera()
+        with profiler.span("scene"):
+            self.upload_scene()
+        with profiler.span("cull"):
+            visible = self.visible_models()
+        with profiler.span("uniforms"):
+            for member in self.time_uniforms:
+                member.value = self.time
+
+        with profiler.span("draws"):
+            for i in visible:
+                model = self.models[i]
+                for member, value in self.draw_uniforms[i]:
+                    member.value = value
+                with profiler.gpu(f"{type(model).__name__}[{i}]"):
+                    self.vaos[i].render(mode=model.render_properties.gl_mode)
+            for b in self._batch_list:
+                with profiler.gpu(f"MeshBatch[{b}]"):
+                    self.batches[b].render()
+            for layer in self.layers:
+                with profiler.gpu(type(layer).__name__):
+                    layer.render(self)
+
+        if self.target is not None:
+            with profiler.span("resolve"):
+                self.target.resolve()
+        profiler.end_frame()
+
+    # --- Render fuera de pantalla ---
+    def enable_offscreen(self, samples: int = 0) -> OffscreenTarget:
+        # Dibuja en un framebuffer propio de tamaño wnd_size en lugar del de la ventana.
+        """Crea (o reutiliza) el destino offscreen, con MSAA si ``samples > 0``."""
+        if self.target is not None and self.target.samples == samples and self.target.size == tuple(self.wnd_size):
+            return self.target
+        if self.target is not None:
+            self.target.release()
+        self.target = OffscreenTarget(self.ctx, self.wnd_size, samples=samples)
+        return self.target
+
+    def _offscreen_target(self) -> OffscreenTarget:
+        # Destino offscreen al tamaño actual de wnd_size, conservando su MSAA.
+        if self.target is None or self.target.size != tuple(self.wnd_size):
+            return self.enable_offscreen(self.target.samples if self.target is not None else 0)
+        return self.target
+
+    def render_to_array(self, time: Optional[float] = None) -> np.ndarray:
+        # Renderiza un frame y lo devuelve como arreglo (alto, ancho, RGBA) uint8.
+        self._offscreen_target()
+        self.render(time)
+        return self.target.read()
+
+    def render_to_file(self, path: Path, time: Optional[float] = None) -> Path:
+        # Renderiza un frame y lo guarda como PNG.
+        return write_png(path, self.render_to_array(time))
+
+    def render_async(self, time: Optional[float] = None) -> Optional[np.ndarray]:
+        # Renderiza y encola la lectura en un PBO; devuelve el frame anterior ya listo.
+        """Devuelve None mientras el anillo de PBOs se llena."""
+        self._offscreen_target()
+        if self.readback is None or self.readback.size != self.target.size:
+            if self.readback is not None:
+                self.readback.release()
+            self.readback = AsyncReadback(self.ctx, self.target.size)
+        self.render(time)
+        return self.readback.request(self.target.fbo)
+
+    def render_sequence(self, times: Iterable[float], sink: Callable[[int, np.ndarray], None]) -> int:
+        # Renderiza varios instantes y entrega cada imagen a sink, en orden.
+        """La lectura del frame N se solapa con el render del N+1; devuelve el total."""
+        index = 0
+        for time in times:
+            frame = self.render_async(time)
+            if frame is not None:
+                sink(index, frame)
+                index += 1
+        if self.readback is not None:
+            for frame in self.readback.flush():
+                sink(index, frame)
+                index += 1
+        return index
+
+    def render_to_files(self, pattern: str, times: Iterable[float], workers: int = 2) -> list[Path]:
+        # Secuencia de PNGs; la compresión corre en hilos mientras la GPU sigue dibujando.
+        """``pattern`` se formatea con el índice del frame, p. ej. ``"out/frame_{:04d}.png"``."""
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = []
+            self.render_sequence(times, lambda index, frame: futures.append(
+                pool.submit(write_png, Path(pattern.format(index)), frame)))
+            return [future.result() for future in futures]
 
-            vao.render(mode=model.render_properties.gl_mode)
+    def release(self) -> None:
+        # Libera buffers y VAOs, y devuelve los programas a la caché.
+        for i in list(self._swaps):
+            self._drop_swap(i)
+        for i, ring in self.dynamic.items():
+            ring.release()
+            self.vaos[i] = self.vbos[i] = self.ibos[i] = None
+        for i, key in enumerate(self.ibo_keys):
+            if key is not None and self.ibos[i] is not None:
+                self.index_cache.release(key)
+                self.ibos[i] = None
+        for resource in (*self.vaos, *self.vbos, *self.ibos, *self.shaders, *self.batches, *self.layers):
+            if resource is not None:
+                resource.release()
+        self.dynamic = {}
+        self.camera_ubo.release()
+        self.world_texture.release()
+        if self.colormap is not None:
+            self.colormap_cache.release(*self.colormap)
+            self.colormap = self.colormap_texture = None
+        for resource in (self.target, self.readback, self.profiler):
+            if resource is not None:
+                resource.release()
+        self.target = self.readback = self.profiler = None
+        self.vaos, self.vbos, self.ibos, self.shaders, self.ibo_keys = [], [], [], [], []
+        self.batches, self.batch_slots, self.layers = [], {}, []
+        self.batch_bounds, self._draw_list, self._batch_list = [], [], []
+        self._draw_state = None
+        self.draw_uniforms = []
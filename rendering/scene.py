@@ -0,0 +1,91 @@
+import numpy as np
+import moderngl
+import weakref
+from typing import Optional
+from ..core.scene import SceneGraph
+
+# Sampler de las matrices de mundo (shaders/common/scene.glsl) y su unidad fija.
+WORLD_MATRIX_SAMPLER = "world_matrices"
+WORLD_MATRIX_UNIT = 5
+# Uniform con el hueco de la matriz de un draw individual.
+WORLD_SLOT_UNIFORM = "world_slot"
+# Matrices por fila de la textura (4 texels cada una): 4096 texels de ancho.
+MATRICES_PER_ROW = 1024
+
+
+def world_slot(node: Optional[int]) -> int:
+    # Hueco en la textura del nodo; 0 es la identidad (mesh sin nodo).
+    return 0 if node is None else int(node) + 1
+
+
+# Matrices de mundo de un SceneGraph en una textura RGBA32F.
+class WorldMatrixTexture:
+    """
+    Cada matriz ocupa cuatro texels consecutivos (sus columnas, el orden de
+    ``mat4`` en GLSL) y el hueco 0 guarda la identidad. ``sync`` sube solo
+    las matrices que cambiaron desde la última sincronización, en una única
+    escritura que cubre las filas afectadas: mover un padre con 1000 hijos
+    es un matmul en CPU y una subida, sin tocar la geometría.
+    """
+    def __init__(self, ctx: moderngl.Context, capacity: int = 64):
+        self.ctx = ctx
+        self.texture: Optional[moderngl.Texture] = None
+        self._staging = np.zeros((0, 4, 4), dtype=np.float32)
+        self._version = -1
+        # Referencia débil: id() puede repetirse en otra escena tras liberarse la anterior.
+        self._scene_ref: Optional[weakref.ref] = None
+        self.uploads = 0
+        self.uploaded_matrices = 0
+        self._allocate(capacity)
+
+    @property
+    def capacity(self) -> int:
+        return len(self._staging)
+
+    def _allocate(self, slots: int) -> None:
+        # (Re)crea la textura con capacidad para `slots` matrices.
+        slots = max(int(slots), 1)
+        per_row = min(slots, MATRICES_PER_ROW)
+        rows = -(-slots // per_row)
+        staging = np.zeros((per_row * rows, 4, 4), dtype=np.float32)
+        staging[:] = np.eye(4, dtype=np.float32)
+        count = min(len(self._staging), len(staging))
+        staging[:count] = self._staging[:count]
+        self._staging = staging
+        if self.texture is not None:
+            self.texture.release()
+        self.texture = self.ctx.texture((per_row * 4, rows), 4, staging.tobytes(), dtype='f4')
+        self.texture.filter = (moderngl.NEAREST, moderngl.NEAREST)
+        self.texture.repeat_x = self.texture.repeat_y = False
+
+    def sync(self, scene: SceneGraph) -> np.ndarray:
+        # Sube las matrices cambiadas desde la última llamada; devuelve esos nodos.
+        if self._scene_ref is None or self._scene_ref() is not scene:
+            self._scene_ref, self._version = weakref.ref(scene), -1
+        scene.update()
+        if scene.version == self._version:
+            return np.empty(0, dtype=np.int64)
+        changed = scene.changed_since(self._version) if self._version >= 0 else np.arange(len(scene))
+        self._version = scene.version
+        if changed.size == 0:
+            return changed
+        slots = changed + 1
+        if len(scene) + 1 > self.capacity:
+            self._allocate(max(len(scene) + 1, self.capacity * 2))
+        # Columnas de cada matriz como texels consecutivos (transpuesta de la fila mayor de NumPy).
+        self._staging[slots] = scene.world_matrices[changed].transpose(0, 2, 1)
+        per_row = self.texture.width // 4
+        first_row, last_row = int(slots.min()) // per_row, int(slots.max()) // per_row
+        block = self._staging[first_row * per_row:(last_row + 1) * per_row]
+        self.texture.write(block.tobytes(), viewport=(0, first_row, self.texture.width, last_row - first_row + 1))
+        self.uploads += 1
+        self.uploaded_matrices += len(changed)
+        return changed
+
+    def use(self) -> None:
+        self.texture.use(location=WORLD_MATRIX_UNIT)
+
+    def release(self) -> None:
+        if self.texture is not None:
+            self.texture.release()
+            self.texture = None
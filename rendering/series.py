@@ -0,0 +1,123 @@
+import numpy as np
+import moderngl
+from typing import Optional
+from ..core.models import Material
+from ..shapes.series import MinMaxPyramid
+from .renderer import CAMERA_BLOCK_BINDING, CAMERA_BLOCK_NAME
+from .shader import ProgramCache, ShaderWrapper
+
+# Bytes por bloque en GPU: (mín, máx) en float32.
+_BUCKET_BYTES = 8
+
+
+# Serie 2D en streaming: anillo de muestras en GPU con pirámide min/max por nivel.
+class StreamingSeries:
+    """
+    Capa del Renderer para trazas de millones de muestras equiespaciadas.
+    Cada nivel de la pirámide vive en un VBO con el anillo duplicado (cada
+    bloque se escribe en ``slot`` y en ``slot + slots``), de modo que
+    cualquier ventana es un rango contiguo y se dibuja con una sola llamada.
+    ``append`` sube solo los bloques que cambian (O(muestras nuevas)); al
+    dibujar se elige el nivel con entre 2 y 4 bloques por columna de
+    píxeles, así que el coste por frame es O(ancho de pantalla). La ventana
+    visible ocupa x en [-1, 1], igual que Equation2dMesh.
+    """
+    def __init__(self, ctx: moderngl.Context, capacity: int, material: Optional[Material] = None,
+                 window: Optional[int] = None, y_scale: float = 1.0, y_offset: float = 0.0,
+                 cache: Optional[ProgramCache] = None):
+        self.ctx = ctx
+        self.pyramid = MinMaxPyramid(capacity)
+        self.material = material or Material()
+        # Muestras más recientes que se muestran (None = todas las retenidas).
+        self.window = window
+        self.y_scale = float(y_scale)
+        self.y_offset = float(y_offset)
+        self.shader = ShaderWrapper(
+            ctx,
+            "shaders/streaming_series/vertex.glsl",
+            "shaders/streaming_series/fragment.glsl",
+            cache=cache,
+        )
+        self.shader.bind_uniform_block(CAMERA_BLOCK_NAME, CAMERA_BLOCK_BINDING)
+        program = self.shader.program
+        self._first_vertex = program["first_vertex"]
+        self._x_first = program["x_first"]
+        self._x_step = program["x_step"]
+        self._y_transform = program["y_transform"]
+        self._color = program["color"]
+        self.vbos = [ctx.buffer(reserve=2 * slots * _BUCKET_BYTES, dynamic=True) for slots in self.pyramid.slots]
+        self.vaos = [ctx.vertex_array(program, [(vbo, '1f', 'in_value')]) for vbo in self.vbos]
+        self.level = 0
+        self.drawn_vertices = 0
+        self.uploaded_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self.pyramid)
+
+    def append(self, values) -> None:
+        # Añade muestras y sube a GPU únicamente los bloques afectados de cada nivel.
+        for level, (lo, hi) in enumerate(self.pyramid.append(values)):
+            self._upload(level, lo, hi)
+
+    def _upload(self, level: int, lo: int, hi: int) -> None:
+        # Escribe los bloques [lo, hi) del nivel en ambas copias del anillo.
+        slots = self.pyramid.slots[level]
+        data = self.pyramid.data[level]
+        if hi - lo >= slots:
+            lo = hi - slots
+        start = lo % slots
+        count = hi - lo
+        chunks = [(start, min(start + count, slots))]
+        if start + count > slots:
+            chunks.append((0, start + count - slots))
+        vbo = self.vbos[level]
+        for a, b in chunks:
+            payload = data[a:b].tobytes()
+            vbo.write(payload, offset=a * _BUCKET_BYTES)
+            vbo.write(payload, offset=(a + slots) * _BUCKET_BYTES)
+            self.uploaded_bytes += 2 * len(payload)
+
+    def visible_range(self) -> tuple[int, int]:
+        # Rango absoluto [start, stop) de muestras de la ventana.
+        stop = self.pyramid.total
+        start = self.pyramid.start if self.window is None else max(stop - int(self.window), self.pyramid.start)
+        return start, stop
+
+    def pixel_columns(self, camera, viewport_width: int) -> int:
+        # Columnas de píxeles que ocupa x en [-1, 1] con la cámara actual.
+        ends = camera.camera_matrix @ np.array([[-1.0, 1.0], [0.0, 0.0], [0.0, 0.0], [1.0, 1.0]], dtype=np.float32)
+        w = ends[3]
+        if np.any(w <= 0):
+            return int(viewport_width)
+        ndc = ends[0] / w
+        return max(int(np.ceil(abs(ndc[1] - ndc[0]) * 0.5 * viewport_width)), 1)
+
+    def render(self, renderer=None) -> None:
+        # Un LINE_STRIP en zigzag (mín, máx) con los bloques del nivel elegido.
+        start, stop = self.visible_range()
+        samples = stop - start
+        if samples <= 0:
+            self.drawn_vertices = 0
+            return
+        columns = self.pixel_columns(renderer.camera, renderer.wnd_size[0]) if renderer is not None else samples
+        level = self.level = self.pyramid.level_for(samples, columns)
+        first, last = start >> level, ((stop - 1) >> level) + 1
+        slot = first % self.pyramid.slots[level]
+        # Muestra i -> x = -1 + 2 (i - start) / (samples - 1); cada bloque en su centro.
+        scale = 2.0 / max(samples - 1, 1)
+        center = ((1 << level) - 1) * 0.5
+        self._first_vertex.value = 2 * slot
+        self._x_first.value = -1.0 + ((first << level) + center - start) * scale
+        self._x_step.value = (1 << level) * scale
+        self._y_transform.value = (self.y_scale, self.y_offset)
+        self._color.value = tuple(self.material.fill_color)
+        self.drawn_vertices = 2 * (last - first)
+        self.vaos[level].render(moderngl.LINE_STRIP, vertices=self.drawn_vertices, first=2 * slot)
+
+    def release(self) -> None:
+        for vao in self.vaos:
+            vao.release()
+        for vbo in self.vbos:
+            vbo.release()
+        self.shader.release()
+        self.vaos, self.vbos = [], []
@@ -1,26 +1,226 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import weakref
 import moderngl
 from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Raíz del paquete: segunda ruta de búsqueda de #include (p. ej. "build/colors.glslinc").
+PACKAGE_ROOT = Path(__file__).resolve().parents[1]
+_INCLUDE = re.compile(r'^[ \t]*#include[ \t]+"([^"]+)"[ \t]*$', re.MULTILINE)
+
+
+def source_key(vertex_src: str, fragment_src: str) -> str:
+    # Hash estable del par de shaders; identifica programas equivalentes.
+    digest = hashlib.sha256()
+    digest.update(vertex_src.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(fragment_src.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def enable_shader_disk_cache(cache_dir: Path) -> Path:
+    # Redirige la caché de binarios del driver (Mesa/NVIDIA) a un directorio propio.
+    """
+    Activa la caché persistente de programas enlazados del driver OpenGL.
+    ModernGL no expone glProgramBinary, así que se delega en la caché del
+    driver; debe llamarse antes de crear el contexto.
+    """
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    os.environ.setdefault("MESA_SHADER_CACHE_DIR", str(cache_dir))
+    os.environ.setdefault("MESA_SHADER_CACHE_DISABLE", "false")
+    os.environ.setdefault("__GL_SHADER_DISK_CACHE", "1")
+    os.environ.setdefault("__GL_SHADER_DISK_CACHE_PATH", str(cache_dir))
+    os.environ.setdefault("__GL_SHADER_DISK_CACHE_SKIP_CLEANUP", "1")
+    return cache_dir
+
+
+def resolve_includes(source: str, origin: Path, _seen: Optional[set] = None) -> str:
+    # Sustituye cada #include "ruta" por el archivo, una sola vez por programa.
+    """
+    La ruta se busca junto al archivo que incluye y después en la raíz del
+    paquete. Un archivo ya incluido se omite (como #pragma once), lo que
+    también corta los ciclos.
+    """
+    if "#include" not in source:
+        return source
+    seen = set() if _seen is None else _seen
+
+    def expand(match: re.Match) -> str:
+        name = match.group(1)
+        for base in (Path(origin).parent, PACKAGE_ROOT):
+            candidate = base / name
+            if candidate.is_file():
+                break
+        else:
+            raise FileNotFoundError(f"Include de shader no encontrado: {name} (desde {origin})")
+        resolved = candidate.resolve()
+        if resolved in seen:
+            return ""
+        seen.add(resolved)
+        return resolve_includes(resolved.read_text(encoding="utf-8"), resolved, seen)
+
+    return _INCLUDE.sub(expand, source)
+
+
+# Caché de programas por contexto, indexada por hash del código fuente.
+class ProgramCache:
+    """
+    Compila cada par de shaders una sola vez por contexto y lo comparte entre
+    todos los meshes que lo usan, con conteo de referencias.
+    """
+    _instances: "weakref.WeakKeyDictionary[moderngl.Context, ProgramCache]" = weakref.WeakKeyDictionary()
+
+    def __init__(self, ctx: moderngl.Context):
+        self.ctx = ctx
+        self._programs: dict[str, moderngl.Program] = {}
+        self._refcounts: dict[str, int] = {}
+        self.compile_seconds: dict[str, float] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def for_context(cls, ctx: moderngl.Context) -> "ProgramCache":
+        # Devuelve (o crea) la caché asociada al contexto.
+        cache = cls._instances.get(ctx)
+        if cache is None:
+            cache = cls(ctx)
+            cls._instances[ctx] = cache
+        return cache
+
+    def acquire(self, vertex_src: str, fragment_src: str) -> tuple[str, moderngl.Program]:
+        # Obtiene el programa compilado (o lo compila) e incrementa su referencia.
+        key = source_key(vertex_src, fragment_src)
+        program = self._programs.get(key)
+        if program is None:
+            start = time.perf_counter()
+            program = self.ctx.program(vertex_shader=vertex_src, fragment_shader=fragment_src)
+            self.compile_seconds[key] = time.perf_counter() - start
+            self._programs[key] = program
+            self._refcounts[key] = 0
+            self.misses += 1
+        else:
+            self.hits += 1
+        self._refcounts[key] += 1
+        return key, program
+
+    def release(self, key: str) -> None:
+        # Decrementa la referencia y libera el programa cuando nadie lo usa.
+        count = self._refcounts.get(key, 0) - 1
+        if count > 0:
+            self._refcounts[key] = count
+            return
+        self._refcounts.pop(key, None)
+        program = self._programs.pop(key, None)
+        if program is not None:
+            program.release()
+
+    def refcount(self, key: str) -> int:
+        return self._refcounts.get(key, 0)
+
+    def __len__(self) -> int:
+        return len(self._programs)
+
+    @property
+    def stats(self) -> dict:
+        # Resumen de aciertos y tiempo total de compilación.
+        return {
+            "programs": len(self._programs),
+            "hits": self.hits,
+            "misses": self.misses,
+            "compile_seconds": sum(self.compile_seconds.values()),
+        }
+
+
+def write_startup_report(cache: ProgramCache, path: Path) -> dict:
+    # Registra los tiempos de compilación de este arranque junto al historial.
+    """
+    Añade el arranque actual a un informe JSON y compara con el primero
+    registrado (arranque en frío) para medir el efecto de la caché en disco.
+    """
+    path = Path(path)
+    history = []
+    if path.exists():
+        try:
+            history = json.loads(path.read_text(encoding="utf-8")).get("launches", [])
+        except (OSError, ValueError):
+            logger.warning("Informe de arranque ilegible, se reinicia: %s", path)
+    launch = {
+        "timestamp": time.time(),
+        "compile_seconds": cache.stats["compile_seconds"],
+        "programs": dict(cache.compile_seconds),
+    }
+    history.append(launch)
+    cold = history[0]["compile_seconds"]
+    warm = launch["compile_seconds"]
+    report = {
+        "launches": history,
+        "cold_seconds": cold,
+        "warm_seconds": warm,
+        "speedup": (cold / warm) if warm > 0 else None,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    logger.info("Compilación de shaders: frío=%.4fs, actual=%.4fs", cold, warm)
+    return report
+
 
 # Pequeño helper para compilar y manejar pares de shaders.
 class ShaderWrapper:
     """
     Envoltura simple para compilar y almacenar un shader program de ModernGL.
-    Carga archivos .vert y .frag desde disco y crea el programa al instanciar.
+    Carga archivos .vert y .frag desde disco (resolviendo ``#include``) y
+    obtiene el programa de la caché del contexto, de modo que pares
+    idénticos comparten un único programa.
     """
-    def __init__(self, ctx: moderngl.Context, vertex_path: str, fragment_path: str):
-        # Lee ambos archivos del disco y crea el programa asociado.
+    def __init__(self, ctx: moderngl.Context, vertex_path: str, fragment_path: str,
+                 cache: Optional[ProgramCache] = None,
+                 vertex_source: Optional[str] = None,
+                 fragment_source: Optional[str] = None):
+        # Lee ambos archivos del disco (salvo código ya generado) y crea el programa.
         self.ctx = ctx
         self.vertex_path = Path(vertex_path)
         self.fragment_path = Path(fragment_path)
 
-        if not self.vertex_path.exists():
+        if vertex_source is None and not self.vertex_path.exists():
             raise FileNotFoundError(f"Vertex shader no encontrado: {self.vertex_path}")
-        if not self.fragment_path.exists():
+        if fragment_source is None and not self.fragment_path.exists():
             raise FileNotFoundError(f"Fragment shader no encontrado: {self.fragment_path}")
 
-        vertex_src = self.vertex_path.read_text(encoding="utf-8")
-        fragment_src = self.fragment_path.read_text(encoding="utf-8")
-        self.program = self.ctx.program(
-            vertex_shader=vertex_src,
-            fragment_shader=fragment_src
-        )
+        if vertex_source is None:
+            vertex_source = self.vertex_path.read_text(encoding="utf-8")
+        if fragment_source is None:
+            fragment_source = self.fragment_path.read_text(encoding="utf-8")
+        vertex_source = resolve_includes(vertex_source, self.vertex_path)
+        fragment_source = resolve_includes(fragment_source, self.fragment_path)
+        self.cache = cache or ProgramCache.for_context(ctx)
+        self.key, self.program = self.cache.acquire(vertex_source, fragment_source)
+
+    def release(self) -> None:
+        # Devuelve la referencia del programa a la caché.
+        if self.program is not None:
+            self.cache.release(self.key)
+            self.program = None
+
+    def bind_uniform_block(self, name: str, binding: int) -> bool:
+        # Asocia un bloque uniform del programa a un punto de enlace global.
+        """Enlaza el bloque si el programa lo declara; devuelve si existía."""
+        if name not in self.program:
+            return False
+        self.program[name].binding = binding
+        return True
+
+    def bind_sampler(self, name: str, unit: int) -> bool:
+        # Fija la unidad de textura de un sampler del programa.
+        """Igual que bind_uniform_block: devuelve si el programa lo declara."""
+        if name not in self.program:
+            return False
+        self.program[name].value = unit
+        return True
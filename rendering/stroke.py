@@ -0,0 +1,115 @@
+import numpy as np
+import moderngl
+from typing import Optional
+from ..core.geometry import Polyline
+from ..core.models import Material
+from .renderer import CAMERA_BLOCK_BINDING, CAMERA_BLOCK_NAME
+from .shader import ProgramCache, ShaderWrapper
+
+STROKE_UNITS = ("pixels", "world")
+_POINT_BYTES = 12
+
+# Quad por segmento: (extremo 0/1, lado -1/+1) en orden de TRIANGLE_STRIP.
+_SEGMENT_QUAD = np.array([[0.0, -1.0], [0.0, 1.0], [1.0, -1.0], [1.0, 1.0]], dtype='f4')
+
+
+def centerline(vertices: np.ndarray) -> np.ndarray:
+    # Puntos (n, 3) float32 contiguos; los vértices 2D se completan con z=0.
+    points = np.asarray(vertices, dtype=np.float32)
+    points = points.reshape(-1, points.shape[-1] if points.ndim > 1 else 3)
+    if points.shape[1] == 3:
+        return np.ascontiguousarray(points)
+    padded = np.zeros((len(points), 3), dtype=np.float32)
+    padded[:, :min(points.shape[1], 3)] = points[:, :3]
+    return padded
+
+
+# Capa que dibuja el trazo de cualquier Polyline expandiéndolo en GPU.
+class StrokeLayer:
+    """
+    Solo se sube la línea central de cada Polyline. Cada segmento es una
+    instancia de un quad compartido que lee sus dos extremos del mismo VBO
+    (dos atributos con el mismo stride y 12 bytes de desfase); el vertex
+    shader lo ensancha y el fragment shader lo recorta a una cápsula, lo que
+    da uniones y extremos redondeados. El ancho (``material.stroke_width``,
+    en píxeles o en unidades del mundo según ``units``) y el color
+    (``material.stroke_color``) son uniforms: cambiarlos o hacer zoom no
+    cuesta CPU ni vuelve a subir geometría.
+    """
+    def __init__(self, ctx: moderngl.Context, polylines=(), units: str = "pixels",
+                 cache: Optional[ProgramCache] = None):
+        if units not in STROKE_UNITS:
+            raise ValueError(f"Unidades de trazo desconocidas: {units!r} (use {', '.join(STROKE_UNITS)})")
+        self.ctx = ctx
+        self.units = units
+        self.shader = ShaderWrapper(
+            ctx,
+            "shaders/stroke/vertex.glsl",
+            "shaders/stroke/fragment.glsl",
+            cache=cache,
+        )
+        self.shader.bind_uniform_block(CAMERA_BLOCK_NAME, CAMERA_BLOCK_BINDING)
+        program = self.shader.program
+        self._p0 = program["in_p0"].location
+        self._p1 = program["in_p1"].location
+        self.quad_vbo = ctx.buffer(_SEGMENT_QUAD.tobytes())
+        self.polylines: list[Polyline] = []
+        self.materials: list[Material] = []
+        self.vbos: list[moderngl.Buffer] = []
+        self.vaos: list[moderngl.VertexArray] = []
+        self.segments: list[int] = []
+        for polyline in polylines:
+            self.add(polyline)
+
+    def add(self, polyline: Polyline, material: Optional[Material] = None) -> int:
+        # Registra una Polyline (con su material o uno propio) y devuelve su índice.
+        points = centerline(polyline.vertices)
+        vbo = self.ctx.buffer(points)
+        vao = self.ctx.vertex_array(self.shader.program, [(self.quad_vbo, '2f', 'in_corner')])
+        self._bind_points(vao, vbo)
+        self.polylines.append(polyline)
+        self.materials.append(material or polyline.material)
+        self.vbos.append(vbo)
+        self.vaos.append(vao)
+        self.segments.append(max(len(points) - 1, 0))
+        return len(self.vaos) - 1
+
+    def _bind_points(self, vao: moderngl.VertexArray, vbo: moderngl.Buffer) -> None:
+        # Extremos de cada segmento: puntos i e i+1 del mismo buffer, por instancia.
+        vao.bind(self._p0, 'f', vbo, '3f', offset=0, stride=_POINT_BYTES, divisor=1)
+        vao.bind(self._p1, 'f', vbo, '3f', offset=_POINT_BYTES, stride=_POINT_BYTES, divisor=1)
+
+    def update(self, index: int, vertices: Optional[np.ndarray] = None) -> None:
+        # Vuelve a subir la línea central (p. ej. tras editar los vértices de la Polyline).
+        points = centerline(self.polylines[index].vertices if vertices is None else vertices)
+        vbo = self.vbos[index]
+        if points.nbytes > vbo.size:
+            vbo.orphan(points.nbytes)
+        vbo.write(points)
+        self._bind_points(self.vaos[index], vbo)
+        self.segments[index] = max(len(points) - 1, 0)
+
+    def render(self, renderer=None) -> None:
+        # Una llamada instanciada por Polyline con su ancho y color actuales.
+        program = self.shader.program
+        world = self.units == "world"
+        program["world_units"].value = world
+        if renderer is not None:
+            program["viewport"].value = tuple(float(v) for v in renderer.wnd_size)
+            if world:
+                program["view_direction"].value = tuple(float(v) for v in renderer.camera.camera_y)
+        for vao, material, segments in zip(self.vaos, self.materials, self.segments):
+            if segments == 0 or not material.stroke_width:
+                continue
+            program["stroke_width"].value = float(material.stroke_width)
+            program["color"].value = tuple(material.stroke_color)
+            vao.render(moderngl.TRIANGLE_STRIP, vertices=4, instances=segments)
+
+    def release(self) -> None:
+        for vao in self.vaos:
+            vao.release()
+        for vbo in self.vbos:
+            vbo.release()
+        self.quad_vbo.release()
+        self.shader.release()
+        self.vaos, self.vbos, self.polylines, self.materials, self.segments = [], [], [], [], []
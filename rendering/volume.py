@@ -0,0 +1,193 @@
+import numpy as np
+import moderngl
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+from ..shapes.volume import BRICK_APRON, BrickCache, BrickedVolume
+from .colormap import COLORMAP_SAMPLER, COLORMAP_UNIT
+from .renderer import CAMERA_BLOCK_BINDING, CAMERA_BLOCK_NAME
+from .shader import ProgramCache, ShaderWrapper
+
+# Memoria de GPU reservada por defecto para el atlas de bricks.
+DEFAULT_CACHE_BYTES = 256 << 20
+# Estados de la tabla de páginas (componente w).
+PAGE_MISSING, PAGE_EMPTY, PAGE_RESIDENT = 0.0, 1.0, 2.0
+
+# Cubo unidad en triángulos, caras con normal hacia fuera en sentido antihorario.
+_CUBE_FACES = [
+    (0, 2, 3, 1), (4, 5, 7, 6),  # z = 0, z = 1
+    (0, 1, 5, 4), (2, 6, 7, 3),  # y = 0, y = 1
+    (0, 4, 6, 2), (1, 3, 7, 5),  # x = 0, x = 1
+]
+
+
+def _unit_cube() -> np.ndarray:
+    # 36 vértices (x, y, z) del cubo [0, 1]^3.
+    corners = np.array([[(i >> 0) & 1, (i >> 1) & 1, (i >> 2) & 1] for i in range(8)], dtype='f4')
+    order = [index for a, b, c, d in _CUBE_FACES for index in (a, b, c, a, c, d)]
+    return corners[order]
+
+
+def atlas_layout(slots: int, padded: int, max_texture: int) -> tuple[int, int, int]:
+    # Ranuras por eje (x, y, z) del atlas para al menos `slots` bricks, si caben.
+    per_axis = max(max_texture // padded, 1)
+    side = min(int(np.ceil(slots ** (1.0 / 3.0))), per_axis)
+    depth = min(-(-slots // (side * side)), per_axis)
+    return side, side, max(depth, 1)
+
+
+# Capa de volumen fuera de núcleo: bricks visibles en un atlas 3D y ray marching.
+class VolumeLayer:
+    """
+    Solo se suben los bricks que intersecan el frustum, de cerca a lejos: un
+    hilo los lee del memmap y normaliza, y el hilo de GL sube como mucho
+    ``bricks_per_frame`` por frame a un atlas 3D de ``cache_bytes`` (LRU,
+    ver BrickCache). Una tabla de páginas 3D indica al shader dónde está
+    cada brick; los que aún no llegaron o son vacíos (máximo que no supera
+    ``threshold``) se cruzan de un salto, y el rayo se corta al llegar a
+    opacidad ~1. Mientras llegan bricks la imagen se completa sola, sin
+    bloquear el frame. El color sale de la LUT activa del Renderer
+    (``Renderer.set_colormap``); la opacidad crece desde ``threshold``.
+    """
+    def __init__(self, ctx: moderngl.Context, volume: BrickedVolume,
+                 cache_bytes: int = DEFAULT_CACHE_BYTES, threshold: float = 0.1, density: float = 0.5,
+                 step: float = 0.5, bricks_per_frame: int = 32,
+                 workers: Optional[int] = None, cache: Optional[ProgramCache] = None):
+        self.ctx = ctx
+        self.volume = volume
+        self.density = float(density)
+        self.step = float(step)
+        self.bricks_per_frame = int(bricks_per_frame)
+        self.shader = ShaderWrapper(
+            ctx,
+            "shaders/volume/vertex.glsl",
+            "shaders/volume/fragment.glsl",
+            cache=cache,
+        )
+        self.shader.bind_uniform_block(CAMERA_BLOCK_NAME, CAMERA_BLOCK_BINDING)
+        self.shader.bind_sampler(COLORMAP_SAMPLER, COLORMAP_UNIT)
+        program = self.shader.program
+        self.cube_vbo = ctx.buffer(_unit_cube())
+        self.vao = ctx.vertex_array(program, [(self.cube_vbo, '3f', 'in_corner')])
+
+        padded = volume.padded_size
+        wanted = min(max(int(cache_bytes) // (padded ** 3 * 2), 1), volume.count)
+        self.layout = atlas_layout(wanted, padded, ctx.info["GL_MAX_3D_TEXTURE_SIZE"])
+        self.bricks = BrickCache(int(np.prod(self.layout)))
+        self.atlas = ctx.texture3d(tuple(n * padded for n in self.layout), 1, dtype='f2')
+        self.atlas.repeat_x = self.atlas.repeat_y = self.atlas.repeat_z = False
+        grid_xyz = volume.grid[::-1]
+        self.pages = np.zeros((volume.count, 4), dtype=np.float32)
+        self.page_table = ctx.texture3d(grid_xyz, 4, self.pages, dtype='f4')
+        self.page_table.filter = (moderngl.NEAREST, moderngl.NEAREST)
+        self._pages_dirty = False
+
+        self.reader = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="volume-reader")
+        self._reads: dict[int, Future] = {}
+        self.frame = 0
+        self._threshold = 0.0
+        self.threshold = threshold
+        self.stats = {"visible": 0, "resident": 0, "uploaded": 0, "pending": 0}
+
+        program["atlas"].value = 0
+        program["page_table"].value = 1
+        program["box_min"].value = tuple(float(v) for v in volume.aabb[0])
+        program["box_size"].value = tuple(float(v) for v in volume.aabb[1] - volume.aabb[0])
+        program["voxel_size"].value = tuple(float(v) for v in volume.voxel_size)
+        program["volume_size"].value = tuple(float(n) for n in volume.shape[::-1])
+        program["brick_size"].value = float(volume.brick_size)
+        program["brick_apron"].value = float(BRICK_APRON)
+        program["grid"].value = grid_xyz
+        program["atlas_size"].value = tuple(float(n) for n in self.atlas.size)
+
+    @property
+    def threshold(self) -> float:
+        return self._threshold
+
+    @threshold.setter
+    def threshold(self, value: float) -> None:
+        # Los bricks descartados como vacíos pueden dejar de serlo al bajar el umbral.
+        self._threshold = float(value)
+        revived = (self.pages[:, 3] == PAGE_EMPTY) & ~(self.volume.brick_max <= self._threshold)
+        if revived.any():
+            self.pages[revived] = PAGE_MISSING
+            self._pages_dirty = True
+
+    def stream(self, camera) -> None:
+        # Pide al lector los bricks visibles que faltan y sube los ya leídos.
+        self.frame += 1
+        visible = self.volume.visible_bricks(camera.frustum_planes, camera.position, self._threshold)
+        missing = [brick for brick in visible.tolist() if self.bricks.touch(brick, self.frame) is None]
+
+        uploaded = 0
+        for brick, future in list(self._reads.items()):
+            if uploaded >= self.bricks_per_frame:
+                break
+            if not future.done():
+                continue
+            del self._reads[brick]
+            if self._store(brick, future.result()):
+                uploaded += 1
+
+        for brick in missing:
+            if len(self._reads) >= 2 * self.bricks_per_frame:
+                break
+            if brick not in self._reads and self.pages[brick, 3] == PAGE_MISSING:
+                self._reads[brick] = self.reader.submit(self.volume.read_brick, brick)
+
+        if self._pages_dirty:
+            self.page_table.write(self.pages)
+            self._pages_dirty = False
+        self.stats = {"visible": len(visible), "resident": len(self.bricks),
+                      "uploaded": uploaded, "pending": len(self._reads)}
+
+    def _store(self, brick: int, block: np.ndarray) -> bool:
+        # Sube un brick leído a su ranura; los vacíos solo se marcan en la tabla.
+        if self.volume.brick_max[brick] <= self._threshold:
+            self.pages[brick] = (0.0, 0.0, 0.0, PAGE_EMPTY)
+            self._pages_dirty = True
+            return False
+        placed = self.bricks.insert(brick, self.frame)
+        if placed is None:
+            return False
+        slot, evicted = placed
+        if evicted is not None:
+            self.pages[evicted] = PAGE_MISSING
+        nx, ny, _ = self.layout
+        x, y, z = slot % nx, (slot // nx) % ny, slot // (nx * ny)
+        padded = self.volume.padded_size
+        self.atlas.write(block, viewport=(x * padded, y * padded, z * padded, padded, padded, padded))
+        self.pages[brick] = (x, y, z, PAGE_RESIDENT)
+        self._pages_dirty = True
+        return True
+
+    def render(self, renderer=None) -> None:
+        # Caras traseras de la caja con mezcla premultiplicada sobre lo ya dibujado.
+        """Sin renderer se dibujan los bricks residentes con la última cámara usada."""
+        program = self.shader.program
+        if renderer is not None:
+            camera = renderer.camera
+            self.stream(camera)
+            projection = np.asarray(camera.projection_matrix)
+            program["orthographic"].value = bool(np.allclose(projection[3], (0.0, 0.0, 0.0, 1.0)))
+            program["eye"].value = tuple(float(v) for v in camera.position)
+            program["view_direction"].value = tuple(float(v) for v in camera.camera_y)
+        program["threshold"].value = self._threshold
+        program["density"].value = self.density
+        program["step_voxels"].value = self.step
+        self.atlas.use(0)
+        self.page_table.use(1)
+        ctx = self.ctx
+        ctx.enable(moderngl.BLEND | moderngl.CULL_FACE)
+        ctx.blend_func = moderngl.ONE, moderngl.ONE_MINUS_SRC_ALPHA
+        # Caras traseras: la caja se sigue viendo con la cámara dentro del volumen.
+        ctx.cull_face = "front"
+        self.vao.render(moderngl.TRIANGLES)
+        ctx.cull_face = "back"
+        ctx.blend_func = moderngl.DEFAULT_BLENDING
+        ctx.disable(moderngl.BLEND | moderngl.CULL_FACE)
+
+    def release(self) -> None:
+        self.reader.shutdown(wait=True, cancel_futures=True)
+        self._reads = {}
+        for resource in (self.vao, self.cube_vbo, self.atlas, self.page_table, self.shader):
+            resource.release()
@@ -0,0 +1,20 @@
+#ifndef PYXION_SCENE_GLSL
+#define PYXION_SCENE_GLSL
+
+// Matrices de mundo del grafo de escena (ver rendering/scene.py): cuatro
+// texels RGBA32F por matriz, una columna por texel. El hueco 0 es la
+// identidad: los meshes sin nodo (world_slot = 0, valor por defecto) no se mueven.
+uniform sampler2D world_matrices;
+
+mat4 world_matrix(int slot) {
+    int width = textureSize(world_matrices, 0).x;
+    ivec2 texel = ivec2((slot * 4) % width, (slot * 4) / width);
+    return mat4(
+        texelFetch(world_matrices, texel, 0),
+        texelFetch(world_matrices, texel + ivec2(1, 0), 0),
+        texelFetch(world_matrices, texel + ivec2(2, 0), 0),
+        texelFetch(world_matrices, texel + ivec2(3, 0), 0)
+    );
+}
+
+#endif
@@ -0,0 +1,26 @@
+#version 330 core
+
+in vec3 in_pos;
+in uint in_instance;
+layout(std140) uniform CameraBlock {
+    mat4 camera_matrix;
+};
+#include "shaders/common/scene.glsl"
+
+// Un texel por instancia con el hueco de su matriz de mundo.
+uniform sampler2D instance_data;
+
+int instance_slot() {
+    int index = int(in_instance);
+    int width = textureSize(instance_data, 0).x;
+    return int(texelFetch(instance_data, ivec2(index % width, index / width), 0).r);
+}
+
+// y de la curva [-1, 1] -> [0, 1] para la LUT.
+out float v_value;
+
+void main() {
+    v_value = in_pos.y * 0.5 + 0.5;
+    mat4 world = world_matrix(instance_slot());
+    gl_Position = camera_matrix * world * vec4(in_pos, 1.0);
+}
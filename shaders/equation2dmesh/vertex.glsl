@@ -1,8 +1,18 @@
 #version 330 core
 
 in vec3 in_pos;
-uniform mat4 camera_matrix;
+layout(std140) uniform CameraBlock {
+    mat4 camera_matrix;
+};
+#include "shaders/common/scene.glsl"
+
+// Hueco de la matriz de mundo de este mesh (0: identidad).
+uniform int world_slot;
+
+// y de la curva [-1, 1] -> [0, 1] para la LUT.
+out float v_value;
 
 void main() {
-    gl_Position = camera_matrix * vec4(in_pos, 1.0);
+    v_value = in_pos.y * 0.5 + 0.5;
+    gl_Position = camera_matrix * world_matrix(world_slot) * vec4(in_pos, 1.0);
 }
@@ -0,0 +1,25 @@
+#version 330 core
+
+in vec3 in_pos;
+in uint in_instance;
+layout(std140) uniform CameraBlock {
+    mat4 camera_matrix;
+};
+#include "shaders/common/scene.glsl"
+
+// Un texel por instancia con el hueco de su matriz de mundo.
+uniform sampler2D instance_data;
+
+out float v_value;
+
+int instance_slot() {
+    int index = int(in_instance);
+    int width = textureSize(instance_data, 0).x;
+    return int(texelFetch(instance_data, ivec2(index % width, index / width), 0).r);
+}
+
+void main() {
+    v_value = in_pos.z * 0.5 + 0.5;
+    mat4 world = world_matrix(instance_slot());
+    gl_Position = camera_matrix * world * vec4(in_pos, 1.0);
+}
@@ -1,9 +1,11 @@
 #version 330 core
 
-// Fragment shader with uniform color and a subtle animation
-in vec3 v_uv;
+// Color por valor normalizado (altura en [0, 1]) leído de la LUT activa.
+uniform sampler2D colormap;
+
+in float v_value;
 out vec4 fragColor;
 
 void main() {
-    fragColor = vec4(1.0, 1.0, 1.0, 1.0);
+    fragColor = vec4(texture(colormap, vec2(clamp(v_value, 0.0, 1.0), 0.5)).rgb, 1.0);
 }
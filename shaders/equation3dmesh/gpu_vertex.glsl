@@ -0,0 +1,29 @@
+#version 330 core
+
+in vec2 in_xy;
+layout(std140) uniform CameraBlock {
+    mat4 camera_matrix;
+};
+#include "shaders/common/scene.glsl"
+
+// Hueco de la matriz de mundo de este mesh (0: identidad).
+uniform int world_slot;
+
+uniform float time;
+uniform float z_min;
+uniform float z_max;
+uniform float z_span;
+
+out float v_value;
+
+// Cuerpo generado a partir de la expresión (ver shapes/expression.py)
+float equation(float x, float y, float t) {
+    return /* EQUATION */;
+}
+
+void main() {
+    float z = equation(in_xy.x, in_xy.y, time);
+    float z_normalized = (z - 0.5 * (z_min + z_max)) / (0.5 * z_span);
+    v_value = z_normalized * 0.5 + 0.5;
+    gl_Position = camera_matrix * world_matrix(world_slot) * vec4(in_xy, z_normalized, 1.0);
+}
@@ -1,8 +1,38 @@
 #version 330 core
 
+layout(std140) uniform CameraBlock {
+    mat4 camera_matrix;
+};
+#include "shaders/common/scene.glsl"
+
+// Hueco de la matriz de mundo de este mesh (0: identidad).
+uniform int world_slot;
+
+#if defined(HEIGHTFIELD)
+// Solo z por vértice: XY se reconstruye del índice en la rejilla regular [-1, 1]².
+uniform ivec2 grid_size;  // (columnas, filas)
+in float in_height;       // z normalizado, o cuantizado en [0, 65535] con HEIGHT16
+#else
 in vec3 in_pos;
-uniform mat4 camera_matrix;
+#endif
+
+// z normalizado [-1, 1] -> [0, 1] para la LUT.
+out float v_value;
 
 void main() {
-    gl_Position = camera_matrix * vec4(in_pos, 1.0);
+#if defined(HEIGHTFIELD)
+    ivec2 cell = ivec2(gl_VertexID % grid_size.x, gl_VertexID / grid_size.x);
+    vec2 xy = vec2(cell) / vec2(max(grid_size - 1, ivec2(1))) * 2.0 - 1.0;
+#if defined(HEIGHT16)
+    // Equivale a z_min + h * z_span seguido de la normalización habitual.
+    float z = in_height / 65535.0 * 2.0 - 1.0;
+#else
+    float z = in_height;
+#endif
+    v_value = z * 0.5 + 0.5;
+    gl_Position = camera_matrix * world_matrix(world_slot) * vec4(xy, z, 1.0);
+#else
+    v_value = in_pos.z * 0.5 + 0.5;
+    gl_Position = camera_matrix * world_matrix(world_slot) * vec4(in_pos, 1.0);
+#endif
 }
@@ -0,0 +1,26 @@
+#version 330 core
+
+layout(std140) uniform CameraBlock {
+    mat4 camera_matrix;
+};
+
+// Tile de LodSurface: XY se reconstruye del índice; el anillo exterior es la falda.
+uniform vec2 tile_origin;  // esquina mínima (x, y) del tile
+uniform vec2 cell_size;    // tamaño de celda del nivel dibujado
+uniform int tile_points;   // vértices por lado, falda incluida
+uniform vec4 skirt_depth;  // hundimiento de la falda por lado: y-, y+, x-, x+
+
+layout(location = 0) in float in_height;
+
+out float v_value;
+
+void main() {
+    ivec2 node = ivec2(gl_VertexID % tile_points, gl_VertexID / tile_points);
+    // La falda repite la XY del borde: se desplaza un nodo y se recorta.
+    vec2 cell = vec2(clamp(node - 1, ivec2(0), ivec2(tile_points - 3)));
+    int last = tile_points - 1;
+    float sink = max(max(node.y == 0 ? skirt_depth.x : 0.0, node.y == last ? skirt_depth.y : 0.0),
+                     max(node.x == 0 ? skirt_depth.z : 0.0, node.x == last ? skirt_depth.w : 0.0));
+    v_value = in_height * 0.5 + 0.5;
+    gl_Position = camera_matrix * vec4(tile_origin + cell * cell_size, in_height - sink, 1.0);
+}
@@ -2,11 +2,17 @@
 
 layout(location = 0) in vec3 in_pos;
 
-uniform mat4 camera_matrix;
+layout(std140) uniform CameraBlock {
+    mat4 camera_matrix;
+};
+#include "shaders/common/scene.glsl"
+
+// Hueco de la matriz de mundo de este mesh (0: identidad).
+uniform int world_slot;
 
 out vec2 frag_pos;
 
 void main() {
     frag_pos = in_pos.xy;
-    gl_Position = camera_matrix * vec4(in_pos, 1.0);
+    gl_Position = camera_matrix * world_matrix(world_slot) * vec4(in_pos, 1.0);
 }
\ No newline at end of file
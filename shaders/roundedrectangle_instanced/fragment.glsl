@@ -0,0 +1,29 @@
+#version 330 core
+
+in vec2 frag_pos; // Coordenadas del fragmento en espacio local
+flat in vec2 v_dimensions; // Dimensiones del rectángulo (ancho, alto)
+flat in float v_radius; // Radio de redondeo en las esquinas
+flat in vec4 v_color; // Color del rectángulo (RGBA)
+
+out vec4 FragColor;
+
+void main() {
+    vec2 abs_pos = abs(frag_pos);
+    vec2 rect_half_size = v_dimensions * 0.5;
+
+    // Distancia desde el fragmento hasta la zona donde comienza el redondeo
+    vec2 corner_dist = abs_pos - (rect_half_size - v_radius);
+
+    // Zona plana: color directo
+    if (corner_dist.x < 0.0 || corner_dist.y < 0.0) {
+        FragColor = v_color;
+        return;
+    }
+
+    // Distancia al círculo de la esquina con suavizado en el borde
+    float dist = length(corner_dist) - v_radius;
+    float alpha = 1.0 - smoothstep(-0.01, 0.01, dist);
+    if (alpha < 0.01) discard;
+
+    FragColor = vec4(v_color.rgb, v_color.a * alpha);
+}
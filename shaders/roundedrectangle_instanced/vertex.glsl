@@ -0,0 +1,27 @@
+#version 330 core
+
+layout(location = 0) in vec2 in_corner; // Esquina del quad unitario [-0.5, 0.5]
+
+// Atributos por instancia
+in vec2 in_center;
+in vec2 in_size;
+in float in_radius;
+in vec4 in_color;
+in float in_z;
+
+layout(std140) uniform CameraBlock {
+    mat4 camera_matrix;
+};
+
+out vec2 frag_pos;
+flat out vec2 v_dimensions;
+flat out float v_radius;
+flat out vec4 v_color;
+
+void main() {
+    frag_pos = in_corner * in_size;
+    v_dimensions = in_size;
+    v_radius = in_radius;
+    v_color = in_color;
+    gl_Position = camera_matrix * vec4(in_center + frag_pos, in_z, 1.0);
+}
@@ -0,0 +1,19 @@
+#version 330 core
+
+layout(std140) uniform CameraBlock {
+    mat4 camera_matrix;
+};
+
+// Dos vértices (mín, máx) por bloque del nivel; x se deriva del índice del vértice.
+uniform int first_vertex;  // primer vértice dibujado dentro del anillo
+uniform float x_first;     // x del primer bloque dibujado
+uniform float x_step;      // separación en x entre bloques
+uniform vec2 y_transform;  // (escala, desplazamiento) aplicados al valor
+
+layout(location = 0) in float in_value;
+
+void main() {
+    float x = x_first + float((gl_VertexID - first_vertex) / 2) * x_step;
+    float y = in_value * y_transform.x + y_transform.y;
+    gl_Position = camera_matrix * vec4(x, y, 0.0, 1.0);
+}
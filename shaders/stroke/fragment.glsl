@@ -0,0 +1,19 @@
+#version 330 core
+
+uniform vec4 color;
+uniform bool world_units;
+
+noperspective in vec2 v_screen;
+in vec2 v_world;
+flat in float v_length;
+out vec4 fragColor;
+
+void main() {
+    vec2 local = world_units ? v_world : v_screen;
+    // Distancia al eje del segmento (en medias anchuras): cápsula de radio 1.
+    float along = local.x < 0.0 ? local.x : max(local.x - v_length, 0.0);
+    if (dot(vec2(along, local.y), vec2(along, local.y)) > 1.0) {
+        discard;
+    }
+    fragColor = color;
+}
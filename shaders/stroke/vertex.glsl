@@ -0,0 +1,55 @@
+#version 330 core
+
+layout(std140) uniform CameraBlock {
+    mat4 camera_matrix;
+};
+
+// Una instancia por segmento (p0 -> p1); el quad se alarga media anchura por
+// cada extremo y el fragment shader lo recorta a una cápsula: uniones y
+// extremos redondeados sin geometría extra.
+uniform vec2 viewport;         // tamaño del viewport en píxeles
+uniform float stroke_width;    // en píxeles o en unidades del mundo
+uniform bool world_units;
+uniform vec3 view_direction;   // dirección de la cámara (modo mundo)
+
+layout(location = 0) in vec2 in_corner;  // (extremo 0/1, lado -1/+1)
+in vec3 in_p0;
+in vec3 in_p1;
+
+noperspective out vec2 v_screen;  // coordenadas locales en medias anchuras (modo píxeles)
+out vec2 v_world;                 // ídem, interpoladas en perspectiva (modo mundo)
+flat out float v_length;          // largo del segmento en medias anchuras
+
+void main() {
+    float hw = 0.5 * stroke_width;
+    bool tail = in_corner.x < 0.5;
+    float side = in_corner.y;
+    v_screen = vec2(0.0);
+    v_world = vec2(0.0);
+    if (world_units) {
+        vec3 d = in_p1 - in_p0;
+        float len = length(d);
+        vec3 dir = len > 0.0 ? d / len : vec3(1.0, 0.0, 0.0);
+        vec3 n = cross(dir, view_direction);
+        n = length(n) > 1e-6 ? normalize(n) : vec3(-dir.y, dir.x, 0.0);
+        vec3 pos = (tail ? in_p0 - dir * hw : in_p1 + dir * hw) + n * side * hw;
+        v_world = vec2(tail ? -1.0 : len / hw + 1.0, side);
+        v_length = len / hw;
+        gl_Position = camera_matrix * vec4(pos, 1.0);
+    } else {
+        vec4 c0 = camera_matrix * vec4(in_p0, 1.0);
+        vec4 c1 = camera_matrix * vec4(in_p1, 1.0);
+        vec2 half_viewport = 0.5 * viewport;
+        vec2 s0 = c0.xy / c0.w * half_viewport;
+        vec2 s1 = c1.xy / c1.w * half_viewport;
+        vec2 d = s1 - s0;
+        float len = length(d);
+        vec2 dir = len > 0.0 ? d / len : vec2(1.0, 0.0);
+        vec2 n = vec2(-dir.y, dir.x);
+        vec4 clip = tail ? c0 : c1;
+        vec2 screen = (tail ? s0 - dir * hw : s1 + dir * hw) + n * side * hw;
+        v_screen = vec2(tail ? -1.0 : len / hw + 1.0, side);
+        v_length = len / hw;
+        gl_Position = vec4(screen / half_viewport * clip.w, clip.z, clip.w);
+    }
+}
@@ -0,0 +1,80 @@
+#version 330 core
+
+// Ray marching por bricks: la tabla de páginas dice, por brick, si está
+// residente (w = 2, xyz = ranura en el atlas), vacío (w = 1) o sin cargar
+// (w = 0). Los dos últimos se saltan enteros (empty-space skipping).
+uniform sampler3D atlas;
+uniform sampler3D page_table;
+uniform sampler2D colormap;  // LUT activa del Renderer
+
+uniform vec3 eye;
+uniform bool orthographic;
+uniform vec3 view_direction;
+uniform vec3 box_min;
+uniform vec3 voxel_size;    // tamaño del vóxel en el mundo (x, y, z)
+uniform vec3 volume_size;   // vóxeles por eje (x, y, z)
+uniform float brick_size;   // vóxeles por lado de brick, sin margen
+uniform float brick_apron;  // vóxeles de margen por lado en el atlas (BRICK_APRON)
+uniform ivec3 grid;         // bricks por eje
+uniform vec3 atlas_size;    // texels del atlas
+uniform float step_voxels;  // paso del rayo en vóxeles
+uniform float threshold;    // valores por debajo son transparentes
+uniform float density;
+
+in vec3 v_world;
+out vec4 fragColor;
+
+const int MAX_STEPS = 4096;
+
+void main() {
+    vec3 dir = orthographic ? normalize(view_direction) : normalize(v_world - eye);
+    // En ortográfica el rayo nace detrás de la caja, sobre la misma recta.
+    vec3 origin = orthographic ? v_world - dir * 4.0 * length(volume_size * voxel_size) : eye;
+
+    // Rayo en espacio de vóxel; t se mide en unidades del mundo.
+    vec3 o = (origin - box_min) / voxel_size;
+    vec3 d = dir / voxel_size;
+    vec3 inv = 1.0 / mix(d, vec3(1e-12), equal(d, vec3(0.0)));
+    vec3 ta = -o * inv;
+    vec3 tb = (volume_size - o) * inv;
+    vec3 tmin = min(ta, tb);
+    vec3 tmax = max(ta, tb);
+    float t_near = max(max(tmin.x, tmin.y), max(tmin.z, 0.0));
+    float t_far = min(min(tmax.x, tmax.y), tmax.z);
+    if (t_near >= t_far) {
+        discard;
+    }
+
+    float dt = step_voxels / length(d);
+    float t = t_near + 0.5 * dt;
+    vec4 acc = vec4(0.0);
+    for (int i = 0; i < MAX_STEPS && t < t_far; ++i) {
+        vec3 p = o + d * t;
+        ivec3 b = clamp(ivec3(floor(p / brick_size)), ivec3(0), grid - 1);
+        vec4 page = texelFetch(page_table, b, 0);
+        if (page.w < 1.5) {
+            // Salto hasta la salida del brick, sin perder la alineación de las muestras.
+            vec3 lo = vec3(b) * brick_size;
+            vec3 exit = max((lo - o) * inv, (lo + brick_size - o) * inv);
+            float t_exit = min(min(exit.x, exit.y), exit.z);
+            t = max(t_near + (ceil((t_exit - t_near) / dt - 0.5) + 0.5) * dt, t + dt);
+            continue;
+        }
+        vec3 local = p - vec3(b) * brick_size + brick_apron;
+        float value = texture(atlas, (page.xyz * (brick_size + 2.0 * brick_apron) + local) / atlas_size).r;
+        vec4 color = texture(colormap, vec2(value, 0.5));
+        float alpha = clamp((value - threshold) / max(1.0 - threshold, 1e-6), 0.0, 1.0) * density * color.a;
+        // Corrección de opacidad por tamaño de paso (referencia: paso de un vóxel).
+        alpha = 1.0 - pow(1.0 - min(alpha, 0.999), step_voxels);
+        acc.rgb += (1.0 - acc.a) * alpha * color.rgb;
+        acc.a += (1.0 - acc.a) * alpha;
+        if (acc.a > 0.99) {
+            break;  // terminación temprana del rayo
+        }
+        t += dt;
+    }
+    if (acc.a <= 0.0) {
+        discard;
+    }
+    fragColor = acc;
+}
@@ -0,0 +1,18 @@
+#version 330 core
+
+layout(std140) uniform CameraBlock {
+    mat4 camera_matrix;
+};
+
+// Caja del volumen: se dibujan sus caras traseras y cada fragmento lanza un rayo.
+uniform vec3 box_min;
+uniform vec3 box_size;
+
+layout(location = 0) in vec3 in_corner;  // vértice del cubo unidad
+
+out vec3 v_world;
+
+void main() {
+    v_world = box_min + in_corner * box_size;
+    gl_Position = camera_matrix * vec4(v_world, 1.0);
+}
@@ -0,0 +1,237 @@
+import logging
+from typing import Callable
+
+import numpy as np
+
+from .grid import index_dtype
+
+logger = logging.getLogger(__name__)
+
+# Desviación tolerada (fracción del rango de z) entre una celda y su refinamiento.
+DEFAULT_TOLERANCE = 2e-3
+DEFAULT_MIN_DEPTH = 3
+DEFAULT_MAX_DEPTH = 8
+
+# Puntos de la plantilla de una celda, en mitades de su lado: 4 esquinas,
+# 4 puntos medios de arista (abajo, derecha, arriba, izquierda) y el centro.
+_CORNERS = np.array([[0, 0], [2, 0], [2, 2], [0, 2]])
+_MIDPOINTS = np.array([[1, 0], [2, 1], [1, 2], [0, 1]])
+_CENTER = np.array([[1, 1]])
+
+
+# Muestras de la función sobre la rejilla diádica más fina, evaluadas bajo demanda.
+class _Lattice:
+    """
+    Guarda solo los puntos evaluados (ids ordenados ``j * (size + 1) + i``),
+    así que la memoria crece con las muestras y no con ``4**max_depth``.
+    """
+    def __init__(self, equation_func: Callable, max_depth: int):
+        self.func = equation_func
+        self.size = 1 << max_depth
+        self.keys = np.empty(0, dtype=np.int64)
+        self.values = np.empty(0, dtype=np.float64)
+        self.calls = 0
+        self.samples = 0
+
+    def coords(self, i: np.ndarray) -> np.ndarray:
+        # Índice de la rejilla -> coordenada en [-1, 1].
+        return i * (2.0 / self.size) - 1.0
+
+    def ids(self, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+        return np.asarray(j, dtype=np.int64) * (self.size + 1) + np.asarray(i, dtype=np.int64)
+
+    def _contains(self, ids: np.ndarray) -> np.ndarray:
+        pos = np.minimum(np.searchsorted(self.keys, ids), max(len(self.keys) - 1, 0))
+        return (self.keys[pos] == ids) if len(self.keys) else np.zeros(ids.shape, dtype=bool)
+
+    def ensure(self, i: np.ndarray, j: np.ndarray) -> None:
+        # Evalúa en una sola llamada vectorizada los puntos aún desconocidos.
+        ids = np.unique(self.ids(i, j))
+        missing = ids[~self._contains(ids)]
+        if not len(missing):
+            return
+        jj, ii = np.divmod(missing, self.size + 1)
+        z = np.asarray(self.func(self.coords(ii), self.coords(jj)), dtype=np.float64)
+        keys = np.concatenate((self.keys, missing))
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        self.values = np.concatenate((self.values, np.broadcast_to(z, missing.shape)))[order]
+        self.calls += 1
+        self.samples += len(missing)
+
+    def lookup(self, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+        # Valores ya evaluados en los puntos (i, j).
+        return self.values[np.searchsorted(self.keys, self.ids(i, j))]
+
+
+def _stencil(i0, j0, size, offsets):
+    # Coordenadas (celdas, puntos) de la plantilla indicada para cada celda.
+    # Las esquinas son exactas para cualquier tamaño; medios y centro requieren size >= 2.
+    size = size[:, None]
+    return i0[:, None] + offsets[None, :, 0] * size // 2, j0[:, None] + offsets[None, :, 1] * size // 2
+
+
+def _cell_error(lattice: _Lattice, i0, j0, size) -> np.ndarray:
+    # Máxima desviación de los puntos medios y el centro respecto a la interpolación lineal.
+    """Equivale a la mitad de las segundas diferencias de la celda en x, y y diagonales."""
+    stencil = np.concatenate((_CORNERS, _MIDPOINTS, _CENTER))
+    si, sj = _stencil(i0, j0, size, stencil)
+    lattice.ensure(si, sj)
+    z = lattice.lookup(si, sj)
+    c, m, center = z[:, 0:4], z[:, 4:8], z[:, 8]
+    edges = np.abs(m - 0.5 * (c + np.roll(c, -1, axis=1)))
+    diagonals = np.abs(np.stack((center - 0.5 * (c[:, 0] + c[:, 2]),
+                                 center - 0.5 * (c[:, 1] + c[:, 3])), axis=1))
+    return np.maximum(edges.max(axis=1), diagonals.max(axis=1))
+
+
+def _split(i0, j0, size, mask):
+    # Sustituye las celdas marcadas por sus cuatro hijas (al final de los arrays).
+    half = size[mask] // 2
+    ci = np.concatenate([i0[mask] + dx * half for dx in (0, 1, 0, 1)])
+    cj = np.concatenate([j0[mask] + dy * half for dy in (0, 0, 1, 1)])
+    keep = ~mask
+    return (np.concatenate((i0[keep], ci)), np.concatenate((j0[keep], cj)),
+            np.concatenate((size[keep], np.tile(half, 4))))
+
+
+def _leaf_at(i: np.ndarray, j: np.ndarray, i0, j0, depth, max_depth: int) -> np.ndarray:
+    # Índice de la hoja que contiene cada celda fina (i, j); -1 fuera del dominio.
+    n = 1 << max_depth
+    found = np.full(i.shape, -1, dtype=np.int64)
+    inside = (i >= 0) & (j >= 0) & (i < n) & (j < n)
+    for d in np.unique(depth).tolist():
+        members = np.flatnonzero(depth == d)
+        shift = max_depth - d
+        codes = (j0[members] >> shift) * (1 << d) + (i0[members] >> shift)
+        order = np.argsort(codes)
+        codes = codes[order]
+        query = (j[inside] >> shift) * (1 << d) + (i[inside] >> shift)
+        pos = np.minimum(np.searchsorted(codes, query), len(codes) - 1)
+        hit = codes[pos] == query
+        target = found[inside]
+        target[hit] = members[order[pos[hit]]]
+        found[inside] = target
+    return found
+
+
+def _balance(i0, j0, size, max_depth: int):
+    # Refina hasta que ningún par de hojas vecinas difiera en más de un nivel (2:1).
+    """
+    Con el árbol equilibrado cada arista tiene como mucho un vértice colgante.
+    Para cada hoja basta mirar una celda al otro lado de cada arista: si la
+    vecina es más gruesa, esa hoja cubre la arista completa.
+    """
+    offsets = ((-1, 0), (0, -1), (1, 0), (0, 1))
+    while True:
+        depth = max_depth - np.log2(size).astype(np.int64)
+        deep = depth >= 2
+        i, j, s, d = i0[deep], j0[deep], size[deep], depth[deep]
+        mask = np.zeros(size.shape, dtype=bool)
+        for dx, dy in offsets:
+            # Celda fina adyacente a la arista (izquierda, abajo, derecha, arriba).
+            ci = i - 1 if dx < 0 else (i + s if dx > 0 else i)
+            cj = j - 1 if dy < 0 else (j + s if dy > 0 else j)
+            neighbour = _leaf_at(ci, cj, i0, j0, depth, max_depth)
+            valid = neighbour >= 0
+            coarse = np.zeros(neighbour.shape, dtype=bool)
+            coarse[valid] = depth[neighbour[valid]] < d[valid] - 1
+            mask[neighbour[coarse]] = True
+        if not mask.any():
+            return i0, j0, size
+        i0, j0, size = _split(i0, j0, size, mask)
+
+
+def _triangulate(lattice: _Lattice, i0, j0, size):
+    # Triángulos (ids de rejilla) estancos: abanico desde el centro si hay vértices colgantes.
+    corners = lattice.ids(*_stencil(i0, j0, size, _CORNERS))
+    mids = lattice.ids(*_stencil(i0, j0, size, _MIDPOINTS))
+    # Un punto medio es colgante si es esquina de alguna hoja vecina más fina.
+    hanging = (size[:, None] >= 2) & np.isin(mids, corners)
+
+    plain = ~hanging.any(axis=1)
+    tris = [
+        np.stack((corners[plain, 0], corners[plain, 1], corners[plain, 2]), axis=1),
+        np.stack((corners[plain, 0], corners[plain, 2], corners[plain, 3]), axis=1),
+    ]
+    fan = ~plain
+    if fan.any():
+        ci, cj = _stencil(i0[fan], j0[fan], size[fan], _CENTER)
+        lattice.ensure(ci, cj)
+        center = lattice.ids(ci, cj)[:, 0]
+        c, m, h = corners[fan], mids[fan], hanging[fan]
+        for edge in range(4):
+            a, b = c[:, edge], c[:, (edge + 1) % 4]
+            split = h[:, edge]
+            tris.append(np.stack((center[~split], a[~split], b[~split]), axis=1))
+            tris.append(np.stack((center[split], a[split], m[split, edge]), axis=1))
+            tris.append(np.stack((center[split], m[split, edge], b[split]), axis=1))
+    return np.concatenate(tris)
+
+
+def adaptive_tessellation(equation_func: Callable,
+                          tolerance: float = DEFAULT_TOLERANCE,
+                          min_depth: int = DEFAULT_MIN_DEPTH,
+                          max_depth: int = DEFAULT_MAX_DEPTH) -> tuple[np.ndarray, np.ndarray, dict]:
+    # Malla indexada de z=f(x,y) sobre [-1,1]² refinando un quadtree donde la curvatura lo pide.
+    """
+    Parte de una rejilla uniforme de ``2**min_depth`` celdas por lado y, nivel
+    a nivel, subdivide las celdas cuya desviación respecto a la interpolación
+    lineal (segundas diferencias) supera ``tolerance`` veces el rango de z
+    visto hasta el momento. Todas las muestras nuevas de un nivel se evalúan
+    en una única llamada vectorizada. El árbol se equilibra 2:1 y las celdas
+    con vértices colgantes se triangulan en abanico, así que la malla no tiene
+    grietas. Devuelve ``(vertices, indices, meta)`` con z normalizado a
+    [-1, 1] como Equation3dMesh; ``meta`` incluye z_min/z_max/z_span, las
+    llamadas a la función y el número de muestras.
+    """
+    if not 0 <= min_depth <= max_depth:
+        raise ValueError(f"Profundidades inválidas: min_depth={min_depth}, max_depth={max_depth}")
+    lattice = _Lattice(equation_func, max_depth)
+    step = 1 << (max_depth - min_depth)
+    grid = np.arange(0, lattice.size, step)
+    i0, j0 = (a.ravel() for a in np.meshgrid(grid, grid))
+    size = np.full(i0.shape, step)
+
+    # Solo se evalúan las celdas nuevas de cada nivel; las demás ya son hojas.
+    fresh = size > 1
+    while fresh.any():
+        error = np.zeros(size.shape)
+        error[fresh] = _cell_error(lattice, i0[fresh], j0[fresh], size[fresh])
+        span = float(lattice.values.max() - lattice.values.min()) or 1.0
+        refine = fresh & (error > tolerance * span)
+        if not refine.any():
+            break
+        kept = int((~refine).sum())
+        i0, j0, size = _split(i0, j0, size, refine)
+        fresh = np.zeros(size.shape, dtype=bool)
+        fresh[kept:] = size[kept:] > 1
+
+    i0, j0, size = _balance(i0, j0, size, max_depth)
+    triangles = _triangulate(lattice, i0, j0, size)
+
+    # Compacta los ids de rejilla usados a índices de vértice consecutivos.
+    used, inverse = np.unique(triangles, return_inverse=True)
+    jj, ii = np.divmod(used, lattice.size + 1)
+    # Las hojas creadas al equilibrar pueden tener esquinas aún sin evaluar.
+    lattice.ensure(ii, jj)
+    z = lattice.lookup(ii, jj)
+    z_min, z_max = float(z.min()), float(z.max())
+    center, half_span = (z_min + z_max) / 2.0, (z_max - z_min) / 2.0
+    vertices = np.empty((len(used), 3), dtype=np.float32)
+    vertices[:, 0] = lattice.coords(ii)
+    vertices[:, 1] = lattice.coords(jj)
+    vertices[:, 2] = 0.0 if half_span == 0.0 else (z - center) / half_span
+    indices = inverse.reshape(-1).astype(index_dtype(len(used)))
+    z_span = z_max - z_min
+    meta = {
+        "z_min": z_min,
+        "z_max": z_max,
+        "z_span": z_span if z_span != 0.0 else 1.0,
+        "calls": lattice.calls,
+        "samples": lattice.samples,
+        "leaves": len(size),
+    }
+    logger.debug("adaptive_tessellation: %d hojas, %d vértices, %d muestras en %d llamadas",
+                 len(size), len(used), lattice.samples, lattice.calls)
+    return vertices, indices, meta
@@ -1,79 +1,302 @@
 import numpy as np
-import moderngl
 import logging
-from ..core.geometry import Mesh
-from ..core.models import Material, RenderProperties
+from functools import lru_cache
+from pathlib import Path
+from ..core.geometry import Mesh, Polyline, compute_bounds
+from ..core.mesh_cache import MeshCache, cache_key as mesh_cache_key
+from ..core.models import GL_LINES, GL_TRIANGLES, GL_TRIANGLE_STRIP, Material, RenderProperties
+from .adaptive import DEFAULT_MAX_DEPTH, DEFAULT_MIN_DEPTH, DEFAULT_TOLERANCE, adaptive_tessellation
+from .expression import Expression
+from .grid import RESTART_INDEX, evaluate_grid, grid_indices
 
 logger = logging.getLogger(__name__)
 
+# Versión del generador de vértices: súbala si cambia el resultado de
+# generate_vertices para invalidar las entradas de MeshCache existentes.
+GENERATOR_VERSION = 1
+
+# Almacenamiento de vértices: xyz completo, solo z (float32) o z cuantizado a 16 bits.
+STORAGE_LAYOUTS = {
+    "xyz": ('3f', 'in_pos'),
+    "height": ('1f', 'in_height'),
+    "height16": ('1u2', 'in_height'),
+}
+_STORAGE_DEFINES = {
+    "xyz": (),
+    "height": ("HEIGHTFIELD",),
+    "height16": ("HEIGHTFIELD", "HEIGHT16"),
+}
+HEIGHT16_LEVELS = 65535
+
+# Modo GL de cada topología de índices de la rejilla.
+TOPOLOGY_MODES = {
+    "triangles": GL_TRIANGLES,
+    "strip": GL_TRIANGLE_STRIP,
+    "lines": GL_LINES,
+}
+
+
+def with_defines(source: str, defines) -> str:
+    # Inserta #define tras la línea #version de un shader.
+    if not defines:
+        return source
+    version, _, body = source.partition("\n")
+    return "\n".join([version, *(f"#define {name}" for name in defines), body])
+
+
+def quantize_heights(z: np.ndarray) -> np.ndarray:
+    # z normalizado [-1, 1] -> uint16 [0, 65535] (error máximo 1/65535 del rango).
+    levels = (np.clip(z, -1.0, 1.0) + 1.0) * (0.5 * HEIGHT16_LEVELS)
+    return np.rint(levels).astype(np.uint16)
+
+
 # Superficie parametrizada que evalúa una ecuación z=f(x,y).
 class Equation3dMesh(Mesh):
-    def __init__(self, material: Material, equation_func: callable, rows: int, cols: int):
+    storage = "xyz"
+    topology = "triangles"
+
+    def __init__(self, material: Material, equation_func: callable, rows: int, cols: int,
+                 workers: int | None = None, executor: str = "thread", storage: str = "xyz",
+                 topology: str = "triangles", cache: MeshCache | None = None,
+                 cache_key: str | None = None):
         # Discretiza la ecuación y construye buffers y shaders apropiados.
-        self.vertices, z_meta = self.generate_vertices(equation_func, rows, cols)
+        """
+        Con ``cache`` los vértices y el rango de z se leen de disco (memoria
+        mapeada) si la misma ecuación y resolución ya se generaron; la
+        identidad es el código fuente de la función o ``cache_key``.
+        ``storage="height"`` sube solo z (4 bytes por vértice) y
+        ``"height16"`` z cuantizado a uint16 (2 bytes); en ambos el vertex
+        shader reconstruye XY a partir de ``gl_VertexID``.
+        ``topology`` elige triángulos, tiras (~3x menos índices) o aristas
+        para wireframe; los índices se comparten
+        entre todos los meshes con la misma forma de rejilla.
+        """
+        if storage not in STORAGE_LAYOUTS:
+            raise ValueError(f"Almacenamiento desconocido: {storage!r} (use {', '.join(STORAGE_LAYOUTS)})")
+        if topology not in TOPOLOGY_MODES:
+            raise ValueError(f"Topología desconocida: {topology!r} (use {', '.join(TOPOLOGY_MODES)})")
+        self.storage = storage
+        self.topology = topology
+        self.vertex_layout = STORAGE_LAYOUTS[storage]
+        self.grid_shape = (rows, cols)
+        if cache is not None:
+            key = mesh_cache_key("Equation3dMesh", equation_func, {"rows": rows, "cols": cols},
+                                 key=cache_key, version=GENERATOR_VERSION)
+            arrays, z_meta = cache.get_or_create(key, lambda: self._generate_entry(
+                equation_func, rows, cols, workers, executor))
+            self.vertices, aabb = arrays["vertices"], arrays["aabb"]
+        else:
+            self.vertices, z_meta = self.generate_vertices(equation_func, rows, cols, workers=workers, executor=executor)
+            aabb = None
         self.indices = self.generate_indices(rows, cols)
+        uniforms = [
+            {"name": "z_min", "value": z_meta["z_min"]},
+            {"name": "z_max", "value": z_meta["z_max"]},
+            {"name": "z_span", "value": z_meta["z_span"]},
+        ]
+        heightfield = storage != "xyz"
+        if heightfield:
+            uniforms.append({"name": "grid_size", "value": (cols, rows)})
         self.render_properties = RenderProperties(
             vertex_shader_path="shaders/equation3dmesh/vertex.glsl",
+            vertex_shader_source=self.vertex_source(storage) if heightfield else None,
+            fragment_shader_path="shaders/equation3dmesh/fragment.glsl",
+            # El batch empaqueta xyz completo; los heightfields se dibujan por separado.
+            batch_vertex_shader_path=None if heightfield else "shaders/equation3dmesh/batch_vertex.glsl",
+            gl_mode=TOPOLOGY_MODES[topology],
+            uniforms=uniforms,
+        )
+        super().__init__(self.vertices, self.indices, material, self.render_properties, aabb=aabb, copy=False)
+        self.index_key = ("grid", rows, cols, topology)
+        if topology == "strip" and self.indices.dtype == np.uint32:
+            self.restart_index = RESTART_INDEX
+
+    @staticmethod
+    def vertex_source(storage: str) -> str:
+        # vertex.glsl con los #define del modo de almacenamiento.
+        return with_defines(_load_template("shaders/equation3dmesh/vertex.glsl"), _STORAGE_DEFINES[storage])
+
+    @property
+    def vertex_data(self) -> np.ndarray:
+        # Filas que se suben al VBO según el modo de almacenamiento.
+        if self.storage == "height":
+            return self.vertices[:, 2:3]
+        if self.storage == "height16":
+            return quantize_heights(self.vertices[:, 2])[:, None]
+        return self.vertices
+
+    @property
+    def vertex_buffer(self) -> bytes:
+        if self.storage == "xyz":
+            return super().vertex_buffer
+        return np.ascontiguousarray(self.vertex_data).tobytes()
+
+    def generate_vertices(self, equation_func: callable, rows: int, cols: int,
+                          workers: int | None = None, executor: str = "thread"):
+        # Evalúa la función en una malla regular para obtener (x,y,z).
+        # Por bandas de filas: sin meshgrid completo ni copias del tamaño de la salida.
+        vertices, z_meta = evaluate_grid(equation_func, rows, cols, workers=workers, executor=executor)
+        logger.debug(
+            "Equation3dMesh: rango Z normalizado (min=%s, max=%s, span=%s)",
+            z_meta["z_min"],
+            z_meta["z_max"],
+            z_meta["z_span"],
+        )
+        return vertices, z_meta
+
+    def _generate_entry(self, equation_func: callable, rows: int, cols: int, workers, executor):
+        # Entrada de MeshCache: vértices y su caja (evita recorrerlos al cargar);
+        # los índices no se guardan, salen de grid_indices.
+        vertices, z_meta = self.generate_vertices(equation_func, rows, cols, workers=workers, executor=executor)
+        return {"vertices": vertices, "aabb": compute_bounds(vertices)}, z_meta
+    
+    def generate_indices(self, rows: int, cols: int):
+        # Índices de la rejilla según la topología (compartidos, de solo lectura).
+        return grid_indices(rows, cols, self.topology)
+
+    def wireframe_indices(self) -> np.ndarray:
+        # Aristas de la rejilla (pares para LINES), p. ej. para trazos.
+        return grid_indices(*self.grid_shape, "lines")
+
+
+@lru_cache(maxsize=None)
+def _load_template(path: str) -> str:
+    # Plantillas GLSL leídas una sola vez por proceso.
+    return Path(path).read_text(encoding="utf-8")
+
+
+# Superficie z=f(x,y,t) evaluada en el vertex shader a partir de una expresión.
+class GpuEquation3dMesh(Equation3dMesh):
+    """
+    Variante animable de Equation3dMesh: la expresión se compila a GLSL y z se
+    calcula en GPU sobre una rejilla XY estática, así que avanzar ``time`` no
+    regenera ni vuelve a subir geometría.
+    """
+    vertex_layout = ('2f', 'in_xy')
+    TEMPLATE_PATH = "shaders/equation3dmesh/gpu_vertex.glsl"
+
+    def __init__(self, material: Material, expression: str | Expression, rows: int, cols: int,
+                 z_range: tuple[float, float] | None = None, time: float = 0.0):
+        # Evalúa una vez en CPU (instantánea de referencia y rango de z) y genera el shader.
+        self.expression = expression if isinstance(expression, Expression) else Expression(expression)
+        self.vertices, z_meta = self.generate_vertices(lambda x, y: self.expression(x, y, time), rows, cols)
+        if z_range is not None:
+            # Rango fijo (p. ej. el de toda la animación) en lugar del de t=time.
+            z_min, z_max = float(z_range[0]), float(z_range[1])
+            z_meta = {"z_min": z_min, "z_max": z_max, "z_span": (z_max - z_min) or 1.0}
+        self.z_meta = z_meta
+        self.vertices[:, 2] = self.evaluate(time)
+        self.indices = self.generate_indices(rows, cols)
+        vertex_source = _load_template(self.TEMPLATE_PATH).replace("/* EQUATION */", self.expression.glsl)
+        self.render_properties = RenderProperties(
+            vertex_shader_path=self.TEMPLATE_PATH,
+            vertex_shader_source=vertex_source,
             fragment_shader_path="shaders/equation3dmesh/fragment.glsl",
-            gl_mode=moderngl.TRIANGLES,
+            gl_mode=GL_TRIANGLES,
             uniforms=[
                 {"name": "z_min", "value": z_meta["z_min"]},
                 {"name": "z_max", "value": z_meta["z_max"]},
                 {"name": "z_span", "value": z_meta["z_span"]},
             ],
         )
-        super().__init__(self.vertices, self.indices, material, self.render_properties)
+        Mesh.__init__(self, self.vertices, self.indices, material, self.render_properties, copy=False)
+        self.grid_shape = (rows, cols)
+        self.index_key = ("grid", rows, cols, self.topology)
+        # Sin rango fijo, z puede salir de la caja de t=time al animarse.
+        self.cullable = z_range is not None
 
-    def generate_vertices(self, equation_func: callable, rows: int, cols: int):
-        # Evalúa la función en una malla regular para obtener (x,y,z).
-        x = np.linspace(-1, 1, cols)
-        y = np.linspace(-1, 1, rows)
-        X, Y = np.meshgrid(x, y)
-        Z = equation_func(X, Y).astype(np.float32)
-        z_min = float(np.min(Z))
-        z_max = float(np.max(Z))
-        z_span = z_max - z_min
-        if z_span == 0.0:
-            normalized_z = np.zeros_like(Z, dtype=np.float32)
+    def update_bounds(self) -> None:
+        # Con rango fijo, z normalizado queda en [-1, 1] durante toda la animación.
+        super().update_bounds()
+        self.aabb[0, 2] = min(self.aabb[0, 2], -1.0)
+        self.aabb[1, 2] = max(self.aabb[1, 2], 1.0)
+        center = self.aabb.mean(axis=0)
+        self.bounding_sphere = (center, float(np.linalg.norm(self.aabb[1] - self.aabb[0])) * 0.5)
+
+    def evaluate(self, time: float) -> np.ndarray:
+        # Ruta de referencia en NumPy: z normalizado igual que en el shader.
+        """z normalizado (float32) de cada vértice en el instante ``time``."""
+        z = self.expression(self.vertices[:, 0], self.vertices[:, 1], time)
+        center = 0.5 * (self.z_meta["z_min"] + self.z_meta["z_max"])
+        return ((z - center) / (0.5 * self.z_meta["z_span"])).astype(np.float32)
+
+    @property
+    def vertex_data(self) -> np.ndarray:
+        # Solo la rejilla XY: z se evalúa en el vertex shader.
+        return self.vertices[:, :2]
+
+    @property
+    def vertex_buffer(self) -> bytes:
+        return np.ascontiguousarray(self.vertex_data, dtype='f4').tobytes()
+
+
+# Superficie z=f(x,y) teselada con un quadtree que se refina según la curvatura.
+class AdaptiveEquation3dMesh(Mesh):
+    """
+    Misma superficie y shaders que Equation3dMesh, pero con vértices solo donde
+    las segundas diferencias de la función superan ``tolerance`` (fracción del
+    rango de z): las zonas planas quedan con celdas grandes y los detalles
+    finos se resuelven hasta ``2**max_depth`` celdas por lado.
+    """
+    def __init__(self, material: Material, equation_func: callable,
+                 tolerance: float = DEFAULT_TOLERANCE, min_depth: int = DEFAULT_MIN_DEPTH,
+                 max_depth: int = DEFAULT_MAX_DEPTH, cache: MeshCache | None = None,
+                 cache_key: str | None = None):
+        params = {"tolerance": tolerance, "min_depth": min_depth, "max_depth": max_depth}
+        if cache is not None:
+            key = mesh_cache_key("AdaptiveEquation3dMesh", equation_func, params,
+                                 key=cache_key, version=GENERATOR_VERSION)
+            arrays, z_meta = cache.get_or_create(key, lambda: self._generate_entry(equation_func, params))
+            self.vertices, self.indices, aabb = arrays["vertices"], arrays["indices"], arrays["aabb"]
         else:
-            z_center = (z_min + z_max) / 2.0
-            normalized_z = ((Z - z_center) / (z_span / 2.0)).astype(np.float32)
-        logger.debug(
-            "Equation3dMesh: rango Z normalizado (min=%s, max=%s, span=%s)",
-            z_min,
-            z_max,
-            z_span,
+            self.vertices, self.indices, z_meta = adaptive_tessellation(equation_func, **params)
+            aabb = None
+        self.z_meta = z_meta
+        self.render_properties = RenderProperties(
+            vertex_shader_path="shaders/equation3dmesh/vertex.glsl",
+            fragment_shader_path="shaders/equation3dmesh/fragment.glsl",
+            batch_vertex_shader_path="shaders/equation3dmesh/batch_vertex.glsl",
+            gl_mode=GL_TRIANGLES,
+            uniforms=[
+                {"name": "z_min", "value": z_meta["z_min"]},
+                {"name": "z_max", "value": z_meta["z_max"]},
+                {"name": "z_span", "value": z_meta["z_span"]},
+            ],
         )
-        vertices = np.column_stack((X.flatten(), Y.flatten(), normalized_z.flatten())).astype('f4')
-        return vertices, {"z_min": z_min, "z_max": z_max, "z_span": z_span if z_span != 0.0 else 1.0}
-    
-    def generate_indices(self, rows: int, cols: int):
-        # Construye dos triángulos por celda de la malla regular.
-        indices = np.arange(rows * cols, dtype='i4').reshape((rows, cols))
-        t1 = indices[:-1, :-1].ravel()
-        quad_index = np.column_stack((
-            t1,
-            t1 + 1,
-            t1 + cols,
-            t1 + cols + 1,
-            t1 + cols,
-            t1 + 1
-        )).ravel()
-        return quad_index
+        super().__init__(self.vertices, self.indices, material, self.render_properties, aabb=aabb, copy=False)
+
+    @staticmethod
+    def _generate_entry(equation_func: callable, params: dict):
+        # Entrada de MeshCache: vértices, índices y caja de la teselación.
+        vertices, indices, z_meta = adaptive_tessellation(equation_func, **params)
+        return {"vertices": vertices, "indices": indices, "aabb": compute_bounds(vertices)}, z_meta
 
 
 # Cinta 2D extruida a partir de una función y=f(x).
 class Equation2dMesh(Mesh):
-    def __init__(self, material, equation_func, segments: int):
+    def __init__(self, material, equation_func, segments: int,
+                 cache: MeshCache | None = None, cache_key: str | None = None):
         # Genera segmentos a lo largo de la curva y arma un TRIANGLE_STRIP.
-        self.vertices = self.generate_vertices(equation_func, segments)
-        self.indices = np.arange(len(self.vertices), dtype='i4')
+        if cache is not None:
+            key = mesh_cache_key("Equation2dMesh", equation_func, {"segments": segments},
+                                 key=cache_key, version=GENERATOR_VERSION)
+            arrays, _ = cache.get_or_create(key, lambda: self._generate_entry(equation_func, segments))
+            self.vertices, self.indices = arrays["vertices"], arrays["indices"]
+        else:
+            self.vertices = self.generate_vertices(equation_func, segments)
+            self.indices = np.arange(len(self.vertices), dtype='i4')
         self.render_properties = RenderProperties(
             vertex_shader_path="shaders/equation2dmesh/vertex.glsl",
             fragment_shader_path="shaders/equation2dmesh/fragment.glsl",
-            gl_mode=moderngl.TRIANGLE_STRIP
+            batch_vertex_shader_path="shaders/equation2dmesh/batch_vertex.glsl",
+            gl_mode=GL_TRIANGLE_STRIP
         )
-        super().__init__(self.vertices, self.indices, material, self.render_properties)
+        super().__init__(self.vertices, self.indices, material, self.render_properties, copy=False)
+
+    def _generate_entry(self, equation_func, segments: int):
+        # Entrada de MeshCache con vértices e índices de la cinta.
+        vertices = self.generate_vertices(equation_func, segments)
+        return {"vertices": vertices, "indices": np.arange(len(vertices), dtype='i4')}, {}
 
     def generate_vertices(self, equation_func, segments: int):
         # Calcula normales laterales para dar grosor a la curva plot.
@@ -94,3 +317,21 @@ class Equation2dMesh(Mesh):
 
         vertices = np.column_stack([up_vertices, down_vertices]).astype('f4')
         return vertices.reshape(-1, 3)
+
+
+# Curva y=f(x) como línea central, para dibujarla con StrokeLayer.
+class Equation2dLine(Polyline):
+    """
+    A diferencia de Equation2dMesh no extruye la curva en CPU: el grosor sale
+    de ``material.stroke_width`` y se aplica en el vertex shader. No es un
+    modelo del Renderer (no tiene índices): se pasa a ``StrokeLayer``.
+    """
+    def __init__(self, material: Material, equation_func: callable, segments: int):
+        x = np.linspace(-1, 1, segments + 1)
+        vertices = np.column_stack((x, equation_func(x), np.zeros_like(x))).astype('f4')
+        self.render_properties = RenderProperties(
+            vertex_shader_path="shaders/stroke/vertex.glsl",
+            fragment_shader_path="shaders/stroke/fragment.glsl",
+            gl_mode=GL_TRIANGLE_STRIP,
+        )
+        super().__init__(vertices, material, self.render_properties, copy=False)
@@ -0,0 +1,105 @@
+import ast
+import numpy as np
+
+# Variables admitidas en las expresiones z = f(x, y, t).
+VARIABLES = ("x", "y", "t")
+CONSTANTS = {"pi": np.pi, "e": np.e}
+
+# Funciones permitidas: nombre -> (GLSL, NumPy, aridad).
+FUNCTIONS = {
+    "sin": ("sin", np.sin, 1),
+    "cos": ("cos", np.cos, 1),
+    "tan": ("tan", np.tan, 1),
+    "asin": ("asin", np.arcsin, 1),
+    "acos": ("acos", np.arccos, 1),
+    "atan": ("atan", np.arctan, 1),
+    "atan2": ("atan", np.arctan2, 2),
+    "sinh": ("sinh", np.sinh, 1),
+    "cosh": ("cosh", np.cosh, 1),
+    "tanh": ("tanh", np.tanh, 1),
+    "sqrt": ("sqrt", np.sqrt, 1),
+    "exp": ("exp", np.exp, 1),
+    "log": ("log", np.log, 1),
+    "abs": ("abs", np.abs, 1),
+    "floor": ("floor", np.floor, 1),
+    "sign": ("sign", np.sign, 1),
+    "min": ("min", np.minimum, 2),
+    "max": ("max", np.maximum, 2),
+    "pow": ("pow", np.power, 2),
+}
+
+_BINARY_OPS = {ast.Add: "+", ast.Sub: "-", ast.Mult: "*", ast.Div: "/"}
+
+
+def _glsl_float(value: float) -> str:
+    # Literal float válido en GLSL (siempre con punto decimal o exponente).
+    if not np.isfinite(value):
+        raise ValueError(f"Constante no finita en la expresión: {value}")
+    text = repr(float(value))
+    return text if any(c in text for c in ".e") else text + ".0"
+
+
+# Expresión z=f(x,y,t) validada una vez y traducida a GLSL y a NumPy.
+class Expression:
+    """
+    Analiza una expresión con ``ast`` y admite solo variables, constantes,
+    operadores aritméticos y funciones de la lista blanca. El mismo árbol
+    genera el código GLSL y el evaluador NumPy de referencia.
+    """
+    def __init__(self, source: str):
+        self.source = source.strip()
+        try:
+            tree = ast.parse(self.source, mode="eval")
+        except SyntaxError as exc:
+            raise ValueError(f"Expresión inválida: {self.source!r}") from exc
+        self.tree = tree.body
+        self.glsl = self._to_glsl(self.tree)
+        self._code = compile(tree, "<expression>", "eval")
+        self._namespace = {name: impl for name, (_, impl, _) in FUNCTIONS.items()}
+        self._namespace.update(CONSTANTS)
+        self._namespace["__builtins__"] = {}
+
+    def _to_glsl(self, node: ast.AST) -> str:
+        # Traducción recursiva nodo a nodo; cualquier otro nodo se rechaza.
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+            return _glsl_float(node.value)
+        if isinstance(node, ast.Name):
+            if node.id in VARIABLES:
+                return node.id
+            if node.id in CONSTANTS:
+                return _glsl_float(CONSTANTS[node.id])
+            raise ValueError(f"Nombre no permitido en la expresión: {node.id}")
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+            sign = "-" if isinstance(node.op, ast.USub) else "+"
+            return f"({sign}{self._to_glsl(node.operand)})"
+        if isinstance(node, ast.BinOp):
+            left = self._to_glsl(node.left)
+            right = self._to_glsl(node.right)
+            if isinstance(node.op, ast.Pow):
+                # Potencias enteras pequeñas como productos: pow() no admite bases negativas.
+                exponent = node.right
+                if isinstance(exponent, ast.Constant) and exponent.value in (2, 3):
+                    return "(" + "*".join([f"({left})"] * int(exponent.value)) + ")"
+                return f"pow({left}, {right})"
+            op = _BINARY_OPS.get(type(node.op))
+            if op is None:
+                raise ValueError(f"Operador no permitido: {type(node.op).__name__}")
+            return f"({left} {op} {right})"
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and not node.keywords:
+            spec = FUNCTIONS.get(node.func.id)
+            if spec is None:
+                raise ValueError(f"Función no permitida: {node.func.id}")
+            glsl_name, _, arity = spec
+            if len(node.args) != arity:
+                raise ValueError(f"{node.func.id} espera {arity} argumento(s)")
+            return f"{glsl_name}({', '.join(self._to_glsl(arg) for arg in node.args)})"
+        raise ValueError(f"Construcción no permitida en la expresión: {ast.dump(node)}")
+
+    def __call__(self, x, y, t=0.0) -> np.ndarray:
+        # Evaluación vectorizada con NumPy (ruta de referencia en CPU).
+        namespace = dict(self._namespace, x=x, y=y, t=t)
+        result = eval(self._code, namespace)
+        return np.broadcast_to(np.asarray(result, dtype=np.float64), np.broadcast(x, y).shape)
+
+    def __repr__(self) -> str:
+        return f"Expression({self.source!r})"
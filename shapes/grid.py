@@ -0,0 +1,231 @@
+import logging
+import mmap
+import os
+import weakref
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Callable, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Memoria aproximada de temporales float64 por banda (X, Y, z y los de la función).
+DEFAULT_BAND_BYTES = 32 * 1024 * 1024
+_TEMPORARIES_PER_SAMPLE = 6
+
+# Trabajo compartido con los procesos hijos (heredado por fork, no serializado).
+_FORK_STATE: Optional[tuple] = None
+
+
+def band_rows_for(cols: int, band_bytes: int = DEFAULT_BAND_BYTES) -> int:
+    # Filas por banda para que los temporales de una banda quepan en band_bytes.
+    return max(1, int(band_bytes) // (max(int(cols), 1) * 8 * _TEMPORARIES_PER_SAMPLE))
+
+
+def allocate_vertices(count: int, shared: bool = False) -> np.ndarray:
+    # Arreglo (count, 3) float32 de salida; compartido entre procesos si shared.
+    """
+    Con ``shared=True`` la memoria es un mmap anónimo compartido: los procesos
+    creados con fork escriben directamente en él y sigue vivo mientras el
+    arreglo exista.
+    """
+    if not shared:
+        return np.empty((count, 3), dtype=np.float32)
+    buffer = mmap.mmap(-1, max(count * 3 * 4, 1))
+    return np.frombuffer(buffer, dtype=np.float32, count=count * 3).reshape(count, 3)
+
+
+def _band_view(out: np.ndarray, cols: int, start: int, stop: int) -> np.ndarray:
+    # Vista (filas, cols, 3) de las filas [start, stop) de la rejilla, sin copia.
+    return out[start * cols:stop * cols].reshape(stop - start, cols, 3)
+
+
+def _evaluate_band(func, out, x, y, start, stop) -> tuple[float, float]:
+    # Pasada 1: escribe x, y y z sin normalizar de una banda; devuelve su min/max.
+    cols = len(x)
+    X, Y = np.meshgrid(x, y[start:stop])
+    band = _band_view(out, cols, start, stop)
+    band[..., 0] = x
+    band[..., 1] = y[start:stop, None]
+    band[..., 2] = func(X, Y)
+    z = band[..., 2]
+    return float(z.min()), float(z.max())
+
+
+def _normalize_band(out, cols, start, stop, center, half_span) -> None:
+    # Pasada 2: normaliza z a [-1, 1] en el propio arreglo de salida.
+    z = _band_view(out, cols, start, stop)[..., 2]
+    if half_span == 0.0:
+        z[...] = 0.0
+    else:
+        z -= center
+        z /= half_span
+
+
+def _fork_evaluate(start: int, stop: int) -> tuple[float, float]:
+    func, out, x, y = _FORK_STATE
+    return _evaluate_band(func, out, x, y, start, stop)
+
+
+def _fork_normalize(start: int, stop: int, center: float, half_span: float) -> None:
+    _, out, x, _ = _FORK_STATE
+    _normalize_band(out, len(x), start, stop, center, half_span)
+
+
+def _fork_available() -> bool:
+    import multiprocessing
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+def _make_executor(kind: str, workers: int) -> Executor:
+    # Pool de hilos (NumPy libera el GIL) o de procesos por fork.
+    if kind == "thread":
+        return ThreadPoolExecutor(max_workers=workers)
+    if kind == "process":
+        # multiprocessing solo se importa si se piden procesos (arranque rápido).
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork"))
+    raise ValueError(f"Ejecutor desconocido: {kind!r} (use 'thread' o 'process')")
+
+
+def _reduce(extrema: list[tuple[float, float]]) -> tuple[float, float, float, float]:
+    # Combina los min/max por banda y deriva el centro y la semiamplitud.
+    if not extrema:
+        return 0.0, 0.0, 0.0, 0.0
+    z_min = min(low for low, _ in extrema)
+    z_max = max(high for _, high in extrema)
+    return z_min, z_max, (z_min + z_max) / 2.0, (z_max - z_min) / 2.0
+
+
+def evaluate_grid(equation_func: Callable,
+                  rows: int,
+                  cols: int,
+                  out: Optional[np.ndarray] = None,
+                  band_rows: Optional[int] = None,
+                  workers: Optional[int] = None,
+                  executor: str = "thread") -> tuple[np.ndarray, dict]:
+    # Evalúa z=f(x,y) sobre [-1,1]² por bandas de filas y normaliza z en el destino.
+    """
+    Devuelve ``(vertices, z_meta)`` con el mismo resultado que la evaluación
+    sobre la rejilla completa, pero solo con temporales del tamaño de una
+    banda: la primera pasada escribe x, y y z crudo directamente en ``out``
+    (float32, ``rows * cols`` filas) y reduce min/max; la segunda normaliza z
+    en el sitio. Con ``executor="process"`` las bandas se reparten entre
+    procesos (fork) que escriben en un ``out`` de memoria compartida.
+    """
+    global _FORK_STATE
+    rows, cols = int(rows), int(cols)
+    count = rows * cols
+    if executor == "process" and not _fork_available():
+        logger.warning("fork no disponible; la rejilla se evalúa con hilos")
+        executor = "thread"
+    if out is None:
+        out = allocate_vertices(count, shared=executor == "process")
+    if out.shape != (count, 3) or out.dtype != np.float32:
+        raise ValueError(f"Destino inválido: se esperaba ({count}, 3) float32, no {out.shape} {out.dtype}")
+
+    x = np.linspace(-1, 1, cols)
+    y = np.linspace(-1, 1, rows)
+    band_rows = band_rows or band_rows_for(cols)
+    bands = [(start, min(start + band_rows, rows)) for start in range(0, rows, band_rows)]
+    workers = min(workers or os.cpu_count() or 1, len(bands)) if bands else 1
+
+    if workers <= 1 and executor == "thread":
+        extrema = [_evaluate_band(equation_func, out, x, y, start, stop) for start, stop in bands]
+        z_min, z_max, center, half_span = _reduce(extrema)
+        for start, stop in bands:
+            _normalize_band(out, cols, start, stop, center, half_span)
+    elif executor == "process":
+        _FORK_STATE = (equation_func, out, x, y)
+        try:
+            with _make_executor(executor, workers) as pool:
+                extrema = list(pool.map(_fork_evaluate, *zip(*bands)))
+                z_min, z_max, center, half_span = _reduce(extrema)
+                starts, stops = zip(*bands)
+                list(pool.map(_fork_normalize, starts, stops,
+                              [center] * len(bands), [half_span] * len(bands)))
+        finally:
+            _FORK_STATE = None
+    else:
+        with _make_executor(executor, workers) as pool:
+            extrema = list(pool.map(lambda band: _evaluate_band(equation_func, out, x, y, *band), bands))
+            z_min, z_max, center, half_span = _reduce(extrema)
+            list(pool.map(lambda band: _normalize_band(out, cols, *band, center, half_span), bands))
+
+    z_span = z_max - z_min
+    logger.debug("evaluate_grid: %dx%d en %d bandas, %d worker(s) (%s)", rows, cols, len(bands), workers, executor)
+    return out, {"z_min": z_min, "z_max": z_max, "z_span": z_span if z_span != 0.0 else 1.0}
+
+
+
+# Topologías de índices de una rejilla regular y su modo de dibujo.
+TOPOLOGIES = ("triangles", "strip", "lines")
+# Máximo de vértices direccionables con índices uint16.
+MAX_UINT16_VERTICES = 0x10000
+# ModernGL solo reinicia primitivas con 0xFFFFFFFF: con uint16 las tiras se
+# unen con triángulos degenerados en lugar de con el índice de reinicio.
+RESTART_INDEX = 0xFFFFFFFF
+
+
+# Índices ya generados mientras algún mesh los use; al soltarlos se liberan
+# (en GPU los comparte IndexBufferCache).
+_grid_index_cache: "weakref.WeakValueDictionary[tuple, np.ndarray]" = weakref.WeakValueDictionary()
+
+
+def index_dtype(vertex_count: int) -> np.dtype:
+    # uint16 cuando todos los índices caben; si no, uint32.
+    return np.dtype(np.uint16 if vertex_count <= MAX_UINT16_VERTICES else np.uint32)
+
+
+def grid_indices(rows: int, cols: int, topology: str = "triangles") -> np.ndarray:
+    # Índices (solo lectura, compartidos) de una rejilla rows x cols.
+    """
+    - ``triangles``: dos triángulos por celda (6 índices).
+    - ``strip``: una tira por par de filas (~2 índices por celda, un tercio
+      de ``triangles``), separadas por el índice de reinicio con uint32 o por
+      dos índices degenerados con uint16.
+    - ``lines``: aristas horizontales y verticales para wireframe.
+
+    La caché es débil: dos meshes vivos con la misma rejilla comparten el
+    array, pero un array que ya nadie usa no queda retenido por la caché.
+    """
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"Topología desconocida: {topology!r} (use {', '.join(TOPOLOGIES)})")
+    key = (int(rows), int(cols), topology)
+    indices = _grid_index_cache.get(key)
+    if indices is None:
+        indices = _grid_index_cache[key] = _build_grid_indices(*key)
+    return indices
+
+
+def _build_grid_indices(rows: int, cols: int, topology: str) -> np.ndarray:
+    # Genera los índices de la topología pedida (ver grid_indices).
+    dtype = index_dtype(rows * cols)
+    grid = np.arange(rows * cols, dtype=np.int64).reshape(rows, cols)
+    if rows < 2 or cols < 2:
+        indices = np.empty(0, dtype=dtype)
+    elif topology == "triangles":
+        t1 = grid[:-1, :-1].ravel()
+        indices = np.column_stack((t1, t1 + 1, t1 + cols, t1 + cols + 1, t1 + cols, t1 + 1)).ravel()
+    elif topology == "strip":
+        # Por fila: (a0, b0, a1, b1, ...); misma diagonal que triangles.
+        body = 2 * cols
+        if dtype == np.uint32:
+            strips = np.empty((rows - 1, body + 1), dtype=np.int64)
+            strips[:, -1] = RESTART_INDEX
+        else:
+            # Puente degenerado (último b, primer a de la fila siguiente); conserva la paridad.
+            strips = np.empty((rows - 1, body + 2), dtype=np.int64)
+            strips[:, body] = grid[1:, -1]
+            strips[:, body + 1] = grid[1:, 0]
+        strips[:, 0:body:2] = grid[:-1]
+        strips[:, 1:body:2] = grid[1:]
+        indices = strips.ravel()[:-(strips.shape[1] - body)]
+    else:
+        horizontal = np.stack((grid[:, :-1], grid[:, 1:]), axis=-1).reshape(-1, 2)
+        vertical = np.stack((grid[:-1], grid[1:]), axis=-1).reshape(-1, 2)
+        indices = np.concatenate((horizontal, vertical)).ravel()
+    indices = np.ascontiguousarray(indices, dtype=dtype)
+    indices.setflags(write=False)
+    return indices
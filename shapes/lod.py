@@ -0,0 +1,181 @@
+import logging
+from typing import Callable, Optional
+
+import numpy as np
+
+from .grid import evaluate_grid
+
+logger = logging.getLogger(__name__)
+
+# Error en píxeles tolerado al elegir el nivel de cada tile.
+DEFAULT_PIXEL_ERROR = 1.0
+# Margen añadido al hundimiento de las faldas (evita grietas por redondeo).
+SKIRT_MARGIN = 1e-3
+
+
+def _upsample(coarse: np.ndarray, step: int) -> np.ndarray:
+    # Interpolación bilineal de una rejilla gruesa a la fina (paso entero).
+    """``coarse`` (R, C) -> ((R-1)*step+1, (C-1)*step+1), exacta en los nodos gruesos."""
+    t = np.arange(step, dtype=np.float32) / step
+
+    def along(a: np.ndarray) -> np.ndarray:
+        # Interpola sobre el último eje.
+        left, right = a[..., :-1, None], a[..., 1:, None]
+        inner = (left * (1 - t) + right * t).reshape(*a.shape[:-1], -1)
+        return np.concatenate((inner, a[..., -1:]), axis=-1)
+
+    return along(along(coarse).swapaxes(0, 1)).swapaxes(0, 1)
+
+
+def _tile_max(values: np.ndarray, tiles_y: int, tiles_x: int, n: int) -> np.ndarray:
+    # Máximo por tile (incluidos sus bordes) de un campo definido en los nodos.
+    """Cada celda aporta sus cuatro esquinas: así el tile cubre también su borde superior y derecho."""
+    cells = np.maximum.reduce((values[:-1, :-1], values[:-1, 1:], values[1:, :-1], values[1:, 1:]))
+    return cells.reshape(tiles_y, n, tiles_x, n).max(axis=(1, 3))
+
+
+def screen_space_error(geometric_error, distance, projection_matrix, viewport_height: int):
+    # Error geométrico (unidades del mundo) proyectado a píxeles.
+    """
+    Para la proyección en perspectiva de ``perspective_proj_matrix`` la escala
+    vertical es ``P[2, 2] = 1 / tan(fov / 2)`` y w es la profundidad; en una
+    ortográfica (w constante) el error no depende de la distancia.
+    """
+    p = np.asarray(projection_matrix, dtype=np.float64)
+    scale = 0.5 * float(viewport_height) * abs(p[2, 2])
+    if p[3, 1] == 0.0:
+        return np.asarray(geometric_error) * scale
+    return np.asarray(geometric_error) * scale / np.maximum(distance, 1e-6)
+
+
+# Superficie z=f(x,y) troceada en tiles con una pirámide de resoluciones por tile.
+class LodSurface:
+    """
+    El dominio ``extent`` se divide en ``tiles`` x ``tiles`` tiles de
+    ``tile_size`` celdas (potencia de dos). La ecuación se evalúa una vez en la
+    rejilla más fina (con la misma normalización de z que Equation3dMesh) y el
+    nivel k de cada tile toma uno de cada 2^k nodos. Cada nivel guarda su error
+    geométrico respecto a la rejilla fina y añade una falda: un anillo extra
+    de vértices que repite el borde del tile. El vertex shader lo hunde solo
+    en los lados compartidos con un vecino de otro nivel (``skirt_depths``),
+    lo justo para tapar la grieta; en el borde del dominio o entre tiles del
+    mismo nivel los bordes coinciden y la falda no se ve.
+    """
+    def __init__(self, equation_func: Callable, tiles: int, tile_size: int = 64,
+                 levels: Optional[int] = None, extent=(-1.0, 1.0, -1.0, 1.0),
+                 workers: Optional[int] = None):
+        tile_size = int(tile_size)
+        if tile_size < 1 or tile_size & (tile_size - 1):
+            raise ValueError(f"tile_size debe ser potencia de dos, no {tile_size}")
+        max_levels = tile_size.bit_length()
+        self.levels = min(int(levels), max_levels) if levels else max_levels
+        self.tiles = int(tiles)
+        self.tile_size = tile_size
+        self.extent = tuple(float(v) for v in extent)
+        x0, x1, y0, y1 = self.extent
+        points = self.tiles * tile_size + 1
+
+        def mapped(x, y):
+            # evaluate_grid recorre [-1, 1]²: se lleva al dominio pedido.
+            return equation_func(x0 + (x + 1) * 0.5 * (x1 - x0), y0 + (y + 1) * 0.5 * (y1 - y0))
+
+        vertices, self.z_meta = evaluate_grid(mapped, points, points, workers=workers)
+        # Solo z (filas = y); XY se reconstruye en el shader a partir del tile.
+        self.heights = np.ascontiguousarray(vertices[:, 2]).reshape(points, points)
+        del vertices
+        self.cell_size = ((x1 - x0) / (points - 1), (y1 - y0) / (points - 1))
+        self.errors = self._level_errors()
+        # Cota del hundimiento de cualquier falda (para las cajas de culling).
+        self.skirt_depth = float(self.errors.max()) * 2.0 + SKIRT_MARGIN
+        self.aabbs = self._tile_bounds()
+        logger.debug("LodSurface: %dx%d tiles de %d celdas, %d niveles", self.tiles, self.tiles, tile_size, self.levels)
+
+    @property
+    def tile_count(self) -> int:
+        return self.tiles * self.tiles
+
+    def level_cells(self, level: int) -> int:
+        # Celdas por lado de un tile en el nivel dado (0 = el más fino).
+        return self.tile_size >> level
+
+    def level_points(self, level: int) -> int:
+        # Vértices por lado del tile en ese nivel, incluida la falda.
+        return self.level_cells(level) + 3
+
+    def _level_errors(self) -> np.ndarray:
+        # (tiles_y, tiles_x, niveles): máx |z_fino - z_nivel| dentro de cada tile.
+        errors = np.zeros((self.tiles, self.tiles, self.levels), dtype=np.float32)
+        for level in range(1, self.levels):
+            step = 1 << level
+            approx = _upsample(self.heights[::step, ::step], step)
+            errors[..., level] = _tile_max(np.abs(self.heights - approx), self.tiles, self.tiles, self.tile_size)
+        # Monótono: un nivel más grueso nunca promete menos error que uno más fino.
+        return np.maximum.accumulate(errors, axis=-1)
+
+    def _tile_bounds(self) -> np.ndarray:
+        # Cajas (tiles_y, tiles_x, 2, 3) de cada tile en coordenadas del mundo.
+        n = self.tile_size
+        z_low = -_tile_max(-self.heights, self.tiles, self.tiles, n)
+        z_high = _tile_max(self.heights, self.tiles, self.tiles, n)
+        x0, _, y0, _ = self.extent
+        tx, ty = np.meshgrid(np.arange(self.tiles), np.arange(self.tiles))
+        width, depth = n * self.cell_size[0], n * self.cell_size[1]
+        boxes = np.empty((self.tiles, self.tiles, 2, 3), dtype=np.float32)
+        boxes[:, :, 0, 0] = x0 + tx * width
+        boxes[:, :, 1, 0] = x0 + (tx + 1) * width
+        boxes[:, :, 0, 1] = y0 + ty * depth
+        boxes[:, :, 1, 1] = y0 + (ty + 1) * depth
+        # La falda queda por debajo de la superficie.
+        boxes[:, :, 0, 2] = z_low - self.skirt_depth
+        boxes[:, :, 1, 2] = z_high
+        return boxes
+
+    def tile_origin(self, ty: int, tx: int) -> tuple[float, float]:
+        # Esquina (x, y) mínima del tile.
+        x0, _, y0, _ = self.extent
+        n = self.tile_size
+        return x0 + tx * n * self.cell_size[0], y0 + ty * n * self.cell_size[1]
+
+    def tile_heights(self, ty: int, tx: int, level: int) -> np.ndarray:
+        # Alturas (p, p) del tile en un nivel; el anillo de falda repite el borde.
+        n, step = self.tile_size, 1 << level
+        core = self.heights[ty * n:(ty + 1) * n + 1:step, tx * n:(tx + 1) * n + 1:step]
+        return np.pad(core, 1, mode="edge")
+
+    def skirt_depths(self, levels: np.ndarray) -> np.ndarray:
+        # Hundimiento de la falda por tile y lado (y-, y+, x-, x+) para los niveles dados.
+        """
+        Entre dos tiles la grieta no supera la suma de sus errores en los
+        niveles elegidos; con el mismo nivel los bordes son idénticos y en el
+        borde del dominio no hay vecino, así que ahí la falda no se hunde (una
+        falda hundida en el borde se vería como una pared desde un lado).
+        """
+        levels = np.asarray(levels)
+        error = np.take_along_axis(self.errors, levels[..., None], axis=-1)[..., 0]
+
+        def seam(a, b):
+            # Profundidad común a los dos tiles de una costura.
+            return np.where(levels[a] != levels[b], error[a] + error[b] + SKIRT_MARGIN, 0.0)
+
+        depths = np.zeros((self.tiles, self.tiles, 4), dtype=np.float32)
+        rows = seam((slice(1, None), slice(None)), (slice(None, -1), slice(None)))
+        cols = seam((slice(None), slice(1, None)), (slice(None), slice(None, -1)))
+        depths[1:, :, 0] = depths[:-1, :, 1] = rows
+        depths[:, 1:, 2] = depths[:, :-1, 3] = cols
+        return depths
+
+    def level_heights(self, level: int) -> np.ndarray:
+        # Alturas de todos los tiles de un nivel, contiguas por tile (para un VBO).
+        return np.stack([self.tile_heights(ty, tx, level)
+                         for ty in range(self.tiles) for tx in range(self.tiles)]).astype(np.float32)
+
+    def select_levels(self, position, projection_matrix, viewport_height: int,
+                      pixel_error: float = DEFAULT_PIXEL_ERROR) -> np.ndarray:
+        # Nivel más grueso de cada tile cuyo error en pantalla no supera pixel_error.
+        """Devuelve (tiles_y, tiles_x) con el nivel elegido según la distancia a la cámara."""
+        lo, hi = self.aabbs[..., 0, :], self.aabbs[..., 1, :]
+        position = np.asarray(position, dtype=np.float32)
+        distance = np.linalg.norm(position - np.clip(position, lo, hi), axis=-1)
+        pixels = screen_space_error(self.errors, distance[..., None], projection_matrix, viewport_height)
+        # Los errores son monótonos: el número de niveles aceptables - 1 es el más grueso.
+        return np.maximum((pixels <= pixel_error).sum(axis=-1) - 1, 0)
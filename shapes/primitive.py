@@ -1,7 +1,6 @@
 import numpy as np
-import moderngl
 from ..core.geometry import Mesh
-from ..core.models import Material, RenderProperties
+from ..core.models import GL_TRIANGLES, Material, RenderProperties
 
 # Malla rectangular simple con esquinas redondeadas controladas en shader.
 class RoundedRectangle(Mesh):
@@ -27,9 +26,9 @@ class RoundedRectangle(Mesh):
                 "type": "vec2",
                 "value": np.array([width, height], dtype='f4')
             }],
-            gl_mode=moderngl.TRIANGLES
+            gl_mode=GL_TRIANGLES
         )
-        super().__init__(self.vertices, self.indices, material, self.render_properties)
+        super().__init__(self.vertices, self.indices, material, self.render_properties, copy=False)
     
     def generate_vertices(self, width: float, height: float):
         # Devuelve el rectángulo centrado en origen.
@@ -0,0 +1,86 @@
+import numpy as np
+from typing import Optional
+
+
+# Pirámide min/max sobre un búfer circular de muestras equiespaciadas.
+class MinMaxPyramid:
+    """
+    El nivel 0 guarda cada muestra como (y, y); el nivel k guarda el mínimo y
+    el máximo de cada bloque de 2^k muestras (bloques alineados al índice
+    absoluto de la muestra). Cada nivel es un anillo de ``capacity >> k``
+    entradas más un margen, así que solo se conservan las ``capacity``
+    muestras más recientes. ``append`` recalcula únicamente los bloques que
+    tocan las muestras nuevas: O(muestras nuevas + niveles).
+    """
+    def __init__(self, capacity: int, min_buckets: int = 2):
+        capacity = int(capacity)
+        if capacity < 1:
+            raise ValueError(f"La capacidad debe ser positiva, no {capacity}")
+        self.capacity = capacity
+        self.levels = 1
+        while (capacity >> self.levels) >= min_buckets:
+            self.levels += 1
+        # +2: el bloque parcial del final y el del principio, que puede quedar cortado.
+        self.slots = [(capacity >> k) + 2 for k in range(self.levels)]
+        self.data = [np.zeros((slots, 2), dtype=np.float32) for slots in self.slots]
+        self.total = 0
+
+    @property
+    def start(self) -> int:
+        # Índice absoluto de la muestra más antigua retenida.
+        return max(self.total - self.capacity, 0)
+
+    def __len__(self) -> int:
+        return self.total - self.start
+
+    def append(self, values) -> list[tuple[int, int]]:
+        # Añade muestras; devuelve por nivel el rango absoluto de bloques reescritos.
+        values = np.asarray(values, dtype=np.float32).reshape(-1)
+        if values.size > self.capacity:
+            # Las anteriores quedarían fuera del anillo: basta con las últimas.
+            self.total += values.size - self.capacity
+            values = values[-self.capacity:]
+        first, self.total = self.total, self.total + values.size
+        if values.size == 0:
+            return []
+        base = self.data[0]
+        slots = (first + np.arange(values.size)) % self.slots[0]
+        base[slots, 0] = values
+        base[slots, 1] = values
+        changed = [(first, self.total)]
+        lo, hi = first, self.total
+        for k in range(1, self.levels):
+            lo, hi = lo >> 1, ((hi - 1) >> 1) + 1
+            buckets = np.arange(lo, hi)
+            children = self.data[k - 1]
+            child_slots = self.slots[k - 1]
+            left = children[(2 * buckets) % child_slots]
+            # El hijo derecho del último bloque puede no existir todavía.
+            right_exists = 2 * buckets + 1 < ((self.total - 1) >> (k - 1)) + 1
+            right = np.where(right_exists[:, None], children[(2 * buckets + 1) % child_slots], left)
+            parent = self.data[k]
+            parent_slots = buckets % self.slots[k]
+            parent[parent_slots, 0] = np.minimum(left[:, 0], right[:, 0])
+            parent[parent_slots, 1] = np.maximum(left[:, 1], right[:, 1])
+            changed.append((lo, hi))
+        return changed
+
+    def level_for(self, samples: int, columns: int) -> int:
+        # Nivel más grueso que aún deja al menos dos bloques por columna de píxeles.
+        """
+        Entre 2 y 4 bloques por columna: cada columna recibe su barra mín-máx
+        y un bloque no se reparte entre más de una columna y media.
+        """
+        level = 0
+        while level < self.levels - 1 and (samples >> (level + 1)) >= 2 * max(int(columns), 1):
+            level += 1
+        return level
+
+    def buckets(self, level: int, start: Optional[int] = None, stop: Optional[int] = None) -> np.ndarray:
+        # (n, 2) min/max de los bloques del nivel que cubren las muestras [start, stop).
+        start = self.start if start is None else max(int(start), self.start)
+        stop = self.total if stop is None else min(int(stop), self.total)
+        if stop <= start:
+            return np.empty((0, 2), dtype=np.float32)
+        first, last = start >> level, ((stop - 1) >> level) + 1
+        return self.data[level][np.arange(first, last) % self.slots[level]]
@@ -0,0 +1,188 @@
+import numpy as np
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+from ..core.bvh import classify_boxes
+
+DEFAULT_BRICK_SIZE = 32
+# Vóxeles repetidos alrededor de cada brick: el filtrado lineal no cruza al vecino.
+BRICK_APRON = 1
+
+
+def open_volume(path, shape: Optional[tuple[int, int, int]] = None, dtype=None, offset: int = 0) -> np.ndarray:
+    # Mapea un volumen (z, y, x) desde .npy o raw sin leerlo a memoria.
+    """
+    Los ``.npy`` traen forma y tipo en la cabecera; un raw necesita
+    ``shape`` (en orden z, y, x) y ``dtype``, y ``offset`` salta una
+    cabecera propia. Abrir no lee vóxeles: el coste es constante.
+    """
+    path = Path(path)
+    if path.suffix == ".npy":
+        volume = np.load(path, mmap_mode="r")
+    else:
+        if shape is None or dtype is None:
+            raise ValueError(f"Un volumen raw necesita shape y dtype: {path}")
+        volume = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=tuple(int(n) for n in shape))
+    if volume.ndim != 3:
+        raise ValueError(f"Se esperaba un volumen 3D, no de forma {volume.shape}")
+    return volume
+
+
+def default_window(dtype) -> tuple[float, float]:
+    # Rango de valores mapeado a [0, 1]: el del tipo entero, o [0, 1] en flotantes.
+    dtype = np.dtype(dtype)
+    if np.issubdtype(dtype, np.integer):
+        info = np.iinfo(dtype)
+        return float(info.min), float(info.max)
+    return 0.0, 1.0
+
+
+# Volumen partido en bricks cúbicos que se leen bajo demanda.
+class BrickedVolume:
+    """
+    ``data`` se indexa (z, y, x) y puede ser un memmap de cualquier tamaño:
+    nada se lee hasta ``read_brick``. El volumen ocupa en el mundo una caja
+    centrada en el origen cuyo lado mayor mide 2 (como el dominio [-1, 1]
+    de las ecuaciones); ``spacing`` es el tamaño del vóxel en (x, y, z).
+    Los bricks se numeran con x como eje más rápido, igual que la tabla de
+    páginas 3D de la GPU. ``brick_max`` guarda el máximo normalizado de cada
+    brick ya leído (NaN si aún no se leyó) para saltar los vacíos.
+    """
+    def __init__(self, data: np.ndarray, brick_size: int = DEFAULT_BRICK_SIZE,
+                 spacing: tuple[float, float, float] = (1.0, 1.0, 1.0),
+                 window: Optional[tuple[float, float]] = None):
+        if data.ndim != 3:
+            raise ValueError(f"Se esperaba un volumen 3D, no de forma {data.shape}")
+        brick_size = int(brick_size)
+        if brick_size < 1:
+            raise ValueError(f"El tamaño de brick debe ser positivo, no {brick_size}")
+        self.data = data
+        self.shape = tuple(int(n) for n in data.shape)
+        self.brick_size = brick_size
+        self.grid = tuple(-(-n // brick_size) for n in self.shape)
+        self.count = int(np.prod(self.grid))
+        self.window = tuple(float(v) for v in (window or default_window(data.dtype)))
+        if self.window[1] <= self.window[0]:
+            raise ValueError(f"Ventana de valores vacía: {self.window}")
+
+        # Vóxel -> mundo: escala uniforme y caja centrada en el origen.
+        voxels = np.array(self.shape[::-1], dtype=np.float64)
+        size = voxels * np.asarray(spacing, dtype=np.float64)
+        self.voxel_size = np.asarray(spacing, dtype=np.float64) * (2.0 / size.max())
+        half = 0.5 * voxels * self.voxel_size
+        self.aabb = np.stack((-half, half)).astype(np.float32)
+
+        # Cajas en el mundo de cada brick (recortadas al volumen) para el culling.
+        coords = self.brick_coords(np.arange(self.count))
+        lo = np.minimum(coords * brick_size, voxels)
+        hi = np.minimum(lo + brick_size, voxels)
+        self.brick_lo = (lo * self.voxel_size - half).astype(np.float32)
+        self.brick_hi = (hi * self.voxel_size - half).astype(np.float32)
+        self.brick_max = np.full(self.count, np.nan, dtype=np.float32)
+
+    @property
+    def padded_size(self) -> int:
+        # Lado de un brick en la GPU, con el margen incluido.
+        return self.brick_size + 2 * BRICK_APRON
+
+    def brick_coords(self, ids) -> np.ndarray:
+        # (n, 3) coordenadas (x, y, z) de brick de cada identificador.
+        z, y, x = np.unravel_index(np.asarray(ids, dtype=np.int64), self.grid)
+        return np.stack((x, y, z), axis=-1)
+
+    def read_brick(self, brick: int) -> np.ndarray:
+        # Lee un brick con su margen, normalizado a [0, 1] en float16 (z, y, x).
+        """Fuera del volumen se repite el borde. Actualiza ``brick_max``."""
+        x, y, z = self.brick_coords(brick)
+        lo = np.array((z, y, x)) * self.brick_size - BRICK_APRON
+        hi = lo + self.padded_size
+        src_lo = np.maximum(lo, 0)
+        src_hi = np.minimum(hi, self.shape)
+        block = np.asarray(self.data[src_lo[0]:src_hi[0], src_lo[1]:src_hi[1], src_lo[2]:src_hi[2]],
+                           dtype=np.float32)
+        pad = [(int(a - b), int(c - d)) for a, b, c, d in zip(src_lo, lo, hi, src_hi)]
+        if any(p for pair in pad for p in pair):
+            block = np.pad(block, pad, mode="edge")
+        low, high = self.window
+        block = (block - low) * (1.0 / (high - low))
+        np.clip(block, 0.0, 1.0, out=block)
+        self.brick_max[brick] = block.max()
+        return block.astype(np.float16)
+
+    def visible_bricks(self, planes: np.ndarray, eye: np.ndarray, threshold: float = 0.0) -> np.ndarray:
+        # Bricks dentro del frustum y no descartados como vacíos, de cerca a lejos.
+        outside, _ = classify_boxes(planes, self.brick_lo, self.brick_hi)
+        # Los NaN (sin leer) no cumplen la comparación: se conservan. Un brick cuyo
+        # máximo no supera el umbral es transparente entero.
+        empty = self.brick_max <= threshold
+        ids = np.flatnonzero(~outside & ~empty)
+        centers = 0.5 * (self.brick_lo[ids] + self.brick_hi[ids])
+        distance = np.einsum('ij,ij->i', centers - eye, centers - eye)
+        return ids[np.argsort(distance, kind="stable")]
+
+
+# Asignación LRU de bricks a las ranuras del atlas 3D.
+class BrickCache:
+    """
+    Cada brick residente ocupa una ranura. Al llenarse se expulsa el usado
+    hace más tiempo, salvo que se haya usado en el frame actual: entonces la
+    inserción falla y el brick espera (el atlas ya está lleno de bricks
+    visibles).
+    """
+    def __init__(self, capacity: int):
+        capacity = int(capacity)
+        if capacity < 1:
+            raise ValueError(f"La capacidad debe ser positiva, no {capacity}")
+        self.capacity = capacity
+        self._slots: "OrderedDict[int, int]" = OrderedDict()
+        self._used: dict[int, int] = {}
+        self._free = list(range(capacity - 1, -1, -1))
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, brick: int) -> bool:
+        return brick in self._slots
+
+    def touch(self, brick: int, frame: int) -> Optional[int]:
+        # Marca el brick como usado en el frame; devuelve su ranura o None si no reside.
+        slot = self._slots.get(brick)
+        if slot is None:
+            self.misses += 1
+            return None
+        self._slots.move_to_end(brick)
+        self._used[brick] = frame
+        self.hits += 1
+        return slot
+
+    def insert(self, brick: int, frame: int) -> Optional[tuple[int, Optional[int]]]:
+        # Reserva ranura para el brick: (ranura, brick expulsado o None), o None si está lleno.
+        if brick in self._slots:
+            return self.touch(brick, frame), None
+        evicted = None
+        if self._free:
+            slot = self._free.pop()
+        else:
+            oldest = next(iter(self._slots))
+            if self._used.get(oldest) == frame:
+                return None
+            slot = self._slots.pop(oldest)
+            self._used.pop(oldest, None)
+            evicted = oldest
+            self.evictions += 1
+        self._slots[brick] = slot
+        self._used[brick] = frame
+        return slot, evicted
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "resident": len(self._slots),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,174 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+# Raíz del paquete: los shaders se cargan con rutas relativas a ella.
+PACKAGE_ROOT = Path(__file__).resolve().parent.parent
+PACKAGE_NAME = "pyxion"
+
+
+def _register_package() -> None:
+    # Las pruebas importan ``pyxion.*``: si el checkout no se llama así (o no
+    # está instalado), se registra su raíz como el paquete antes de recolectar.
+    if PACKAGE_NAME in sys.modules or importlib.util.find_spec(PACKAGE_NAME) is not None:
+        return
+    spec = importlib.util.spec_from_file_location(PACKAGE_NAME, PACKAGE_ROOT / "__init__.py",
+                                                  submodule_search_locations=[str(PACKAGE_ROOT)])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[PACKAGE_NAME] = module
+    spec.loader.exec_module(module)
+
+
+_register_package()
+
+
+# Dobles de los objetos de moderngl para probar la lógica de CPU sin contexto GL.
+class FakeBuffer:
+    def __init__(self, data=None, reserve=0):
+        self.data = bytearray(reserve) if data is None else bytearray(memoryview(data).cast('B'))
+        self.orphans = 0
+        self.writes = []
+        self.released = False
+
+    @property
+    def size(self):
+        return len(self.data)
+
+    def orphan(self, size=-1):
+        self.orphans += 1
+        if size >= 0:
+            self.data = bytearray(size)
+
+    def write(self, data, offset=0):
+        data = memoryview(data).cast('B')
+        self.writes.append((offset, len(data)))
+        self.data[offset:offset + len(data)] = data
+
+    def read(self, size=-1, offset=0):
+        end = len(self.data) if size < 0 else offset + size
+        return bytes(self.data[offset:end])
+
+    def release(self):
+        self.released = True
+
+
+class FakeVertexArray:
+    def __init__(self, vbo):
+        self.vbo = vbo
+        self.vertices = -1
+        self.released = False
+
+    def release(self):
+        self.released = True
+
+
+class FakeTexture:
+    def __init__(self, size, data):
+        self.size = size
+        self.data = data
+        self.writes = []
+        self.released = False
+
+    @property
+    def width(self):
+        return self.size[0]
+
+    def write(self, data, viewport=None):
+        self.writes.append((bytes(data), viewport))
+
+    def release(self):
+        self.released = True
+
+
+class FakeProgram:
+    def __init__(self):
+        self.released = False
+
+    def __contains__(self, name):
+        return False
+
+    def release(self):
+        self.released = True
+
+
+class FakeQuery:
+    def __init__(self, elapsed):
+        self.elapsed = elapsed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+class FakeFramebuffer:
+    def __init__(self):
+        self.depth_mask = True
+
+
+class FakeContext:
+    # Registra lo creado para que las pruebas cuenten compilaciones y consultas.
+    def __init__(self):
+        self.buffers = []
+        self.compiled = 0
+        self.created = []
+        self.enabled = 0
+        self.fbo = FakeFramebuffer()
+
+    def enable(self, flags):
+        self.enabled |= flags
+
+    def disable(self, flags):
+        self.enabled &= ~flags
+
+    def buffer(self, data=None, reserve=0, dynamic=False):
+        buffer = FakeBuffer(data, reserve)
+        self.buffers.append(buffer)
+        return buffer
+
+    def vertex_array(self, program, content, index_buffer=None, index_element_size=4, **kwargs):
+        return FakeVertexArray(content[0][0])
+
+    def texture(self, size, components, data=None, **kwargs):
+        return FakeTexture(size, data)
+
+    def program(self, vertex_shader, fragment_shader=None, **kwargs):
+        self.compiled += 1
+        return FakeProgram()
+
+    def query(self, time=False):
+        query = FakeQuery(elapsed=2_000_000)
+        self.created.append(query)
+        return query
+
+
+@pytest.fixture
+def fake_ctx():
+    return FakeContext()
+
+
+@pytest.fixture(scope="session")
+def _standalone_gl():
+    # Contexto GL sin ventana (EGL, p. ej. Mesa llvmpipe); las pruebas GL se saltan si no hay.
+    moderngl = pytest.importorskip("moderngl")
+    try:
+        ctx = moderngl.create_standalone_context(backend="egl")
+    except Exception as error:
+        pytest.skip(f"Sin contexto GL por software: {error}")
+    yield ctx
+    ctx.release()
+
+
+@pytest.fixture
+def package_dir(monkeypatch):
+    # Ejecuta la prueba desde la raíz del paquete (rutas de shaders relativas).
+    monkeypatch.chdir(PACKAGE_ROOT)
+    return PACKAGE_ROOT
+
+
+@pytest.fixture
+def gl_ctx(_standalone_gl, package_dir):
+    return _standalone_gl
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from pyxion.core.mesh_cache import MeshCache
+from pyxion.core.models import Material
+from pyxion.shapes.adaptive import adaptive_tessellation
+from pyxion.shapes.equation import AdaptiveEquation3dMesh
+
+
+def bump(x, y):
+    return np.exp(-40 * ((x - 0.3) ** 2 + (y + 0.2) ** 2))
+
+
+def edge_counts(indices):
+    triangles = indices.reshape(-1, 3).astype(np.int64)
+    edges = np.sort(np.concatenate((triangles[:, [0, 1]], triangles[:, [1, 2]], triangles[:, [2, 0]])), axis=1)
+    return np.unique(edges, axis=0, return_counts=True)
+
+
+def test_mesh_is_watertight_and_covers_domain():
+    vertices, indices, _ = adaptive_tessellation(bump, tolerance=1e-3, min_depth=2, max_depth=7)
+    edges, counts = edge_counts(indices)
+    assert counts.max() == 2
+    # Las únicas aristas con un solo triángulo están en el borde del dominio.
+    border = vertices[edges[counts == 1]][:, :, :2]
+    assert np.all(np.isclose(np.abs(border), 1.0).all(axis=1).any(axis=-1))
+    p = vertices[indices.reshape(-1, 3).astype(np.int64)][:, :, :2]
+    d1, d2 = p[:, 1] - p[:, 0], p[:, 2] - p[:, 0]
+    areas = 0.5 * (d1[:, 0] * d2[:, 1] - d1[:, 1] * d2[:, 0])
+    assert np.all(areas > 0)
+    assert areas.sum() == pytest.approx(4.0)
+
+
+def test_refines_only_around_features():
+    vertices, _, meta = adaptive_tessellation(bump, tolerance=1e-3, max_depth=8)
+    assert len(vertices) < 257 * 257 // 5
+    near = np.hypot(vertices[:, 0] - 0.3, vertices[:, 1] + 0.2) < 0.4
+    assert near.sum() > (~near).sum()
+    assert meta["calls"] <= 8
+    assert vertices[:, 2].min() == pytest.approx(-1.0) and vertices[:, 2].max() == pytest.approx(1.0)
+
+
+def test_plane_stays_at_min_depth():
+    vertices, indices, meta = adaptive_tessellation(lambda x, y: 2 * x - y, min_depth=2, max_depth=6)
+    assert len(vertices) == 25
+    assert len(indices) == 16 * 6
+    assert meta["calls"] == 1
+
+
+def test_invalid_depths():
+    with pytest.raises(ValueError):
+        adaptive_tessellation(bump, min_depth=5, max_depth=3)
+
+
+def test_adaptive_mesh_uses_cache(tmp_path):
+    cache = MeshCache(tmp_path)
+    first = AdaptiveEquation3dMesh(Material(), bump, max_depth=6, cache=cache)
+    second = AdaptiveEquation3dMesh(Material(), bump, max_depth=6, cache=cache)
+    assert cache.hits == 1
+    np.testing.assert_array_equal(first.indices, second.indices)
+    np.testing.assert_array_equal(first.aabb, second.aabb)
@@ -0,0 +1,49 @@
+import threading
+
+import numpy as np
+
+from pyxion.core.models import Material
+from pyxion.rendering.async_mesh import MeshBuilder, StagedMeshUpload
+from pyxion.rendering.indices import IndexBufferCache
+from pyxion.shapes.equation import Equation3dMesh
+
+
+def plane(x, y):
+    return x + y
+
+
+def test_newer_request_cancels_queued_one():
+    gate = threading.Event()
+    builder = MeshBuilder(workers=1)
+    blocker = builder.submit("other", gate.wait)
+    stale = builder.submit("mesh", Equation3dMesh, Material(), plane, 4, 4)
+    fresh = builder.submit("mesh", Equation3dMesh, Material(), plane, 6, 6)
+    gate.set()
+    assert stale.cancelled() and builder.cancelled == 1
+    assert fresh.result(timeout=10).vertices.shape == (36, 3)
+    assert builder.is_current("mesh", fresh) and blocker.result(timeout=10)
+    builder.shutdown()
+
+
+def test_staged_upload_respects_budget(fake_ctx):
+    ctx = fake_ctx
+    mesh = Equation3dMesh(Material(), plane, 16, 16)
+    upload = StagedMeshUpload(ctx, mesh, IndexBufferCache(ctx))
+    steps = []
+    while not upload.done:
+        steps.append(upload.step(1000))
+    assert max(steps) <= 1000 and sum(steps) == upload.total_bytes
+    assert bytes(upload.vbo.data) == np.ascontiguousarray(mesh.vertex_data).tobytes()
+    assert bytes(upload.ibo.data) == np.ascontiguousarray(mesh.indices).tobytes()
+
+
+def test_staged_upload_reuses_cached_indices(fake_ctx):
+    ctx = fake_ctx
+    cache = IndexBufferCache(ctx)
+    mesh = Equation3dMesh(Material(), plane, 16, 16)
+    shared = cache.acquire(mesh.index_key, np.ascontiguousarray(mesh.indices))
+    upload = StagedMeshUpload(ctx, mesh, cache)
+    assert upload.ibo is shared and cache.refcount(mesh.index_key) == 2
+    assert upload.total_bytes == mesh.vertex_data.nbytes
+    upload.release()
+    assert cache.refcount(mesh.index_key) == 1 and not shared.released
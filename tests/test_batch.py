@@ -0,0 +1,73 @@
+import numpy as np
+
+from pyxion.core.models import Material
+from pyxion.rendering.batch import PRIMITIVE_RESTART_INDEX, MeshBatch
+from pyxion.rendering.renderer import Renderer
+from pyxion.shapes.equation import Equation2dMesh, Equation3dMesh
+
+
+def surface(k, rows=3, cols=3, topology="triangles"):
+    return Equation3dMesh(Material(), lambda x, y: np.sin(x * k + y), rows, cols, topology=topology)
+
+
+def packed_indices(batch):
+    return np.frombuffer(bytes(batch.ibo.data), dtype=np.uint32)
+
+
+def test_pack_shifts_indices_by_base_vertex(fake_ctx, package_dir):
+    meshes = [surface(1), surface(2, 2, 4)]
+    batch = MeshBatch(fake_ctx, meshes)
+    assert batch.vertex_offsets == [0, 9]
+    first, second = meshes[0].indices.size, meshes[1].indices.size
+    assert batch.index_ranges == [(0, first), (first, second)]
+    expected = np.concatenate((meshes[0].indices.ravel(), meshes[1].indices.ravel() + 9)).astype(np.uint32)
+    np.testing.assert_array_equal(packed_indices(batch), expected)
+    vertices = np.frombuffer(bytes(batch.vbo.data), dtype=np.float32).reshape(-1, 3)
+    np.testing.assert_array_equal(vertices[9:], meshes[1].vertices)
+    ids = np.frombuffer(bytes(batch.instance_vbo.data), dtype=np.uint32)
+    np.testing.assert_array_equal(ids, [0] * 9 + [1] * 8)
+
+
+def test_strips_are_joined_with_primitive_restart(fake_ctx, package_dir):
+    meshes = [surface(1, 2, 4, "strip"), surface(2, 2, 4, "strip")]
+    # Reinicio propio del mesh (p. ej. tiras de rejilla con índices de 32 bits).
+    meshes[1].indices = np.array([0, 4, 1, 5, 99, 2, 6, 3, 7], dtype=np.uint32)
+    meshes[1].restart_index = 99
+    batch = MeshBatch(fake_ctx, meshes)
+    indices = packed_indices(batch)
+    start, count = batch.index_ranges[1]
+    assert indices[start - 1] == PRIMITIVE_RESTART_INDEX
+    assert start == meshes[0].indices.size + 1 and count == 9
+    np.testing.assert_array_equal(indices[start:], [8, 12, 9, 13, PRIMITIVE_RESTART_INDEX, 10, 14, 11, 15])
+
+
+def test_instance_texture_holds_one_world_slot_per_mesh(fake_ctx, package_dir):
+    batch = MeshBatch(fake_ctx, [surface(1), surface(2), surface(3)])
+    texels = np.frombuffer(batch.instance_texture.data, dtype=np.float32)
+    np.testing.assert_array_equal(texels, [0.0, 0.0, 0.0])
+    batch.set_instance_slot(2, 5)
+    data, viewport = batch.instance_texture.writes[-1]
+    assert viewport == (2, 0, 1, 1)
+    np.testing.assert_array_equal(np.frombuffer(data, dtype=np.float32), [5.0])
+
+
+def batched_scene():
+    models = [Equation2dMesh(Material(), lambda x, k=k: 0.3 * np.sin(4 * x + k) + 0.1 * k - 0.3, 80) for k in range(6)]
+    for k in range(3):
+        mesh = surface(k, 10, 10)
+        mesh.vertices[:, 2] *= 0.1
+        mesh.vertices[:, 0] = mesh.vertices[:, 0] * 0.2 + k * 0.3 - 0.5
+        models.append(mesh)
+    return models
+
+
+def test_batched_and_unbatched_frames_match(gl_ctx):
+    frames = []
+    for batching in (False, True):
+        renderer = Renderer((128, 128), models=batched_scene(), ctx=gl_ctx, batching=batching)
+        renderer.camera.position = (0.0, 0.0, 0.5)
+        frames.append(renderer.render_to_array())
+        assert len(renderer.batches) == (2 if batching else 0)
+        renderer.release()
+    assert frames[0][..., :3].any()
+    np.testing.assert_array_equal(frames[0], frames[1])
@@ -0,0 +1,52 @@
+from pyxion.benchmarks.harness import compare, measure
+from pyxion.benchmarks.startup import check_budgets, parse_importtime, run_importtime
+
+
+def result(median):
+    return {"median": median, "min": median, "mean": median, "repeat": 1}
+
+
+def test_measure_reports_statistics():
+    calls = []
+    stats = measure(lambda: calls.append(1), repeat=4, warmup=2)
+    assert len(calls) == 6
+    assert stats["repeat"] == 4
+    assert stats["min"] <= stats["median"] <= max(stats["mean"], stats["median"])
+
+
+def test_measure_setup_is_passed_to_fn():
+    seen = []
+    measure(seen.append, repeat=3, warmup=0, setup=lambda: "x")
+    assert seen == ["x", "x", "x"]
+
+
+def test_compare_flags_regressions_and_improvements():
+    baseline = {"results": {"a": result(1.0), "b": result(1.0), "c": result(1.0), "old": result(1.0)}}
+    current = {"results": {"a": result(1.05), "b": result(1.5), "c": result(0.5), "new": result(1.0)}}
+    rows = {row["name"]: row for row in compare(baseline, current, threshold=0.10)}
+    assert set(rows) == {"a", "b", "c"}
+    assert rows["a"]["status"] == "ok"
+    assert rows["b"]["status"] == "regression"
+    assert rows["b"]["ratio"] == 1.5
+    assert rows["c"]["status"] == "improvement"
+
+
+def test_parse_importtime_and_budgets():
+    stderr = ("import time: self [us] | cumulative | imported package\n"
+              "import time:      1500 |       1500 |     numpy.core\n"
+              "import time:      2000 |       3500 |   numpy\n"
+              "import time:       500 |       4000 | pyxion.shapes.equation\n")
+    entries = parse_importtime(stderr)
+    assert entries[-1] == ("pyxion.shapes.equation", 0, 0.5, 4.0)
+    assert [depth for _, depth, _, _ in entries] == [2, 1, 0]
+    results = {"startup/import/a": {"overhead_ms": 12.0, "budget_ms": 10.0, "heavy_modules": []},
+               "startup/import/b": {"overhead_ms": 1.0, "budget_ms": 10.0, "heavy_modules": ["pydantic"]},
+               "startup/import/numpy": {"median": 0.1}}
+    problems = check_budgets(results)
+    assert len(problems) == 2 and "pydantic" in problems[1]
+
+
+def test_headless_geometry_does_not_load_gl_or_pydantic():
+    entries, heavy = run_importtime("shapes.equation")
+    assert heavy == []
+    assert any(name.endswith("shapes.equation") for name, _, _, _ in entries)
@@ -0,0 +1,55 @@
+import numpy as np
+
+from pyxion.core.bvh import BVH, classify_boxes
+from pyxion.core.camera import frustum_planes
+from pyxion.core.geometry import compute_bounds
+
+
+def random_boxes(count, seed=0):
+    rng = np.random.default_rng(seed)
+    lo = rng.uniform(-20, 20, size=(count, 3))
+    return np.stack((lo, lo + rng.uniform(0.1, 2.0, size=(count, 3))), axis=1)
+
+
+def brute_force(planes, boxes):
+    outside, _ = classify_boxes(planes, boxes[:, 0], boxes[:, 1])
+    return np.flatnonzero(~outside)
+
+
+def test_identity_matrix_frustum_is_unit_cube():
+    planes = frustum_planes(np.eye(4))
+    inside = np.array([[0.0, 0.0, 0.0], [0.9, -0.9, 0.5]])
+    outside = np.array([[1.5, 0.0, 0.0], [0.0, 0.0, -2.0]])
+    assert (inside @ planes[:, :3].T + planes[:, 3] >= 0).all()
+    assert ((outside @ planes[:, :3].T + planes[:, 3]) < 0).any(axis=1).all()
+
+
+def test_query_matches_brute_force():
+    boxes = random_boxes(500)
+    bvh = BVH(boxes)
+    planes = frustum_planes(np.diag([0.2, 0.1, 0.05, 1.0]))
+    np.testing.assert_array_equal(bvh.query(planes), brute_force(planes, boxes))
+
+
+def test_query_visits_few_nodes_when_little_is_visible():
+    boxes = random_boxes(2000)
+    bvh = BVH(boxes)
+    planes = frustum_planes(np.diag([1.0, 1.0, 1.0, 1.0]))
+    visible = bvh.query(planes)
+    assert len(visible) < 50
+    assert bvh.nodes_visited < len(boxes) // 4
+
+
+def test_refit_moves_item_into_view():
+    boxes = random_boxes(100) + 100.0
+    bvh = BVH(boxes)
+    planes = frustum_planes(np.eye(4))
+    assert bvh.query(planes).size == 0
+    bvh.refit(42, [[-0.5, -0.5, -0.5], [0.5, 0.5, 0.5]])
+    np.testing.assert_array_equal(bvh.query(planes), [42])
+
+
+def test_compute_bounds_pads_2d_vertices():
+    bounds = compute_bounds(np.array([[1.0, -2.0], [3.0, 4.0]]))
+    np.testing.assert_array_equal(bounds, [[1.0, -2.0, 0.0], [3.0, 4.0, 0.0]])
+    np.testing.assert_array_equal(compute_bounds(np.empty((0, 3))), np.zeros((2, 3)))
@@ -1,7 +1,7 @@
 import numpy as np
 import numpy.testing as npt
 
-from camera import Camera
+from pyxion.core.camera import Camera, OrbitCamera, look_at_matrices, orbit_positions
 
 
 def make_camera():
@@ -41,3 +41,78 @@ def test_camera_move_translates_position_and_target():
     cam.move((1.0, 2.0, 3.0))
     npt.assert_allclose(cam.position, np.array([1.0, 2.0, 6.0], dtype=np.float32))
     npt.assert_allclose(cam.target, np.array([1.0, 2.0, 3.0], dtype=np.float32))
+
+
+def test_camera_matrix_is_cached_until_camera_changes():
+    cam = make_camera()
+    first = cam.camera_matrix
+    assert cam.camera_matrix is first
+    version = cam.version
+    cam.look_at((1.0, 0.0, 0.0))
+    assert cam.version > version
+    assert cam.camera_matrix is not first
+
+
+def test_camera_setters_and_move_bump_version():
+    cam = make_camera()
+    for mutate in (
+        lambda c: c.move((0.0, 1.0, 0.0)),
+        lambda c: setattr(c, "camera_radius", 5.0),
+        lambda c: setattr(c, "aspect_ratio", 1.0),
+        lambda c: setattr(c, "projection_matrix", np.eye(4)),
+    ):
+        version = cam.version
+        mutate(cam)
+        assert cam.version > version
+
+
+def test_camera_matrix_bytes_are_column_major():
+    cam = make_camera()
+    cam.position = (2.0, 1.0, 3.0)
+    expected = cam.camera_matrix.T.astype(np.float32).tobytes()
+    assert cam.camera_matrix_bytes == expected
+
+
+def test_orbit_camera_matches_cartesian_camera():
+    cam = make_camera()
+    cam.position = (2.0, -1.0, 1.5)
+    orbit = OrbitCamera(position=(2.0, -1.0, 1.5), target=(0.0, 0.0, 0.0), aspect_ratio=16 / 9)
+    npt.assert_allclose(orbit.position, cam.position, atol=1e-6)
+    npt.assert_allclose(orbit.camera_matrix, cam.camera_matrix, atol=1e-5)
+
+
+def test_orbit_applies_drag_and_zoom_in_one_update():
+    orbit = OrbitCamera.from_spherical(radius=4.0, polar=1.0, azimuth=0.5)
+    version = orbit.version
+    orbit.orbit(d_azimuth=0.25, d_polar=-0.5, zoom=0.5)
+    assert orbit.version == version + 1
+    npt.assert_allclose(orbit.camera_radius, 2.0)
+    npt.assert_allclose(orbit.camera_polar, 0.5)
+    npt.assert_allclose(orbit.camera_azimuthal, 0.75)
+    npt.assert_allclose(np.linalg.norm(orbit.position - orbit.target), 2.0, rtol=1e-6)
+
+
+def test_orbit_polar_is_clamped_away_from_poles():
+    orbit = OrbitCamera.from_spherical(radius=1.0, polar=0.1, azimuth=0.0)
+    orbit.orbit(d_polar=-1.0)
+    assert 0.0 < orbit.camera_polar < 0.1
+    assert np.all(np.isfinite(orbit.camera_matrix))
+
+
+def test_path_matrices_match_per_frame_matrices():
+    orbit = OrbitCamera.from_spherical(radius=3.0, polar=1.2, azimuth=0.0, target=(0.5, 0.0, 0.0))
+    azimuths = np.linspace(-np.pi, np.pi, 16, endpoint=False)
+    path = orbit.orbit_path_matrices(3.0, 1.2, azimuths)
+    assert path.shape == (16, 4, 4)
+    for azimuth, matrix in zip(azimuths, path):
+        orbit.set_orbit(3.0, 1.2, azimuth)
+        npt.assert_allclose(matrix, orbit.camera_matrix, atol=1e-5)
+
+
+def test_look_at_matrices_matches_view_matrix():
+    cam = make_camera()
+    positions = orbit_positions(2.0, np.array([0.3, 1.0, 2.5]), np.array([0.0, 1.0, -2.0]))
+    views = look_at_matrices(positions, cam.target)
+    for position, view in zip(positions, views):
+        cam.position = position
+        npt.assert_allclose(view, cam.view_matrix, atol=1e-5)
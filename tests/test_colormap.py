@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from pyxion.rendering.colormap import ColormapCache, bake_lut, default_colormap, load_luts
+from pyxion.utils.tokens import parse_hex_color
+
+
+def test_design_tokens_define_gray_and_magma():
+    luts = load_luts()
+    assert {"gray", "magma"} <= set(luts)
+    assert default_colormap() == "gray"
+    table = bake_lut(*luts["magma"], size=4096)
+    assert table.shape == (4096, 4)
+    np.testing.assert_allclose(table[0, :3], parse_hex_color("#000004")[:3], atol=1e-6)
+    np.testing.assert_allclose(table[-1, :3], parse_hex_color("#FCFDBF")[:3], atol=1e-6)
+    np.testing.assert_allclose(bake_lut(*luts["gray"], size=256)[128, 0], 128 / 255, atol=1e-6)
+
+
+def test_custom_design_file(tmp_path):
+    path = tmp_path / "design.toml"
+    path.write_text('[imaging.lut.red]\n"0.0" = "#000000"\n"1.0" = "#FF0000"\n'
+                    '[imaging.overlays]\ncolormap_default = "red"\n')
+    assert set(load_luts(path)) == {"gray", "red"}
+    assert default_colormap(path) == "red"
+
+
+def test_cache_shares_textures_and_counts_references(fake_ctx):
+    cache = ColormapCache(fake_ctx)
+    first = cache.acquire("magma")
+    assert cache.acquire("magma") is first and cache.hits == 1
+    fine = cache.acquire("magma", 4096)
+    assert fine.size == (4096, 1) and fine.data.dtype == np.float16
+    assert first.data.dtype == np.uint8 and first.data.shape == (256, 4)
+    cache.release("magma")
+    assert not first.released
+    cache.release("magma")
+    assert first.released and cache.refcount("magma") == 0
+    with pytest.raises(ValueError):
+        cache.acquire("viridis")
+    with pytest.raises(ValueError):
+        cache.acquire("gray", 100)
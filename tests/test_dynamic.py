@@ -0,0 +1,45 @@
+import numpy as np
+
+from pyxion.rendering.dynamic import DynamicMeshBuffers
+
+
+def slot_contents(ring, rows):
+    vbo = ring.vao.vbo
+    return np.frombuffer(bytes(vbo.data[:rows * ring.row_bytes]), dtype='f4').reshape(rows, 3)
+
+
+def make_ring(ctx, vertices, ring_size=3):
+    return DynamicMeshBuffers(ctx, None, ('3f', 'in_pos'), vertices, ctx.buffer(reserve=12), 3, ring_size=ring_size)
+
+
+def test_partial_updates_reach_every_slot_of_the_ring(fake_ctx):
+    vertices = np.zeros((8, 3), dtype='f4')
+    ring = make_ring(fake_ctx, vertices)
+    for frame in range(1, 7):
+        vertices[frame % 8] = frame
+        vao = ring.update(vertices, frame % 8, frame % 8 + 1)
+        np.testing.assert_array_equal(slot_contents(ring, 8), vertices)
+        assert vao is ring.vao
+
+
+def test_update_rotates_slots(fake_ctx):
+    ring = make_ring(fake_ctx, np.zeros((4, 3), dtype='f4'), ring_size=2)
+    first = ring.vao
+    second = ring.update(np.ones((4, 3), dtype='f4'))
+    assert second is not first
+    assert ring.update(np.ones((4, 3), dtype='f4')) is first
+
+
+def test_growth_orphans_buffer_and_rewrites_everything(fake_ctx):
+    ring = make_ring(fake_ctx, np.zeros((2, 3), dtype='f4'), ring_size=1)
+    grown = np.arange(30, dtype='f4').reshape(10, 3)
+    ring.update(grown, 9, 10)
+    assert ring.vbo.size >= grown.nbytes
+    np.testing.assert_array_equal(slot_contents(ring, 10), grown)
+
+
+def test_update_indices_sets_draw_count_on_all_slots(fake_ctx):
+    ring = make_ring(fake_ctx, np.zeros((4, 3), dtype='f4'), ring_size=2)
+    ring.update_indices(np.arange(12, dtype='i4').tobytes(), 12)
+    assert all(vao.vertices == 12 for _, vao in ring.slots)
+    assert ring.ibo.size >= 48
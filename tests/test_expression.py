@@ -0,0 +1,69 @@
+from pathlib import Path
+
+import moderngl
+import numpy as np
+import pytest
+
+from pyxion.core.models import Material
+from pyxion.rendering.shader import resolve_includes
+from pyxion.shapes.equation import GpuEquation3dMesh
+from pyxion.shapes.expression import Expression
+
+
+def test_expression_matches_numpy_function():
+    expr = Expression("sin(sqrt(x**2 + y**2) - t) / (sqrt(x**2 + y**2) + 0.001)")
+    x, y = np.meshgrid(np.linspace(-1, 1, 9), np.linspace(-1, 1, 7))
+    r = np.sqrt(x**2 + y**2)
+    expected = np.sin(r - 0.5) / (r + 0.001)
+    np.testing.assert_allclose(expr(x, y, 0.5), expected)
+
+
+def test_expression_emits_glsl_floats_and_expands_small_powers():
+    expr = Expression("2 * x**2 + pow(y, 0.5) - pi")
+    assert "(x)*(x)" in expr.glsl
+    assert "pow(y, 0.5)" in expr.glsl
+    assert "2.0" in expr.glsl
+    assert "3.14159" in expr.glsl
+
+
+def test_expression_constant_broadcasts_to_grid():
+    x, y = np.meshgrid(np.linspace(-1, 1, 4), np.linspace(-1, 1, 3))
+    assert Expression("1")(x, y).shape == (3, 4)
+
+
+@pytest.mark.parametrize("source", [
+    "__import__('os')",
+    "x.real",
+    "open('f')",
+    "x if y else t",
+    "x % 2",
+    "sin(x, y)",
+    "z + 1",
+])
+def test_expression_rejects_unsupported_constructs(source):
+    with pytest.raises(ValueError):
+        Expression(source)
+
+
+def test_gpu_mesh_matches_numpy_evaluation(gl_ctx):
+    mesh = GpuEquation3dMesh(Material(), "sin(sqrt(x**2 + y**2)*6 - t)/(sqrt(x**2 + y**2) + 0.5)", 24, 24)
+    # El vertex shader del mesh con la z normalizada como salida de transform feedback.
+    source = mesh.render_properties.vertex_shader_source
+    source = source.replace("void main() {", "out float out_z;\nvoid main() {")
+    source = source.replace("gl_Position = camera_matrix", "out_z = z_normalized;\n    gl_Position = camera_matrix")
+    source = resolve_includes(source, Path(mesh.render_properties.vertex_shader_path))
+    program = gl_ctx.program(vertex_shader=source, varyings=["out_z"])
+    for uniform in mesh.render_properties.uniforms:
+        program[uniform["name"]].value = uniform["value"]
+    program["time"].value = 1.7
+    vbo = gl_ctx.buffer(mesh.vertex_buffer)
+    out = gl_ctx.buffer(reserve=len(mesh.vertices) * 4)
+    vao = gl_ctx.vertex_array(program, [(vbo, "2f", "in_xy")])
+    # Sin framebuffer enlazado el draw de transform feedback falla en EGL.
+    fbo = gl_ctx.simple_framebuffer((1, 1))
+    fbo.use()
+    vao.transform(out, moderngl.POINTS)
+    gpu = np.frombuffer(out.read(), dtype=np.float32)
+    np.testing.assert_allclose(gpu, mesh.evaluate(1.7), atol=1e-4)
+    for resource in (vao, vbo, out, program, fbo):
+        resource.release()
@@ -1,6 +1,6 @@
 import numpy as np
 
-from geometry import Material, RenderProperties, Polyline, Mesh
+from pyxion.core.geometry import Material, RenderProperties, Polyline, Mesh
 
 
 def make_render_props():
@@ -33,3 +33,13 @@ def test_mesh_buffers_use_indices():
     assert mesh.flat_indices.tolist() == [0, 1, 2]
     assert len(mesh.index_buffer) == indices.size * indices.dtype.itemsize
     assert len(mesh.vertex_buffer) == vertices.size * vertices.dtype.itemsize
+
+
+def test_constructor_copies_caller_arrays():
+    vertices = np.array([[0.0, 0.0, 0.0], [1.0, 1.0, 0.0], [0.0, 1.0, 0.0]], dtype=np.float32)
+    mesh = Mesh(vertices, np.array([0, 1, 2], dtype=np.uint32), Material(), make_render_props())
+    vertices[1] = 50.0
+    assert mesh.aabb[1].tolist() == [1.0, 1.0, 0.0]
+    assert mesh.vertices[1].tolist() == [1.0, 1.0, 0.0]
+    shared = Polyline(vertices, Material(), make_render_props(), copy=False)
+    assert shared.vertices is vertices
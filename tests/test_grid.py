@@ -0,0 +1,114 @@
+import gc
+import weakref
+
+import numpy as np
+import pytest
+
+from pyxion.rendering.indices import IndexBufferCache
+from pyxion.shapes.grid import RESTART_INDEX, allocate_vertices, evaluate_grid, grid_indices
+
+
+def ripple(x, y):
+    r = np.sqrt(x**2 + y**2)
+    return np.sin(5 * r) / (r + 0.001)
+
+
+def full_grid(func, rows, cols):
+    X, Y = np.meshgrid(np.linspace(-1, 1, cols), np.linspace(-1, 1, rows))
+    Z = func(X, Y).astype(np.float32)
+    z_min, z_max = float(Z.min()), float(Z.max())
+    z = ((Z - (z_min + z_max) / 2.0) / ((z_max - z_min) / 2.0)).astype(np.float32)
+    return np.column_stack((X.ravel(), Y.ravel(), z.ravel())).astype('f4'), z_min, z_max
+
+
+@pytest.mark.parametrize("workers, band_rows", [(1, None), (1, 3), (3, 7)])
+def test_banded_evaluation_matches_full_grid(workers, band_rows):
+    expected, z_min, z_max = full_grid(ripple, 40, 25)
+    vertices, meta = evaluate_grid(ripple, 40, 25, band_rows=band_rows, workers=workers)
+    np.testing.assert_array_equal(vertices, expected)
+    assert meta["z_min"] == z_min and meta["z_max"] == z_max
+
+
+def test_process_pool_writes_into_shared_memory():
+    expected, _, _ = full_grid(ripple, 30, 20)
+    vertices, _ = evaluate_grid(lambda x, y: ripple(x, y), 30, 20, band_rows=4, workers=2, executor="process")
+    np.testing.assert_array_equal(vertices, expected)
+
+
+def test_writes_into_preallocated_output():
+    out = allocate_vertices(12)
+    vertices, meta = evaluate_grid(lambda x, y: x + y, 3, 4, out=out)
+    assert vertices is out
+    assert meta["z_span"] == 4.0
+
+
+def test_constant_function_normalizes_to_zero():
+    vertices, meta = evaluate_grid(lambda x, y: np.full_like(x, 2.5), 4, 4, band_rows=1)
+    assert not vertices[:, 2].any()
+    assert meta["z_span"] == 1.0
+
+
+def test_rejects_wrong_output_shape_and_executor():
+    with pytest.raises(ValueError):
+        evaluate_grid(ripple, 3, 3, out=np.empty((8, 3), dtype=np.float32))
+    with pytest.raises(ValueError):
+        evaluate_grid(ripple, 3, 3, band_rows=1, workers=2, executor="gpu")
+
+
+def strip_triangles(indices, restart=None):
+    # Expande una tira (con reinicios o degenerados) a triángulos sin orientación.
+    triangles, run = set(), []
+    for index in list(indices) + [restart]:
+        if index == restart:
+            for k in range(len(run) - 2):
+                tri = run[k:k + 3]
+                if len(set(tri)) == 3:
+                    triangles.add(frozenset(tri))
+            run = []
+        else:
+            run.append(int(index))
+    return triangles
+
+
+@pytest.mark.parametrize("rows, cols", [(5, 4), (300, 300)])
+def test_strip_covers_the_same_triangles(rows, cols):
+    triangles = grid_indices(rows, cols, "triangles")
+    strip = grid_indices(rows, cols, "strip")
+    restart = RESTART_INDEX if strip.dtype == np.uint32 else None
+    expected = {frozenset(tri) for tri in triangles.reshape(-1, 3).tolist()}
+    assert strip_triangles(strip, restart) == expected
+    if rows > 100:
+        assert triangles.size / strip.size > 2.9
+
+
+def test_index_dtype_and_sharing():
+    assert grid_indices(256, 256).dtype == np.uint16
+    assert grid_indices(257, 256).dtype == np.uint32
+    assert grid_indices(10, 10) is grid_indices(10, 10)
+    assert not grid_indices(10, 10).flags.writeable
+
+
+def test_index_cache_does_not_keep_unused_arrays():
+    indices = grid_indices(300, 300)
+    assert grid_indices(300, 300) is indices
+    released = weakref.ref(indices)
+    del indices
+    gc.collect()
+    assert released() is None
+
+
+def test_lines_are_grid_edges():
+    lines = grid_indices(3, 4, "lines").reshape(-1, 2)
+    assert len(lines) == 3 * 3 + 4 * 2
+    assert all(abs(int(b) - int(a)) in (1, 4) for a, b in lines)
+
+
+def test_index_buffer_cache_shares_and_releases(fake_ctx):
+    cache = IndexBufferCache(fake_ctx)
+    first = cache.acquire(("grid", 2, 2), b"\0" * 12)
+    second = cache.acquire(("grid", 2, 2), b"\0" * 12)
+    assert first is second and cache.refcount(("grid", 2, 2)) == 2
+    cache.release(("grid", 2, 2))
+    assert not first.released
+    cache.release(("grid", 2, 2))
+    assert first.released and len(cache) == 0
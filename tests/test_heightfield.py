@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from pyxion.core.models import Material
+from pyxion.shapes.equation import Equation3dMesh, quantize_heights, with_defines
+
+
+def surface(storage, rows=20, cols=30):
+    return Equation3dMesh(Material(), lambda x, y: np.sin(3 * x) * y, rows, cols, storage=storage)
+
+
+def test_height_modes_shrink_vertex_buffer():
+    xyz, height, height16 = (surface(mode) for mode in ("xyz", "height", "height16"))
+    assert len(xyz.vertex_buffer) == 3 * len(height.vertex_buffer)
+    assert len(height.vertex_buffer) == 2 * len(height16.vertex_buffer)
+    assert height.vertex_layout == ('1f', 'in_height')
+    np.testing.assert_array_equal(height.vertex_data[:, 0], xyz.vertices[:, 2])
+
+
+def test_quantized_heights_round_trip_within_one_level():
+    z = np.linspace(-1.0, 1.0, 1001, dtype=np.float32)
+    decoded = quantize_heights(z) / 65535.0 * 2.0 - 1.0
+    assert np.abs(decoded - z).max() <= 1.0 / 65535.0 + 1e-6
+
+
+def test_heightfield_shader_gets_defines_and_grid_size():
+    mesh = surface("height16", rows=4, cols=7)
+    source = mesh.render_properties.vertex_shader_source
+    assert source.splitlines()[0].startswith("#version")
+    assert "#define HEIGHTFIELD" in source and "#define HEIGHT16" in source
+    uniforms = {uniform["name"]: uniform["value"] for uniform in mesh.render_properties.uniforms}
+    assert uniforms["grid_size"] == (7, 4)
+    assert mesh.render_properties.batch_vertex_shader_path is None
+
+
+def test_with_defines_keeps_source_without_defines():
+    assert with_defines("#version 330\nvoid main() {}", ()) == "#version 330\nvoid main() {}"
+
+
+def test_unknown_storage_is_rejected():
+    with pytest.raises(ValueError):
+        surface("rgb")
@@ -0,0 +1,42 @@
+import struct
+import zlib
+
+import numpy as np
+import pytest
+
+from pyxion.utils.image import encode_png, write_png
+
+
+def decode_png(data: bytes):
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    pos, chunks = 8, {}
+    while pos < len(data):
+        (length,) = struct.unpack(">I", data[pos:pos + 4])
+        tag = data[pos + 4:pos + 8]
+        payload = data[pos + 8:pos + 8 + length]
+        (crc,) = struct.unpack(">I", data[pos + 8 + length:pos + 12 + length])
+        assert crc == zlib.crc32(tag + payload) & 0xFFFFFFFF
+        chunks[tag] = chunks.get(tag, b"") + payload
+        pos += 12 + length
+    width, height, depth, color_type = struct.unpack(">IIBB", chunks[b"IHDR"][:10])
+    channels = {0: 1, 4: 2, 2: 3, 6: 4}[color_type]
+    raw = np.frombuffer(zlib.decompress(chunks[b"IDAT"]), dtype=np.uint8)
+    rows = raw.reshape(height, width * channels + 1)
+    assert np.all(rows[:, 0] == 0)
+    return rows[:, 1:].reshape(height, width, channels)
+
+
+def test_encode_png_roundtrips_rgba():
+    pixels = np.random.default_rng(0).integers(0, 256, (5, 7, 4), dtype=np.uint8)
+    np.testing.assert_array_equal(decode_png(encode_png(pixels)), pixels)
+
+
+def test_encode_png_accepts_grayscale_and_flipped_views(tmp_path):
+    pixels = np.arange(12, dtype=np.uint8).reshape(3, 4)[::-1]
+    path = write_png(tmp_path / "sub" / "gray.png", pixels)
+    np.testing.assert_array_equal(decode_png(path.read_bytes())[:, :, 0], pixels)
+
+
+def test_encode_png_rejects_float_pixels():
+    with pytest.raises(ValueError):
+        encode_png(np.zeros((2, 2, 3), dtype=np.float32))
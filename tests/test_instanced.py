@@ -0,0 +1,67 @@
+import moderngl
+import numpy as np
+
+from pyxion.rendering.instanced import INSTANCE_FLOATS, RoundedRectangleInstances
+from pyxion.rendering.renderer import Renderer
+
+STRIDE = INSTANCE_FLOATS * 4
+
+
+def add_rectangles(layer, n, start=0):
+    centers = [(i, i) for i in range(start, start + n)]
+    return layer.add_many(centers, [(1, 1)] * n, [0.1] * n, [(1, 0, 0, 0.5)] * n)
+
+
+def uploaded(layer):
+    rows = np.frombuffer(bytes(layer.instance_vbo.data), dtype='f4').reshape(-1, INSTANCE_FLOATS)
+    return rows[:layer.count]
+
+
+def test_updates_merge_into_one_sub_range_write(fake_ctx, package_dir):
+    layer = RoundedRectangleInstances(fake_ctx, capacity=16)
+    add_rectangles(layer, 10)
+    layer.flush()
+    assert layer.instance_vbo.writes == [(0, 10 * STRIDE)]
+    layer.update(2, color=(0, 1, 0, 1))
+    layer.update(6, z=0.5)
+    layer.flush()
+    assert layer.instance_vbo.writes[-1] == (2 * STRIDE, 5 * STRIDE)
+    np.testing.assert_array_equal(uploaded(layer), layer.data[:10])
+    layer.flush()
+    assert len(layer.instance_vbo.writes) == 2
+
+
+def test_growth_doubles_capacity_and_orphans(fake_ctx, package_dir):
+    layer = RoundedRectangleInstances(fake_ctx, capacity=4)
+    add_rectangles(layer, 3)
+    layer.flush()
+    indices = add_rectangles(layer, 3, start=3)
+    np.testing.assert_array_equal(indices, [3, 4, 5])
+    assert layer.capacity == 8 and layer.instance_vbo.orphans == 1
+    assert layer.instance_vbo.size == 8 * STRIDE
+    layer.flush()
+    # Tras huérfanar, el write cubre también las instancias ya subidas.
+    assert layer.instance_vbo.writes[-1] == (0, 6 * STRIDE)
+    np.testing.assert_array_equal(uploaded(layer)[:, 0], np.arange(6))
+
+
+def test_render_blends_without_depth_writes(fake_ctx, package_dir):
+    layer = RoundedRectangleInstances(fake_ctx)
+    add_rectangles(layer, 3)
+    masks = []
+    layer.vao.render = lambda **kwargs: masks.append((fake_ctx.fbo.depth_mask, fake_ctx.enabled, kwargs["instances"]))
+    layer.render()
+    assert masks == [(False, moderngl.BLEND, 3)]
+    assert fake_ctx.fbo.depth_mask and not fake_ctx.enabled
+
+
+def test_translucent_rectangles_do_not_hide_later_ones(gl_ctx):
+    renderer = Renderer((64, 64), models=[], ctx=gl_ctx)
+    renderer.camera.position = (0.0, -0.01, 0.8)
+    layer = RoundedRectangleInstances(gl_ctx)
+    # El más cercano primero: con escritura de profundidad taparía al segundo.
+    layer.add_many([(0, 0), (0, 0)], [(0.5, 0.5)] * 2, [0.05] * 2, [(1, 0, 0, 0.5), (0, 1, 0, 0.5)], z=[0.1, 0.0])
+    renderer.add_layer(layer)
+    pixel = renderer.render_to_array()[32, 32]
+    assert pixel[0] > 0 and pixel[1] > 0
+    renderer.release()
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from pyxion.core.camera import Camera
+from pyxion.core.models import Material
+from pyxion.rendering.lod import LodSurfaceLayer
+from pyxion.rendering.renderer import Renderer
+from pyxion.shapes.equation import Equation3dMesh
+from pyxion.shapes.lod import LodSurface, _upsample, screen_space_error
+from pyxion.utils.math import perspective_proj_matrix
+
+PROJ = perspective_proj_matrix(np.radians(45.0), 0.1, 100.0)
+
+
+def ripple(x, y):
+    return np.sin(6 * x) * np.cos(4 * y)
+
+
+def test_upsample_is_exact_on_coarse_nodes_and_linear_data():
+    y, x = np.mgrid[0:9, 0:9].astype(np.float32)
+    plane = 2 * x + 3 * y
+    np.testing.assert_allclose(_upsample(plane[::4, ::4], 4), plane, atol=1e-5)
+
+
+def test_levels_share_fine_samples_and_errors_grow():
+    surface = LodSurface(ripple, tiles=4, tile_size=16)
+    assert surface.levels == 5
+    assert np.all(surface.errors[..., 0] == 0)
+    assert np.all(np.diff(surface.errors, axis=-1) >= 0)
+    fine = surface.tile_heights(1, 2, 0)[1:-1, 1:-1]
+    coarse = surface.tile_heights(1, 2, 2)[1:-1, 1:-1]
+    np.testing.assert_array_equal(coarse, fine[::4, ::4])
+
+
+def test_skirts_sink_only_between_tiles_of_different_levels():
+    surface = LodSurface(ripple, tiles=2, tile_size=8)
+    heights = surface.tile_heights(1, 1, 1)
+    assert heights.shape == (surface.level_points(1),) * 2
+    np.testing.assert_array_equal(heights[0], heights[1])
+    np.testing.assert_array_equal(heights[:, -1], heights[:, -2])
+    levels = np.array([[0, 0], [0, 2]])
+    depths = surface.skirt_depths(levels)
+    seam = surface.errors[1, 1, 2] + surface.errors[0, 1, 0]
+    assert depths[1, 1, 0] == depths[0, 1, 1] == pytest.approx(seam, abs=2e-3) and seam > 0
+    assert depths[1, 1, 2] == depths[1, 0, 3] > 0
+    # Sin falda en el borde del dominio ni entre tiles del mismo nivel.
+    assert not depths[0, 0].any() and depths[1, 1, 1] == depths[1, 1, 3] == 0
+    assert not surface.skirt_depths(np.zeros((2, 2), dtype=int)).any()
+    assert np.all(surface.aabbs[..., 0, 2] <= surface.heights.min() - depths.max())
+
+
+def test_tile_bounds_cover_every_node_on_the_tile_border():
+    surface = LodSurface(ripple, tiles=4, tile_size=8)
+    surface.heights[8, 16] = 5.0
+    surface.heights[24, 8] = -5.0
+    boxes = surface._tile_bounds()
+    # El nodo (8, 16) es esquina de los cuatro tiles que lo rodean.
+    for ty, tx in ((0, 1), (0, 2), (1, 1), (1, 2)):
+        assert boxes[ty, tx, 1, 2] == 5.0
+    for ty, tx in ((2, 0), (2, 1), (3, 0), (3, 1)):
+        assert boxes[ty, tx, 0, 2] <= -5.0
+
+
+def test_distant_camera_selects_coarser_levels():
+    surface = LodSurface(ripple, tiles=4, tile_size=16)
+    near = surface.select_levels([0.5, -0.5, 1.0], PROJ, 720)
+    far = surface.select_levels([40.0, -40.0, 30.0], PROJ, 720)
+    assert near.shape == (4, 4)
+    assert far.min() >= near.max()
+    assert np.all(surface.select_levels([0.5, -0.5, 1.0], PROJ, 720, pixel_error=0.0) == 0)
+
+
+def test_screen_space_error_scales_with_distance():
+    assert screen_space_error(0.1, 2.0, PROJ, 720) == pytest.approx(2 * screen_space_error(0.1, 4.0, PROJ, 720))
+
+
+def test_tile_size_must_be_power_of_two():
+    with pytest.raises(ValueError):
+        LodSurface(ripple, tiles=2, tile_size=12)
+
+
+def test_finest_level_matches_full_mesh_from_an_oblique_camera(gl_ctx):
+    def oblique():
+        return Camera(position=[3.0, 3.0, 3.0], target=[0.0, 0.0, 0.0], theta=0.0,
+                      aspect_ratio=1.0, projection_matrix=PROJ)
+
+    reference = Renderer((128, 128), models=[Equation3dMesh(Material(), ripple, 33, 33)], ctx=gl_ctx,
+                         camera=oblique())
+    expected = reference.render_to_array()
+    renderer = Renderer((128, 128), models=[], ctx=gl_ctx, camera=oblique())
+    layer = LodSurfaceLayer(gl_ctx, LodSurface(ripple, tiles=4, tile_size=8), pixel_error=0.0)
+    renderer.add_layer(layer)
+    frame = renderer.render_to_array()
+    assert np.all(layer.levels == 0)
+    assert expected[..., :3].any()
+    # Sin paredes en el borde del dominio ni faldas entre tiles del mismo nivel.
+    np.testing.assert_array_equal(frame, expected)
+    for resource in (layer, renderer, reference):
+        resource.release()
@@ -0,0 +1,119 @@
+import os
+import threading
+
+import numpy as np
+import pytest
+
+from pyxion.core.mesh_cache import MeshCache, cache_key
+from pyxion.core.models import Material
+from pyxion.shapes.equation import Equation2dMesh, Equation3dMesh
+
+
+def ripple(x, y):
+    return np.sin(4 * x) * np.cos(3 * y)
+
+
+def test_second_build_hits_cache_with_memmap(tmp_path):
+    cache = MeshCache(tmp_path)
+    first = Equation3dMesh(Material(), ripple, 16, 24, cache=cache)
+    second = Equation3dMesh(Material(), ripple, 16, 24, cache=cache)
+    assert cache.stats["misses"] == 1 and cache.stats["hits"] == 1
+    assert isinstance(second.vertices, np.memmap) or isinstance(second.vertices.base, np.memmap)
+    np.testing.assert_array_equal(first.vertices, second.vertices)
+    assert first.render_properties.uniforms == second.render_properties.uniforms
+
+
+def test_cached_vertices_are_copy_on_write(tmp_path):
+    cache = MeshCache(tmp_path)
+    Equation3dMesh(Material(), ripple, 8, 8, cache=cache)
+    mesh = Equation3dMesh(Material(), ripple, 8, 8, cache=cache)
+    original = mesh.vertices[0, 2]
+    mesh.vertices[0, 2] = 42.0
+    assert Equation3dMesh(Material(), ripple, 8, 8, cache=cache).vertices[0, 2] == original
+
+
+def test_key_depends_on_source_resolution_and_closure():
+    def make(freq):
+        return lambda x, y: np.sin(freq * x)
+
+    base = cache_key("Equation3dMesh", ripple, {"rows": 8, "cols": 8})
+    assert base == cache_key("Equation3dMesh", ripple, {"rows": 8, "cols": 8})
+    assert base != cache_key("Equation3dMesh", ripple, {"rows": 8, "cols": 9})
+    assert base != cache_key("Equation3dMesh", ripple, {"rows": 8, "cols": 8}, version=2)
+    assert cache_key("k", make(1.0)) != cache_key("k", make(2.0))
+    assert cache_key("k", ripple, key="sombrero") == cache_key("k", make(1.0), key="sombrero")
+
+
+def test_key_hashes_captured_array_contents():
+    def make(table):
+        return lambda x, y: np.interp(x, np.linspace(0, 1, table.size), table)
+
+    heights = np.zeros(5000)
+    bumped = heights.copy()
+    bumped[2500] = 7.0
+    assert repr(heights) == repr(bumped)
+    assert cache_key("k", make(heights)) == cache_key("k", make(heights.copy()))
+    assert cache_key("k", make(heights)) != cache_key("k", make(bumped))
+    assert cache_key("k", make(heights)) != cache_key("k", make(heights.astype(np.float32)))
+
+
+def test_key_requires_explicit_key_for_unstable_captures():
+    marker = object()
+    equation = lambda x, y: x if marker else y
+    with pytest.raises(ValueError, match="cache_key"):
+        cache_key("k", equation)
+    assert cache_key("k", equation, key="marcador")
+
+
+def test_concurrent_stores_of_one_key_do_not_collide(tmp_path):
+    cache = MeshCache(tmp_path)
+    arrays = {"vertices": np.arange(3000, dtype=np.float32)}
+    errors = []
+
+    def store():
+        try:
+            for _ in range(10):
+                cache.store("misma", arrays)
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=store) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors
+    arrays, _ = cache.load("misma")
+    np.testing.assert_array_equal(arrays["vertices"], np.arange(3000, dtype=np.float32))
+    assert not [path for path in tmp_path.iterdir() if path.name.startswith(".")]
+
+
+def test_equation2d_stores_vertices_and_indices(tmp_path):
+    cache = MeshCache(tmp_path)
+    first = Equation2dMesh(Material(), np.sin, 40, cache=cache)
+    second = Equation2dMesh(Material(), np.sin, 40, cache=cache)
+    assert cache.hits == 1
+    np.testing.assert_array_equal(first.indices, second.indices)
+    np.testing.assert_array_equal(first.vertices, second.vertices)
+
+
+def test_lru_eviction_keeps_recently_used_entries(tmp_path):
+    entry = {"vertices": np.zeros((256, 3), dtype=np.float32)}
+    cache = MeshCache(tmp_path, max_bytes=10 ** 9)
+    for i, key in enumerate(("a", "b", "c")):
+        cache.store(key, entry)
+        os.utime(tmp_path / key / "meta.json", (i, i))
+    assert cache.load("a") is not None  # "a" pasa a ser la más reciente
+    cache.max_bytes = cache.total_bytes - 1
+    assert cache.evict() == 1
+    assert cache.load("b") is None
+    assert cache.load("a") is not None and cache.load("c") is not None
+    assert cache.stats["evictions"] == 1
+
+
+def test_corrupt_entry_is_discarded(tmp_path):
+    cache = MeshCache(tmp_path)
+    cache.store("x", {"vertices": np.ones((4, 3), dtype=np.float32)})
+    (tmp_path / "x" / "vertices.npy").write_bytes(b"roto")
+    assert cache.load("x") is None
+    assert not (tmp_path / "x").exists()
@@ -0,0 +1,32 @@
+import pytest
+from pydantic import ValidationError
+
+from pyxion.core.models import Material, RenderProperties
+from pyxion.core.schemas import validate_material, validate_render_properties
+
+
+def test_models_are_slotted_dataclasses():
+    material = Material(stroke_width=2.0)
+    assert not hasattr(material, "__dict__")
+    assert material == Material((1.0, 1.0, 1.0, 1.0), (0.0, 0.0, 0.0, 1.0), 2.0)
+    first, second = RenderProperties("a.glsl", "b.glsl"), RenderProperties("a.glsl", "b.glsl")
+    first.uniforms.append({"name": "color"})
+    assert second.uniforms == []
+
+
+def test_schemas_validate_at_the_boundary():
+    material = validate_material({"fill_color": [1, 0, 0, 1], "stroke_width": "3"})
+    assert isinstance(material, Material)
+    assert material.fill_color == (1.0, 0.0, 0.0, 1.0) and material.stroke_width == 3.0
+    assert validate_material(material) == material
+    with pytest.raises(ValidationError):
+        validate_material({"fill_color": (1, 0, 0)})
+    with pytest.raises(ValidationError):
+        validate_material({"stroke_width": -1})
+    with pytest.raises(ValidationError):
+        validate_material({"colour": (1, 0, 0, 1)})
+    props = validate_render_properties({"vertex_shader_path": "v.glsl", "fragment_shader_path": "f.glsl",
+                                        "gl_mode": 4})
+    assert isinstance(props, RenderProperties) and props.uniforms == [] and props.gl_mode == 4
+    with pytest.raises(ValidationError):
+        validate_render_properties({"vertex_shader_path": "v.glsl"})
@@ -0,0 +1,73 @@
+import numpy as np
+
+from pyxion.core.models import Material
+from pyxion.rendering.offscreen import AsyncReadback, OffscreenTarget
+from pyxion.rendering.renderer import Renderer
+from pyxion.shapes.equation import Equation2dMesh, Equation3dMesh
+
+
+def make_renderer(ctx, size=(96, 64)):
+    models = [Equation2dMesh(Material(), np.sin, 60), Equation3dMesh(Material(), lambda x, y: 0.3 * x * y, 20, 20)]
+    renderer = Renderer(size, models=models, ctx=ctx)
+    renderer.camera.position = (0.0, -0.01, 0.8)
+    return renderer
+
+
+def test_target_and_async_readback_return_top_down_frames(gl_ctx):
+    target = OffscreenTarget(gl_ctx, (8, 4))
+    readback = AsyncReadback(gl_ctx, target.size, buffers=2)
+    frames = []
+    for shade in (0.2, 0.4, 0.6):
+        target.use()
+        gl_ctx.clear(shade, 0.0, 0.0, 1.0)
+        # Fila superior distinta para comprobar la orientación de la imagen.
+        gl_ctx.clear(1.0, 1.0, 1.0, 1.0, viewport=(0, 3, 8, 1))
+        frames.append(readback.request(target.fbo))
+    image = target.read()
+    assert image.shape == (4, 8, 4) and image.dtype == np.uint8
+    assert (image[0] == 255).all() and image[1:, :, 0].max() == round(0.6 * 255)
+    assert frames[:2] == [None, None] and frames[2][-1, 0, 0] == round(0.2 * 255)
+    pending = readback.flush()
+    assert [frame[-1, 0, 0] for frame in pending] == [round(0.4 * 255), round(0.6 * 255)]
+    np.testing.assert_array_equal(pending[-1], image)
+    readback.release()
+    target.release()
+
+
+def test_render_sequence_matches_synchronous_frames(gl_ctx):
+    renderer = make_renderer(gl_ctx)
+    times = [0.0, 0.5, 1.0, 1.5]
+    expected = [renderer.render_to_array(t).copy() for t in times]
+    assert (expected[0][..., 0] > 0).any()
+    frames = {}
+    assert renderer.render_sequence(times, frames.__setitem__) == len(times)
+    for index, frame in enumerate(expected):
+        np.testing.assert_array_equal(frames[index], frame)
+    renderer.release()
+
+
+def test_msaa_target_resolves_to_the_same_scene(gl_ctx):
+    renderer = make_renderer(gl_ctx)
+    plain = renderer.render_to_array(0.0)
+    target = renderer.enable_offscreen(samples=4)
+    assert target.samples == min(4, gl_ctx.max_samples)
+    smooth = renderer.render_to_array(0.0)
+    assert smooth.shape == plain.shape
+    lit_plain, lit_smooth = plain[..., :3].any(axis=-1), smooth[..., :3].any(axis=-1)
+    assert lit_plain.any()
+    # Mismo contenido salvo los bordes suavizados.
+    assert abs(int(lit_plain.sum()) - int(lit_smooth.sum())) <= 0.05 * lit_plain.sum()
+    renderer.release()
+
+
+def test_offscreen_target_follows_window_size(gl_ctx):
+    renderer = make_renderer(gl_ctx)
+    renderer.enable_offscreen(samples=2)
+    assert renderer.render_to_array(0.0).shape == (64, 96, 4)
+    renderer.wnd_size = (48, 40)
+    assert renderer.render_to_array(0.0).shape == (40, 48, 4)
+    assert renderer.target.samples == min(2, gl_ctx.max_samples)
+    renderer.wnd_size = (32, 24)
+    frames = [renderer.render_async(t) for t in (0.0, 0.5, 1.0)]
+    assert frames[-1].shape == (24, 32, 4)
+    renderer.release()
@@ -0,0 +1,48 @@
+import json
+
+from pyxion.rendering.profiler import HISTOGRAM_EDGES_MS, FrameProfiler
+
+
+def run_frames(profiler, count):
+    for _ in range(count):
+        profiler.begin_frame()
+        with profiler.span("camera"):
+            pass
+        with profiler.gpu("draw"):
+            pass
+        profiler.end_frame()
+
+
+def test_gpu_queries_are_read_latency_frames_late_and_reused(fake_ctx):
+    ctx = fake_ctx
+    profiler = FrameProfiler(ctx, latency=2)
+    run_frames(profiler, 2)
+    assert not profiler.gpu_times
+    run_frames(profiler, 4)
+    assert len(profiler.gpu_times) == 3
+    assert abs(profiler.gpu_times[0] - 0.002) < 1e-12
+    assert len(ctx.created) == 3
+
+
+def test_summary_and_histogram_cover_recorded_frames():
+    profiler = FrameProfiler(history=5)
+    run_frames(profiler, 8)
+    counts, edges = profiler.histogram()
+    assert counts.sum() == 5
+    assert len(edges) == len(HISTOGRAM_EDGES_MS)
+    summary = profiler.summary()
+    assert summary["frames"] == 5
+    assert "camera" in summary["spans_ms"]
+    assert "gpu_ms" not in summary
+
+
+def test_chrome_trace_contains_cpu_and_gpu_events(tmp_path, fake_ctx):
+    profiler = FrameProfiler(fake_ctx, latency=3)
+    run_frames(profiler, 2)
+    path = profiler.export_chrome_trace(tmp_path / "trace.json")
+    events = json.loads(path.read_text())["traceEvents"]
+    names = {(event["name"], event.get("cat")) for event in events}
+    assert ("frame", "cpu") in names
+    assert ("camera", "cpu") in names
+    assert ("draw", "gpu") in names
+    assert all(event["ph"] in ("X", "M") for event in events)
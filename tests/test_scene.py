@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from pyxion.core.bvh import BVH
+from pyxion.core.scene import SceneGraph, transform_boxes
+from pyxion.rendering.scene import WorldMatrixTexture
+from pyxion.utils.math import rotation_matrix, scale_matrix, translation_matrix
+
+
+def test_world_matrices_compose_down_the_hierarchy():
+    scene = SceneGraph(capacity=2)
+    panel = scene.add(translation_matrix((1.0, 0.0, 0.0)))
+    child = scene.add(scale_matrix(2.0), parent=panel)
+    leaf = scene.add(translation_matrix((0.0, 0.0, 1.0)), parent=child)
+    point = scene.world(leaf) @ np.array([1.0, 0.0, 0.0, 1.0])
+    np.testing.assert_allclose(point, [3.0, 0.0, 2.0, 1.0])
+    assert scene.parent(leaf) == child and scene.parent(panel) is None
+    np.testing.assert_array_equal(scene.children(panel), [child])
+    quarter = rotation_matrix((0.0, 0.0, 1.0), np.pi / 2)
+    np.testing.assert_allclose(quarter[:3, :3] @ [1.0, 0.0, 0.0], [0.0, 1.0, 0.0], atol=1e-6)
+
+
+def test_update_recomputes_only_dirty_subtrees():
+    scene = SceneGraph()
+    left, right = scene.add(), scene.add()
+    children = scene.add_many(np.stack([translation_matrix((i, 0.0, 0.0)) for i in range(1000)]), parent=left)
+    other = scene.add(parent=right)
+    assert len(scene.update()) == 1003
+    assert scene.update().size == 0
+    version = scene.version
+
+    scene.translate(left, (0.0, 5.0, 0.0))
+    changed = scene.update()
+    np.testing.assert_array_equal(changed, np.concatenate(([left], children)))
+    np.testing.assert_allclose(scene.world_matrices[children[7], :3, 3], [7.0, 5.0, 0.0])
+    np.testing.assert_array_equal(scene.changed_since(version), changed)
+
+    scene.set_local(other, translation_matrix((0.0, 0.0, 2.0)))
+    np.testing.assert_array_equal(scene.update(), [other])
+
+
+def test_reparenting_and_errors():
+    scene = SceneGraph()
+    a, b = scene.add(translation_matrix((1.0, 0.0, 0.0))), scene.add(translation_matrix((0.0, 1.0, 0.0)))
+    c = scene.add(parent=a)
+    scene.set_parent(c, b)
+    np.testing.assert_allclose(scene.world(c)[:3, 3], [0.0, 1.0, 0.0])
+    with pytest.raises(ValueError):
+        scene.set_parent(b, c)
+    with pytest.raises(ValueError):
+        scene.add(parent=10)
+    with pytest.raises(ValueError):
+        scene.set_local(a, np.eye(3))
+
+
+def test_transform_boxes_bounds_rotated_boxes():
+    box = np.array([[[-1.0, -1.0, 0.0], [1.0, 1.0, 0.0]]])
+    turned = rotation_matrix((0.0, 0.0, 1.0), np.pi / 4) @ translation_matrix((0.0, 0.0, 3.0))
+    world = transform_boxes(box, turned[None])[0]
+    np.testing.assert_allclose(world, [[-np.sqrt(2), -np.sqrt(2), 3.0], [np.sqrt(2), np.sqrt(2), 3.0]], atol=1e-6)
+
+
+def test_bvh_refit_many_matches_single_refits():
+    rng = np.random.default_rng(3)
+    lo = rng.uniform(-10, 10, size=(300, 3))
+    boxes = np.stack((lo, lo + rng.uniform(0.1, 1.0, size=(300, 3))), axis=1)
+    bulk, single = BVH(boxes), BVH(boxes)
+    items = rng.choice(300, size=120, replace=False)
+    moved = boxes[items] + rng.uniform(-5, 5, size=(120, 1, 3))
+    bulk.refit_many(items, moved)
+    for item, box in zip(items, moved):
+        single.refit(item, box)
+    np.testing.assert_allclose(bulk.lo, single.lo)
+    np.testing.assert_allclose(bulk.hi, single.hi)
+
+
+def test_world_texture_uploads_everything_for_a_new_scene(fake_ctx):
+    def build(offset):
+        scene = SceneGraph()
+        scene.add_many(np.stack([translation_matrix((offset + i, 0.0, 0.0)) for i in range(3)]))
+        return scene
+
+    texture = WorldMatrixTexture(fake_ctx)
+    scene = build(0.0)
+    assert texture.sync(scene).size == 3 and texture.sync(scene).size == 0
+    # Misma versión que la anterior y, a menudo, el mismo id() tras liberarla.
+    del scene
+    scene = build(10.0)
+    np.testing.assert_array_equal(texture.sync(scene), [0, 1, 2])
+    np.testing.assert_allclose(texture._staging[1, 3, :3], [10.0, 0.0, 0.0])
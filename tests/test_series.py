@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from pyxion.shapes.series import MinMaxPyramid
+
+
+def reference(values, start, stop, level):
+    size = 1 << level
+    first, last = start >> level, ((stop - 1) >> level) + 1
+    return np.array([[values[i * size:min((i + 1) * size, stop)].min(),
+                      values[i * size:min((i + 1) * size, stop)].max()] for i in range(first, last)])
+
+
+def test_chunked_appends_match_brute_force_after_wrap():
+    values = np.random.default_rng(3).standard_normal(2500).astype(np.float32)
+    pyramid = MinMaxPyramid(1000)
+    for chunk in np.array_split(values, 37):
+        pyramid.append(chunk)
+    assert len(pyramid) == 1000 and pyramid.start == 1500
+    for level in range(pyramid.levels):
+        np.testing.assert_array_equal(pyramid.buckets(level), reference(values, 1500, 2500, level))
+
+
+def test_append_touches_only_new_buckets():
+    pyramid = MinMaxPyramid(1 << 16)
+    pyramid.append(np.zeros(50_000))
+    changed = pyramid.append(np.ones(10))
+    assert changed[0] == (50_000, 50_010)
+    assert all(hi - lo <= 10 for lo, hi in changed)
+    assert pyramid.buckets(pyramid.levels - 1)[-1, 1] == 1.0
+
+
+def test_oversized_append_keeps_latest_samples():
+    pyramid = MinMaxPyramid(8)
+    pyramid.append(np.arange(20, dtype=np.float32))
+    np.testing.assert_array_equal(pyramid.buckets(0)[:, 0], np.arange(12, 20))
+
+
+def test_level_for_keeps_two_to_four_buckets_per_column():
+    pyramid = MinMaxPyramid(1 << 20)
+    level = pyramid.level_for(1_000_000, 800)
+    assert 2 * 800 <= 1_000_000 >> level < 4 * 800
+    assert pyramid.level_for(500, 800) == 0
+
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        MinMaxPyramid(0)
@@ -0,0 +1,41 @@
+from pyxion.rendering.shader import ProgramCache, source_key, write_startup_report
+
+
+def test_source_key_depends_on_both_stages():
+    assert source_key("a", "b") == source_key("a", "b")
+    assert source_key("a", "b") != source_key("b", "a")
+    assert source_key("ab", "") != source_key("a", "b")
+
+
+def test_program_cache_compiles_identical_sources_once(fake_ctx):
+    ctx = fake_ctx
+    cache = ProgramCache.for_context(ctx)
+    assert ProgramCache.for_context(ctx) is cache
+    keys = [cache.acquire("vert", "frag")[0] for _ in range(50)]
+    assert ctx.compiled == 1
+    assert len(set(keys)) == 1
+    assert cache.refcount(keys[0]) == 50
+    assert cache.stats["hits"] == 49
+
+
+def test_program_cache_releases_program_with_last_reference(fake_ctx):
+    cache = ProgramCache(fake_ctx)
+    key, program = cache.acquire("vert", "frag")
+    cache.acquire("vert", "frag")
+    cache.release(key)
+    assert not program.released
+    cache.release(key)
+    assert program.released
+    assert len(cache) == 0
+
+
+def test_startup_report_compares_against_first_launch(tmp_path, fake_ctx):
+    report_path = tmp_path / "startup_report.json"
+    cache = ProgramCache(fake_ctx)
+    cache.compile_seconds["k"] = 0.5
+    write_startup_report(cache, report_path)
+    cache.compile_seconds["k"] = 0.1
+    report = write_startup_report(cache, report_path)
+    assert len(report["launches"]) == 2
+    assert report["cold_seconds"] == 0.5
+    assert report["warm_seconds"] == 0.1
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from pyxion.core.camera import Camera
+from pyxion.core.geometry import Polyline
+from pyxion.core.models import Material, RenderProperties
+from pyxion.rendering.renderer import Renderer
+from pyxion.rendering.stroke import StrokeLayer, centerline
+from pyxion.shapes.equation import Equation2dLine
+from pyxion.utils.math import ortho_proj_matrix
+
+
+def test_centerline_pads_2d_points_with_zero_z():
+    points = centerline(np.array([[0.0, 1.0], [2.0, 3.0]]))
+    assert points.dtype == np.float32 and points.flags.c_contiguous
+    np.testing.assert_array_equal(points, [[0, 1, 0], [2, 3, 0]])
+
+
+def test_equation_line_keeps_only_the_centerline():
+    line = Equation2dLine(Material(stroke_width=4.0), np.sin, 100)
+    assert line.vertices.shape == (101, 3)
+    np.testing.assert_allclose(line.vertices[:, 1], np.sin(line.vertices[:, 0]), atol=1e-6)
+    assert np.all(line.vertices[:, 2] == 0)
+
+
+def test_renderer_rejects_polylines():
+    line = Equation2dLine(Material(), np.sin, 10)
+    with pytest.raises(ValueError, match="StrokeLayer"):
+        Renderer((64, 64), models=[line])
+
+
+def capsule_coverage(points, half_width, size):
+    # Píxeles cuyo centro está a menos de half_width de algún segmento.
+    ys, xs = np.mgrid[0:size, 0:size] + 0.5
+    pixels = np.stack((xs, ys), axis=-1).reshape(-1, 2)
+    distance = np.full(len(pixels), np.inf)
+    for a, b in zip(points[:-1], points[1:]):
+        ab = b - a
+        t = np.clip((pixels - a) @ ab / (ab @ ab), 0.0, 1.0)
+        distance = np.minimum(distance, np.linalg.norm(pixels - (a + t[:, None] * ab), axis=1))
+    return (distance <= half_width).reshape(size, size)
+
+
+def test_stroke_covers_the_capsules_of_each_segment(gl_ctx):
+    size, width = 200, 12.0
+    points = np.array([[-0.8, -0.5, 0], [-0.4, 0.6, 0], [0.0, -0.6, 0], [0.3, 0.5, 0], [0.7, -0.7, 0]], dtype='f4')
+    camera = Camera(position=[0, 0, 3], target=[0, 0, 0], theta=0, aspect_ratio=1.0,
+                    projection_matrix=ortho_proj_matrix(1.0, 0.1, 100))
+    renderer = Renderer((size, size), models=[], ctx=gl_ctx, camera=camera)
+    line = Polyline(points, Material(stroke_color=(1, 1, 1, 1), stroke_width=width),
+                    RenderProperties(vertex_shader_path="", fragment_shader_path=""))
+    renderer.add_layer(StrokeLayer(gl_ctx, [line]))
+    lit = renderer.render_to_array()[::-1, :, 0] > 0
+    clip = (camera.camera_matrix @ np.c_[points, np.ones(len(points))].T).T
+    screen = (clip[:, :2] / clip[:, 3:] * 0.5 + 0.5) * size
+    ideal = capsule_coverage(screen, width / 2, size)
+    # Solo pueden diferir píxeles cuyo centro cae justo en el borde.
+    assert (lit ^ ideal).sum() <= 0.01 * ideal.sum()
+    renderer.release()
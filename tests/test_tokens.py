@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+
+from pyxion.rendering.shader import resolve_includes
+from pyxion.utils import tokens
+from pyxion.utils.tokens import (ARTIFACT_VERSION, build_theme, compile_tokens, load_theme, parse_hex_color,
+                                 parse_lut, resolve_color, srgb_to_linear)
+
+DESIGN = """
+[color.palette]
+indigo = "#1E1633"
+white = "#FFFFFF"
+
+[color.roles]
+bg_base = "indigo"
+panel = "bg_base"
+error = "#FF5C7A"
+
+[gradients]
+hero = ["indigo", "#FFFFFF"]
+
+[imaging.lut.gray]
+"1.0" = "#FFFFFF"
+"0.0" = "#000000"
+
+[imaging.overlays]
+colormap_default = "gray"
+
+[spacing]
+sm = 8
+"""
+
+
+def test_parse_hex_color_and_lut():
+    assert parse_hex_color("#FF0080") == pytest.approx((1.0, 0.0, 128 / 255, 1.0))
+    assert parse_hex_color("00000080")[3] == pytest.approx(128 / 255)
+    with pytest.raises(ValueError):
+        parse_hex_color("#FFF")
+    positions, colors = parse_lut({"1.0": "#FFFFFF", "0.0": "#000000", "0.5": "#FF0000"})
+    assert positions == (0.0, 0.5, 1.0) and colors[1] == (1.0, 0.0, 0.0, 1.0)
+    with pytest.raises(ValueError):
+        parse_lut({"1.5": "#FFFFFF"})
+
+
+def test_roles_resolve_through_aliases_to_linear():
+    import tomllib
+    tokens = compile_tokens(tomllib.loads(DESIGN))
+    assert tokens["ROLES"]["panel"] == tokens["ROLES"]["bg_base"] == tokens["PALETTE"]["indigo"]
+    np.testing.assert_allclose(tokens["PALETTE"]["indigo"], srgb_to_linear(parse_hex_color("#1E1633")), atol=1e-6)
+    assert tokens["PALETTE"]["white"] == (1.0, 1.0, 1.0, 1.0)
+    assert srgb_to_linear((0.5, 0.5, 0.5, 0.25)) == pytest.approx((0.214041, 0.214041, 0.214041, 0.25), abs=1e-6)
+    assert tokens["ROLES_SRGB"]["panel"] == pytest.approx(parse_hex_color("#1E1633"), abs=1e-6)
+    assert tokens["GRADIENTS"]["hero"][1] == (1.0, 1.0, 1.0, 1.0)
+    assert tokens["LUTS"]["gray"][0] == (0.0, 1.0)
+    assert tokens["SPACING"] == {"sm": 8}
+
+
+def test_alias_errors():
+    with pytest.raises(ValueError, match="circular"):
+        resolve_color("a", {}, {"a": "b", "b": "a"})
+    with pytest.raises(ValueError, match="desconocido"):
+        resolve_color("missing", {}, {})
+
+
+def test_artifacts_rebuild_only_when_design_changes(tmp_path):
+    design = tmp_path / "design.toml"
+    design.write_text(DESIGN)
+    assert build_theme(design) is True
+    assert build_theme(design) is False
+    glsl = (tmp_path / "build" / "colors.glslinc").read_text()
+    assert "const vec4 ROLE_PANEL = vec4(" in glsl and "vec4 GRADIENT_HERO[2]" in glsl
+    theme = load_theme(design)
+    assert theme.ROLES["bg_base"] == theme.PALETTE["indigo"]
+    # Artefactos de un formato anterior se regeneran aunque el TOML no cambie.
+    glsl_path = tmp_path / "build" / "colors.glslinc"
+    glsl_path.write_text(glsl.replace(f" v{ARTIFACT_VERSION}\n", " v0\n", 1))
+    assert build_theme(design) is True
+
+    design.write_text(DESIGN.replace("#FF5C7A", "#FF0000"))
+    assert build_theme(design) is True
+    assert load_theme(design).ROLES["error"] == (1.0, 0.0, 0.0, 1.0)
+
+
+def test_custom_export_path_ignores_stale_default_artifact(tmp_path):
+    design = tmp_path / "design.toml"
+    design.write_text(DESIGN)
+    build_theme(design)
+    design.write_text('[exports]\npython_constants = "out/theme.py"\n'
+                      + DESIGN.replace("#FF5C7A", "#FF0000"))
+    assert load_theme(design).ROLES["error"] == (1.0, 0.0, 0.0, 1.0)
+    assert (tmp_path / "out" / "theme.py").exists()
+
+
+def test_atomic_writes_leave_no_staging_files(tmp_path):
+    target = tmp_path / "build" / "theme.py"
+    tokens._write_atomic(target, "A = 1\n")
+    tokens._write_atomic(target, "A = 2\n")
+    assert target.read_text() == "A = 2\n"
+    assert [path.name for path in target.parent.iterdir()] == ["theme.py"]
+
+
+def test_read_only_install_compiles_tokens_in_memory(tmp_path, monkeypatch):
+    design = tmp_path / "design.toml"
+    design.write_text(DESIGN)
+
+    def read_only(path, text):
+        raise PermissionError(f"Read-only file system: {path}")
+
+    monkeypatch.setattr(tokens, "_write_atomic", read_only)
+    theme = load_theme(design)
+    assert theme.ROLES["panel"] == theme.PALETTE["indigo"] and theme.LUTS["gray"][0] == (0.0, 1.0)
+    assert load_theme(design) is theme
+    assert not (tmp_path / "build").exists()
+
+
+def test_includes_are_expanded_once(tmp_path):
+    (tmp_path / "common.glsl").write_text('#include "colors.glslinc"\nfloat shared_value = 1.0;\n')
+    (tmp_path / "colors.glslinc").write_text("const vec4 RED = vec4(1.0, 0.0, 0.0, 1.0);\n")
+    shader = tmp_path / "fragment.glsl"
+    source = '#version 330 core\n#include "common.glsl"\n#include "colors.glslinc"\nvoid main() {}\n'
+    expanded = resolve_includes(source, shader)
+    assert expanded.count("const vec4 RED") == 1 and "shared_value" in expanded
+    assert "#include" not in expanded
+    with pytest.raises(FileNotFoundError):
+        resolve_includes('#include "missing.glsl"\n', shader)
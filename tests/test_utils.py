@@ -1,7 +1,8 @@
 import numpy as np
 from pathlib import Path
 
-from utils import normalize, ortho_proj_matrix, perspective_proj_matrix, to_tuple, load_config
+from pyxion.app.config import load_config
+from pyxion.utils.math import normalize, ortho_proj_matrix, perspective_proj_matrix, to_tuple
 
 
 def test_normalize_returns_unit_vector():
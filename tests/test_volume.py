@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+from pyxion.core.camera import frustum_planes
+from pyxion.shapes.volume import BrickCache, BrickedVolume, open_volume
+
+
+def ramp_volume(shape=(20, 12, 8)):
+    return np.arange(np.prod(shape), dtype=np.uint16).reshape(shape)
+
+
+def test_open_volume_maps_npy_and_raw(tmp_path):
+    data = ramp_volume()
+    np.save(tmp_path / "study.npy", data)
+    data.tofile(tmp_path / "study.raw")
+    mapped = open_volume(tmp_path / "study.npy")
+    raw = open_volume(tmp_path / "study.raw", shape=data.shape, dtype=np.uint16)
+    assert isinstance(mapped, np.memmap) and isinstance(raw, np.memmap)
+    np.testing.assert_array_equal(raw, data)
+    with pytest.raises(ValueError):
+        open_volume(tmp_path / "study.raw")
+
+
+def test_read_brick_adds_apron_and_normalizes():
+    data = ramp_volume()
+    volume = BrickedVolume(data, brick_size=8, window=(0, data.max()))
+    assert volume.grid == (3, 2, 1) and volume.count == 6
+    brick = volume.brick_coords([5])[0]
+    np.testing.assert_array_equal(brick, (0, 1, 2))
+    block = volume.read_brick(5).astype(np.float32)
+    assert block.shape == (10, 10, 10)
+    # Interior: vóxeles (z 16..23, y 8..15, x 0..7) recortados y con el borde repetido.
+    expected = np.pad(data[15:20, 7:12, 0:8], ((0, 5), (0, 5), (1, 1)), mode="edge") / data.max()
+    np.testing.assert_allclose(block, expected, atol=1e-3)
+    assert volume.brick_max[5] == pytest.approx(1.0) and np.isnan(volume.brick_max[0])
+
+
+def test_world_box_keeps_aspect_and_spacing():
+    volume = BrickedVolume(np.zeros((10, 20, 40), np.uint8), spacing=(1.0, 1.0, 4.0))
+    np.testing.assert_allclose(volume.aabb[1] - volume.aabb[0], [2.0, 1.0, 2.0])
+    np.testing.assert_allclose(volume.brick_hi.max(axis=0), volume.aabb[1])
+
+
+def test_visible_bricks_cull_skip_empty_and_sort_near_first():
+    volume = BrickedVolume(np.zeros((64, 64, 64), np.uint8), brick_size=16)
+    # Semiespacio x < 0: solo la mitad de los bricks.
+    planes = np.array([[-1.0, 0.0, 0.0, -0.01]])
+    eye = np.array([-5.0, 0.0, 0.0])
+    ids = volume.visible_bricks(planes, eye)
+    assert len(ids) == 32
+    assert np.all(volume.brick_coords(ids)[:, 0] < 2)
+    assert volume.brick_coords(ids[:16])[:, 0].max() == 0
+    volume.read_brick(int(ids[0]))
+    assert ids[0] not in volume.visible_bricks(planes, eye, threshold=0.1)
+    # El brick leído es todo ceros: transparente incluso con umbral 0.
+    assert len(volume.visible_bricks(frustum_planes(np.eye(4, dtype=np.float32)), eye)) == 63
+
+
+def test_brick_cache_evicts_least_recent_but_not_this_frame():
+    cache = BrickCache(2)
+    assert cache.insert(10, frame=1) == (0, None)
+    assert cache.insert(11, frame=1) == (1, None)
+    assert cache.insert(12, frame=1) is None
+    cache.touch(10, frame=2)
+    assert cache.insert(12, frame=2) == (1, 11)
+    assert 11 not in cache and cache.touch(11, frame=3) is None
+    assert cache.stats["evictions"] == 1
+
+
+def test_volume_layer_renders_streamed_bricks_without_renderer(gl_ctx):
+    from pyxion.rendering.renderer import Renderer
+    from pyxion.rendering.volume import VolumeLayer
+    from pyxion.shapes.volume import BRICK_APRON
+    from pyxion.utils.math import perspective_proj_matrix
+
+    data = np.zeros((16, 16, 16), np.uint8)
+    data[4:12, 4:12, 4:12] = 255
+    renderer = Renderer((64, 64), models=[], ctx=gl_ctx)
+    renderer.camera.projection_matrix = perspective_proj_matrix(0.8, 0.1, 10.0)
+    renderer.camera.position = (0.0, -0.01, 3.0)
+    layer = VolumeLayer(gl_ctx, BrickedVolume(data, brick_size=8), workers=1)
+    renderer.add_layer(layer)
+    assert layer.shader.program["brick_apron"].value == BRICK_APRON
+    for _ in range(4):
+        for future in list(layer._reads.values()):
+            future.result()
+        frame = renderer.render_to_array()
+    assert layer.stats["resident"] == 8
+    lit = frame[..., 0] > 0
+    assert lit.any()
+    # Sin renderer se redibujan los bricks residentes con la última cámara.
+    renderer.target.use()
+    gl_ctx.clear(0.0, 0.0, 0.0, 1.0)
+    layer.render(None)
+    np.testing.assert_array_equal(renderer.target.read()[..., 0] > 0, lit)
+    renderer.release()
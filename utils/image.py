@@ -0,0 +1,41 @@
+import struct
+import zlib
+import numpy as np
+from pathlib import Path
+
+
+def _png_chunk(tag: bytes, payload: bytes) -> bytes:
+    # Chunk PNG: longitud, tipo, datos y CRC del tipo+datos.
+    return struct.pack(">I", len(payload)) + tag + payload + struct.pack(">I", zlib.crc32(tag + payload) & 0xFFFFFFFF)
+
+
+def encode_png(pixels: np.ndarray, compression: int = 6) -> bytes:
+    # Codifica un arreglo (alto, ancho[, canales]) uint8 como PNG sin dependencias.
+    """PNG de 8 bits en escala de grises, gris+alfa, RGB o RGBA."""
+    pixels = np.asarray(pixels)
+    if pixels.dtype != np.uint8:
+        raise ValueError(f"Se esperaban píxeles uint8, no {pixels.dtype}")
+    if pixels.ndim == 2:
+        pixels = pixels[:, :, None]
+    height, width, channels = pixels.shape
+    color_type = {1: 0, 2: 4, 3: 2, 4: 6}.get(channels)
+    if color_type is None:
+        raise ValueError(f"Número de canales no soportado: {channels}")
+    # Filtro 0 (None) al inicio de cada fila.
+    raw = np.zeros((height, width * channels + 1), dtype=np.uint8)
+    raw[:, 1:] = pixels.reshape(height, -1)
+    header = struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)
+    return b"".join((
+        b"\x89PNG\r\n\x1a\n",
+        _png_chunk(b"IHDR", header),
+        _png_chunk(b"IDAT", zlib.compress(raw.tobytes(), compression)),
+        _png_chunk(b"IEND", b""),
+    ))
+
+
+def write_png(path: Path, pixels: np.ndarray, compression: int = 6) -> Path:
+    # Escribe el PNG en disco creando el directorio si hace falta.
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(encode_png(pixels, compression))
+    return path
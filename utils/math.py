@@ -42,3 +42,31 @@ def to_tuple(value, fallback):
     if isinstance(value, (list, tuple)):
         return tuple(value)
     return tuple(fallback)
+
+
+def translation_matrix(offset) -> np.ndarray:
+    # Matriz 4x4 que desplaza por offset (x, y, z).
+    matrix = np.eye(4, dtype=np.float32)
+    matrix[:3, 3] = np.asarray(offset, dtype=np.float32).reshape(3)
+    return matrix
+
+
+def scale_matrix(factors) -> np.ndarray:
+    # Matriz 4x4 de escala; un escalar escala por igual los tres ejes.
+    matrix = np.eye(4, dtype=np.float32)
+    matrix[[0, 1, 2], [0, 1, 2]] = np.broadcast_to(np.asarray(factors, dtype=np.float32), (3,))
+    return matrix
+
+
+def rotation_matrix(axis, angle: float) -> np.ndarray:
+    # Matriz 4x4 de rotación de angle radianes alrededor de axis (regla de la mano derecha).
+    x, y, z = normalize(np.asarray(axis, dtype=np.float64))
+    c, s = np.cos(angle), np.sin(angle)
+    t = 1.0 - c
+    matrix = np.eye(4, dtype=np.float32)
+    matrix[:3, :3] = [
+        [t * x * x + c, t * x * y - s * z, t * x * z + s * y],
+        [t * x * y + s * z, t * y * y + c, t * y * z - s * x],
+        [t * x * z - s * y, t * y * z + s * x, t * z * z + c],
+    ]
+    return matrix
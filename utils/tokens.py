@@ -0,0 +1,258 @@
+import hashlib
+import importlib.util
+import logging
+import os
+import pprint
+import tempfile
+import tomllib
+import types
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Tokens de diseño del proyecto; [exports] indica dónde se escriben los artefactos.
+DESIGN_PATH = Path(__file__).resolve().parents[1] / "design.toml"
+DEFAULT_EXPORTS = {"python_constants": "build/theme.py", "glsl_include": "build/colors.glslinc"}
+# Primera línea de ambos artefactos: hash del design.toml del que salieron.
+HASH_PREFIX = "design-sha256: "
+# Versión del formato de los artefactos: cambiarla los regenera aunque el TOML no cambie.
+ARTIFACT_VERSION = 2
+
+# Secciones que se copian tal cual a theme.py (números y tablas simples).
+_PLAIN_SECTIONS = ("meta", "typography", "spacing", "radius", "shadow", "timing")
+
+_loaded: dict[tuple[Path, str], object] = {}
+
+
+def parse_hex_color(text: str) -> tuple[float, float, float, float]:
+    # "#RRGGBB" o "#RRGGBBAA" -> RGBA en [0, 1].
+    digits = text.strip().lstrip("#")
+    if len(digits) not in (6, 8):
+        raise ValueError(f"Color hexadecimal inválido: {text!r}")
+    try:
+        channels = [int(digits[i:i + 2], 16) / 255.0 for i in range(0, len(digits), 2)]
+    except ValueError:
+        raise ValueError(f"Color hexadecimal inválido: {text!r}") from None
+    if len(channels) == 3:
+        channels.append(1.0)
+    return tuple(channels)
+
+
+def parse_lut(table: dict) -> tuple[tuple[float, ...], tuple[tuple[float, ...], ...]]:
+    # Puntos de control {"posición": "#color"} -> (posiciones, colores RGBA) ordenados.
+    if not table:
+        raise ValueError("Una LUT necesita al menos un punto de control")
+    points = sorted((float(position), parse_hex_color(color)) for position, color in table.items())
+    positions = tuple(position for position, _ in points)
+    if positions[0] < 0.0 or positions[-1] > 1.0:
+        raise ValueError(f"Posiciones de LUT fuera de [0, 1]: {list(positions)}")
+    return positions, tuple(color for _, color in points)
+
+
+def srgb_to_linear(color: tuple[float, ...]) -> tuple[float, ...]:
+    # Canales RGB de sRGB a lineal (curva exacta); el alfa no cambia.
+    rgb = tuple(c / 12.92 if c <= 0.04045 else ((c + 0.055) / 1.055) ** 2.4 for c in color[:3])
+    return rgb + tuple(color[3:])
+
+
+def _rounded(color: tuple[float, ...]) -> tuple[float, ...]:
+    return tuple(round(float(c), 6) for c in color)
+
+
+def resolve_color(value: str, palette: dict, roles: dict) -> tuple[float, float, float, float]:
+    # Sigue alias de rol -> rol/paleta -> hex y devuelve el RGBA sRGB.
+    seen = []
+    while not value.startswith("#"):
+        if value in seen:
+            raise ValueError(f"Alias de color circular: {' -> '.join(seen + [value])}")
+        seen.append(value)
+        if value in roles:
+            value = roles[value]
+        elif value in palette:
+            value = palette[value]
+        else:
+            raise ValueError(f"Token de color desconocido: {value!r}")
+    return parse_hex_color(value)
+
+
+def compile_tokens(design: dict) -> dict:
+    # Resuelve alias y gradientes y pasa los colores a RGBA lineal.
+    """
+    Paleta, roles y gradientes salen en lineal (listos para mezclar en el
+    shader). Los roles se exportan además en sRGB (``ROLES_SRGB``) para los
+    valores que llegan sin pasar por un shader a un framebuffer sin sRGB,
+    como el color de ``ctx.clear``. Las LUT se conservan en sRGB: son tablas
+    de presentación que se suben tal cual a texturas de 8 bits.
+    """
+    colors = design.get("color", {})
+    palette = colors.get("palette", {})
+    roles = colors.get("roles", {})
+    imaging = design.get("imaging", {})
+
+    def linear(value: str) -> tuple[float, ...]:
+        return _rounded(srgb_to_linear(resolve_color(value, palette, roles)))
+
+    tokens = {
+        "PALETTE": {name: linear(name) for name in palette},
+        "ROLES": {name: linear(name) for name in roles},
+        "ROLES_SRGB": {name: _rounded(resolve_color(name, palette, roles)) for name in roles},
+        "GRADIENTS": {name: tuple(linear(stop) for stop in stops)
+                      for name, stops in design.get("gradients", {}).items()},
+        "LUTS": {},
+        "OVERLAYS": dict(imaging.get("overlays", {})),
+    }
+    for name, table in imaging.get("lut", {}).items():
+        positions, lut_colors = parse_lut(table)
+        tokens["LUTS"][name] = (positions, tuple(_rounded(color) for color in lut_colors))
+    for section in _PLAIN_SECTIONS:
+        tokens[section.upper()] = design.get(section, {})
+    return tokens
+
+
+def render_theme_py(tokens: dict, digest: str) -> str:
+    # Módulo de constantes importable sin leer TOML.
+    lines = [
+        f"# {HASH_PREFIX}{_stamp(digest)}",
+        "# Generado por utils/tokens.py a partir de design.toml; no editar.",
+        "",
+        f"DESIGN_HASH = {digest!r}",
+    ]
+    for name, value in tokens.items():
+        lines.append("")
+        lines.append(f"{name} = {pprint.pformat(value, width=100, sort_dicts=False)}")
+    return "\n".join(lines) + "\n"
+
+
+def _vec4(color: tuple[float, ...]) -> str:
+    return "vec4(" + ", ".join(f"{c:.6f}" for c in color) + ")"
+
+
+def render_colors_glsl(tokens: dict, digest: str) -> str:
+    # Include GLSL con paleta, roles y gradientes como constantes vec4.
+    lines = [
+        f"// {HASH_PREFIX}{_stamp(digest)}",
+        "// Generado por utils/tokens.py a partir de design.toml; no editar.",
+        "#ifndef PYXION_COLORS_GLSLINC",
+        "#define PYXION_COLORS_GLSLINC",
+        "",
+    ]
+    for prefix, table in (("PALETTE", tokens["PALETTE"]), ("ROLE", tokens["ROLES"])):
+        for name, color in table.items():
+            lines.append(f"const vec4 {prefix}_{name.upper()} = {_vec4(color)};")
+        lines.append("")
+    for name, stops in tokens["GRADIENTS"].items():
+        ident = f"GRADIENT_{name.upper()}"
+        lines.append(f"const int {ident}_STOPS = {len(stops)};")
+        lines.append(f"const vec4 {ident}[{len(stops)}] = vec4[{len(stops)}]({', '.join(map(_vec4, stops))});")
+    lines.append("")
+    lines.append("#endif")
+    return "\n".join(lines) + "\n"
+
+
+def export_paths(design: dict, design_path: Path = DESIGN_PATH) -> tuple[Path, Path]:
+    # Rutas de theme.py y del include GLSL, relativas al design.toml.
+    exports = {**DEFAULT_EXPORTS, **design.get("exports", {})}
+    root = Path(design_path).resolve().parent
+    return root / exports["python_constants"], root / exports["glsl_include"]
+
+
+def _stamp(digest: str) -> str:
+    # Marca de la primera línea: hash del TOML y versión del formato.
+    return f"{digest} v{ARTIFACT_VERSION}"
+
+
+def _artifact_hash(path: Path) -> str | None:
+    # Marca anotada en la primera línea de un artefacto (None si falta).
+    try:
+        with path.open(encoding="utf-8") as fh:
+            first = fh.readline()
+    except OSError:
+        return None
+    _, found, digest = first.partition(HASH_PREFIX)
+    return digest.strip() if found else None
+
+
+def _default_paths(design_path: Path) -> tuple[Path, Path]:
+    # Rutas por defecto sin parsear el TOML (camino rápido del arranque).
+    root = Path(design_path).resolve().parent
+    return root / DEFAULT_EXPORTS["python_constants"], root / DEFAULT_EXPORTS["glsl_include"]
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Archivo temporal único por llamada: hilos del mismo proceso no comparten el nombre.
+    fd, staging = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            fh.write(text)
+        os.replace(staging, path)
+    except BaseException:
+        Path(staging).unlink(missing_ok=True)
+        raise
+
+
+def build_theme(design_path: Path = DESIGN_PATH, force: bool = False) -> bool:
+    # Regenera build/theme.py y build/colors.glslinc si cambió el hash de design.toml.
+    """
+    Devuelve True si escribió los artefactos. Con los artefactos al día solo
+    se lee y hashea el archivo (sin parsear TOML).
+    """
+    design_path = Path(design_path)
+    raw = design_path.read_bytes()
+    digest = hashlib.sha256(raw).hexdigest()
+    stamp = _stamp(digest)
+    if not force and all(_artifact_hash(path) == stamp for path in _default_paths(design_path)):
+        return False
+    design = tomllib.loads(raw.decode("utf-8"))
+    theme_path, glsl_path = export_paths(design, design_path)
+    if not force and _artifact_hash(theme_path) == stamp and _artifact_hash(glsl_path) == stamp:
+        return False
+    tokens = compile_tokens(design)
+    _write_atomic(glsl_path, render_colors_glsl(tokens, digest))
+    _write_atomic(theme_path, render_theme_py(tokens, digest))
+    return True
+
+
+def _theme_in_memory(design_path: Path):
+    # Compila los tokens sin escribir artefactos (instalaciones de solo lectura).
+    raw = design_path.read_bytes()
+    digest = hashlib.sha256(raw).hexdigest()
+    key = (design_path, digest)
+    module = _loaded.get(key)
+    if module is None:
+        source = render_theme_py(compile_tokens(tomllib.loads(raw.decode("utf-8"))), digest)
+        module = types.ModuleType(f"pyxion_theme_{digest[:12]}")
+        exec(compile(source, str(design_path), "exec"), module.__dict__)
+        _loaded[key] = module
+    return module
+
+
+def load_theme(design_path: Path = DESIGN_PATH):
+    # Asegura los artefactos e importa theme.py (una vez por contenido).
+    """
+    Si los artefactos están desactualizados y no se pueden escribir (p. ej.
+    paquete instalado en un directorio de solo lectura), los tokens se
+    compilan en memoria con el mismo resultado.
+    """
+    design_path = Path(design_path).resolve()
+    try:
+        build_theme(design_path)
+    except OSError as error:
+        logger.warning("No se pudieron escribir los artefactos de %s (%s); se compilan en memoria",
+                       design_path, error)
+        return _theme_in_memory(design_path)
+    raw = design_path.read_bytes()
+    stamp = _stamp(hashlib.sha256(raw).hexdigest())
+    theme_path, _ = _default_paths(design_path)
+    if _artifact_hash(theme_path) != stamp:
+        # Rutas de exportación no estándar (el build/theme.py por defecto puede
+        # ser de un diseño anterior): se consultan en el TOML.
+        theme_path, _ = export_paths(tomllib.loads(raw.decode("utf-8")), design_path)
+    key = (theme_path, stamp)
+    module = _loaded.get(key)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(f"pyxion_theme_{stamp[:12]}", theme_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _loaded[key] = module
+    return module